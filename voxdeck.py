@@ -0,0 +1,488 @@
+"""
+voxdeck.py
+Parsed deck models and the in-process deck cache for VoxPrep.
+
+A DeckModel holds everything VoxPrep has worked out about one .pptx
+(slide index, sections, titles, font usage, ...). Each view is computed
+from the package the first time it is asked for and memoized on the model.
+
+Models live in an LRU cache keyed by the deck's absolute path. Every
+lookup re-checks the file's mtime, size and a quick hash of its first and
+last 64 KB (which covers the zip central directory), so a deck edited on
+disk - by PowerPoint or by VoxPrep itself - is re-parsed automatically.
+
+When a deck does change, the new model carries over every per-slide
+result whose slide, notes and rels parts have the same zip CRC32 and size
+as before, so editing three slides of a 500-slide deck costs three slide
+parses, not 500.
+
+With enable_store(), models are also written through to a SQLite store
+(voxstore), so a deck seen in an earlier session reopens without touching
+the .pptx at all.
+
+Example:
+    deck = get_deck("Training.pptx")
+    sections = deck.sections          # parsed once...
+    sections = get_deck("Training.pptx").sections   # ...then served from memory
+"""
+
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Dict, Callable, Tuple
+
+import voxooxml
+import voxstore
+
+LOG_PREFIX = "[voxdeck]"
+
+# Default memory budget for cached deck models
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+
+# Bytes hashed from each end of the file for the quick signature
+SIGNATURE_SAMPLE_BYTES = 64 * 1024
+
+# Per-slide stamp fields and the index entry holding each part's name
+SLIDE_STAMP_FIELDS = (
+    ("slide_stamp", "slide_part"),
+    ("slide_rels_stamp", "slide_rels_part"),
+    ("notes_stamp", "notes_part"),
+    ("notes_rels_stamp", "notes_rels_part"),
+)
+
+# Parts shared by every slide (theme fonts, inherited placeholder formatting)
+DESIGN_PART_PREFIXES = ("ppt/theme/", "ppt/slideMasters/", "ppt/slideLayouts/")
+
+
+def log(msg: str):
+    """Simple logging helper."""
+    print(f"{LOG_PREFIX} {msg}", flush=True)
+
+
+def deck_signature(pptx_path: str) -> Tuple[int, int, str]:
+    """
+    Cheap change detector for a deck: (mtime_ns, size, quick_hash).
+
+    The hash covers the first and last SIGNATURE_SAMPLE_BYTES of the file.
+    The tail holds the zip central directory, which changes whenever any
+    part of the package does.
+    """
+    st = os.stat(pptx_path)
+    digest = hashlib.sha1()
+    with open(pptx_path, "rb") as f:
+        digest.update(f.read(SIGNATURE_SAMPLE_BYTES))
+        if st.st_size > SIGNATURE_SAMPLE_BYTES:
+            f.seek(max(SIGNATURE_SAMPLE_BYTES, st.st_size - SIGNATURE_SAMPLE_BYTES))
+            digest.update(f.read(SIGNATURE_SAMPLE_BYTES))
+    return st.st_mtime_ns, st.st_size, digest.hexdigest()
+
+
+def _estimate_size(obj, _seen=None) -> int:
+    """Rough deep size of plain Python data (dicts, lists, tuples, strings)."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += _estimate_size(key, _seen) + _estimate_size(value, _seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += _estimate_size(item, _seen)
+    return size
+
+
+# =============================================================================
+# DECK MODEL
+# =============================================================================
+
+def _index_slides(pkg) -> List[Dict]:
+    """Slide index entries plus the change stamp of each slide's parts."""
+    slides = []
+    for entry in pkg.slide_index:
+        slide = dict(entry)
+        for stamp_field, part_field in SLIDE_STAMP_FIELDS:
+            slide[stamp_field] = pkg.part_stamp(entry[part_field])
+        slide["data"] = {}
+        slides.append(slide)
+    return slides
+
+
+def _deck_stamps(pkg) -> Dict[str, str]:
+    """
+    Combined stamps of the parts shared by all slides.
+
+    "presentation" covers presentation.xml and its rels (slide order,
+    sections); "design" covers themes, masters and layouts.
+    """
+    presentation = hashlib.sha1()
+    for part_name in (pkg.presentation_part, voxooxml.rels_part_name(pkg.presentation_part)):
+        presentation.update(f"{part_name}={pkg.part_stamp(part_name)}\n".encode("utf-8"))
+
+    design = hashlib.sha1()
+    for part_name in sorted(pkg.part_names()):
+        if part_name.startswith(DESIGN_PART_PREFIXES):
+            design.update(f"{part_name}={pkg.part_stamp(part_name)}\n".encode("utf-8"))
+
+    return {"presentation": presentation.hexdigest(), "design": design.hexdigest()}
+
+
+class DeckModel:
+    """
+    Parsed, package-independent view of one deck.
+
+    Deck-level views (sections, ...) are memoized in one dict; per-slide
+    views (title, media, fonts, ...) live in each slide's "data" dict so
+    they can be stored and refreshed slide by slide.
+
+    The zip is only held open while a view is being built, so a cached
+    model never keeps the file locked against saves.
+    """
+
+    def __init__(self, pptx_path: str, signature: Tuple[int, int, str] = None,
+                 slides: List[Dict] = None, views: Dict = None, stamps: Dict = None):
+        self.path = str(Path(pptx_path).resolve())
+        self.signature = signature or deck_signature(self.path)
+        self._views = dict(views or {})
+
+        if slides is None:
+            with voxooxml.DeckPackage(self.path) as pkg:
+                slides = _index_slides(pkg)
+                stamps = _deck_stamps(pkg)
+        self.slides = slides
+        self.stamps = dict(stamps or {})
+
+        # Called with the model whenever a new view is built (persistence hook)
+        self.on_change = None
+
+        self._size = _estimate_size(self.slides) + _estimate_size(self._views)
+
+    @property
+    def slide_count(self) -> int:
+        return len(self.slides)
+
+    @property
+    def size_estimate(self) -> int:
+        """Approximate memory held by this model, in bytes."""
+        return self._size
+
+    @property
+    def views(self) -> Dict:
+        return self._views
+
+    def _changed(self):
+        self._size = _estimate_size(self.slides) + _estimate_size(self._views)
+        if self.on_change is not None:
+            self.on_change(self)
+
+    def carry_over(self, slides: List[Dict], views: Dict, stamps: Dict) -> int:
+        """
+        Reuse results from an earlier parse of this deck where still valid.
+
+        A slide keeps its data when its slide, notes and both rels parts
+        have the same stamps as before; slides are matched by slide ID,
+        which survives reordering. Deck-level views are kept only if
+        presentation.xml is unchanged, and nothing is kept if the theme,
+        masters or layouts changed.
+
+        Args:
+            slides: Slide entries of the earlier model (or store record)
+            views: Deck-level views of the earlier model
+            stamps: Deck stamps of the earlier model
+
+        Returns:
+            Number of slides whose data was reused
+        """
+        if not stamps or stamps.get("design") != self.stamps.get("design"):
+            return 0
+
+        if stamps.get("presentation") == self.stamps.get("presentation"):
+            for name, value in views.items():
+                self._views.setdefault(name, value)
+
+        previous = {slide["slide_id"]: slide for slide in slides}
+        reused = 0
+        for slide in self.slides:
+            old = previous.get(slide["slide_id"])
+            if old is None:
+                continue
+            if any(old.get(stamp_field) != slide[stamp_field] for stamp_field, _ in SLIDE_STAMP_FIELDS):
+                continue
+            slide["data"] = dict(old["data"])
+            reused += 1
+
+        self._size = _estimate_size(self.slides) + _estimate_size(self._views)
+        return reused
+
+    def view(self, name: str, builder: Callable):
+        """
+        Return a memoized deck-level view, building it on first use.
+
+        Args:
+            name: View key, e.g. "sections"
+            builder: Function taking an open DeckPackage and returning the view
+        """
+        if name not in self._views:
+            with voxooxml.DeckPackage(self.path) as pkg:
+                self._views[name] = builder(pkg)
+            self._changed()
+        return self._views[name]
+
+    def slide_view(self, name: str, builder: Callable) -> list:
+        """
+        Return a per-slide view (one value per slide, in play order).
+
+        Only slides that do not have the view yet are built, all in one
+        package open.
+
+        Args:
+            name: View key, e.g. "title"
+            builder: Function taking (DeckPackage, slide_dict) and returning the value
+        """
+        return [value for _, value in self.iter_slide_view(name, builder)]
+
+    def iter_slide_view(self, name: str, builder: Callable, slide_numbers=None):
+        """
+        Yield (slide, value) for a per-slide view, one slide at a time.
+
+        Like slide_view(), but values are built lazily as the caller
+        iterates, so the first slides are available before the last ones
+        have been read. The package is opened on the first missing slide
+        and closed when iteration ends.
+
+        Args:
+            slide_numbers: Optional collection of 1-based slide numbers; other
+                slides are neither built nor yielded
+        """
+        pkg = None
+        built = False
+        try:
+            for slide in self.slides:
+                if slide_numbers is not None and slide["slide_number"] not in slide_numbers:
+                    continue
+                if name not in slide["data"]:
+                    if pkg is None:
+                        pkg = voxooxml.DeckPackage(self.path)
+                    slide["data"][name] = builder(pkg, slide)
+                    built = True
+                yield slide, slide["data"][name]
+        finally:
+            if pkg is not None:
+                pkg.close()
+            if built:
+                self._changed()
+
+    @property
+    def sections(self) -> list:
+        """[(section_name, first_slide, slide_count), ...]"""
+        return [tuple(s) for s in self.view("sections", lambda pkg: pkg.get_sections())]
+
+    @property
+    def titles(self) -> List[str]:
+        """Slide title per slide ("" if none)."""
+        return self.slide_view("title", _build_title)
+
+    @property
+    def notes(self) -> List[str]:
+        """Speaker notes text per slide ("" if none)."""
+        return self.slide_view("notes", _build_notes)
+
+    def iter_notes(self, slide_numbers=None):
+        """Yield (slide, title, notes_text) one slide at a time (see iter_slide_view)."""
+        titles = self.iter_slide_view("title", _build_title, slide_numbers)
+        notes = self.iter_slide_view("notes", _build_notes, slide_numbers)
+        for (slide, title), (_, notes_text) in zip(titles, notes):
+            yield slide, title, notes_text
+
+
+def _build_title(pkg, slide: Dict) -> str:
+    return slide_title(pkg.get_xml(slide["slide_part"], cache=False))
+
+
+def slide_title(slide_xml) -> str:
+    """
+    Title placeholder text, else the first short top-level text shape
+    (same rule the COM extractor used).
+    """
+    title = voxooxml.get_slide_title(slide_xml)
+    if title:
+        return title
+
+    sp_tree = slide_xml.find("p:cSld/p:spTree", voxooxml.NS)
+    if sp_tree is None:
+        return ""
+    for shape in sp_tree.findall("p:sp", voxooxml.NS):
+        text = voxooxml.shape_text(shape).strip()
+        if text and len(text) < 100:
+            return text
+    return ""
+
+
+def _build_notes(pkg, slide: Dict) -> str:
+    if not slide["notes_part"]:
+        return ""
+    return voxooxml.get_notes_text(pkg.get_xml(slide["notes_part"], cache=False))
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+class DeckCache:
+    """
+    LRU cache of DeckModels bounded by an approximate memory budget.
+
+    The most recently used model is always kept, even if it alone is over
+    budget, so the deck currently loaded in the UI never thrashes.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES, store=None):
+        self.max_bytes = max_bytes
+        self.store = store
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, pptx_path: str) -> DeckModel:
+        """Return the cached model for a deck, re-parsing if the file changed."""
+        key = os.path.normcase(str(Path(pptx_path).resolve()))
+
+        if not os.path.isfile(key):
+            raise FileNotFoundError(f"PowerPoint file not found: {pptx_path}")
+
+        signature = deck_signature(key)
+
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None and model.signature == signature:
+                self._models.move_to_end(key)
+                self.hits += 1
+                self._evict()
+                return model
+            previous = self._models.pop(key, None)
+
+        # Parse outside the lock; a concurrent miss on the same deck just
+        # parses twice and the later model wins.
+        model = self._load(key, signature, previous)
+
+        with self._lock:
+            self.misses += 1
+            self._models[key] = model
+            self._evict()
+        return model
+
+    def _load(self, key: str, signature, previous: DeckModel = None) -> DeckModel:
+        """
+        Model from the persistent store if it is still current, else a fresh
+        parse that carries over unchanged slides from the previous model (or
+        the stale store record).
+        """
+        store = self.store
+
+        record = None
+        if store is not None:
+            try:
+                record = store.load(key)
+            except Exception as e:
+                log(f"Deck store read failed, re-parsing: {e}")
+
+        if record is not None and tuple(record["signature"]) == tuple(signature):
+            model = DeckModel(key, signature, slides=record["slides"],
+                              views=record["views"], stamps=record["stamps"])
+        else:
+            model = DeckModel(key, signature)
+            if previous is not None:
+                reused = model.carry_over(previous.slides, previous.views, previous.stamps)
+            elif record is not None:
+                reused = model.carry_over(record["slides"], record["views"], record["stamps"])
+            else:
+                reused = 0
+            if reused:
+                log(f"{os.path.basename(key)} changed: reusing {reused} of {model.slide_count} slides")
+            if store is not None:
+                _persist(model, store)
+
+        if store is not None:
+            model.on_change = lambda m: _persist(m, store)
+        return model
+
+    def invalidate(self, pptx_path: str = None):
+        """Drop one deck (or everything if pptx_path is None)."""
+        with self._lock:
+            if pptx_path is None:
+                self._models.clear()
+            else:
+                self._models.pop(os.path.normcase(str(Path(pptx_path).resolve())), None)
+
+    @property
+    def size_estimate(self) -> int:
+        return sum(m.size_estimate for m in self._models.values())
+
+    def _evict(self):
+        """Drop least recently used models until under budget (caller holds the lock)."""
+        total = self.size_estimate
+        while total > self.max_bytes and len(self._models) > 1:
+            _, model = self._models.popitem(last=False)
+            total -= model.size_estimate
+
+
+def _persist(model: DeckModel, store):
+    """Write a model through to the persistent store; failures only cost speed."""
+    try:
+        store.save(model.path, model.signature, model.stamps, model.views, model.slides)
+    except Exception as e:
+        log(f"Deck store write failed: {e}")
+
+
+_cache = DeckCache()
+
+
+def get_deck(pptx_path: str) -> DeckModel:
+    """Shared cached DeckModel for a deck."""
+    return _cache.get(pptx_path)
+
+
+def enable_store(db_path: str):
+    """Persist deck models in a SQLite store so they survive restarts."""
+    disable_store()
+    _cache.store = voxstore.DeckStore(db_path)
+    # Models already in memory have no persistence hook yet
+    _cache.invalidate()
+
+
+def disable_store():
+    """Stop persisting deck models (in-memory caching continues)."""
+    store, _cache.store = _cache.store, None
+    if store is not None:
+        _cache.invalidate()
+        store.close()
+
+
+def configure_cache(max_bytes: int):
+    """Set the memory budget of the shared deck cache."""
+    _cache.max_bytes = max_bytes
+    with _cache._lock:
+        _cache._evict()
+
+
+def clear_cache(pptx_path: str = None):
+    """Forget cached models (one deck, or all)."""
+    _cache.invalidate(pptx_path)
+
+
+def cache_stats() -> Dict:
+    """{"decks": 2, "bytes": 183422, "max_bytes": 268435456, "hits": 5, "misses": 2}"""
+    return {
+        "decks": len(_cache._models),
+        "bytes": _cache.size_estimate,
+        "max_bytes": _cache.max_bytes,
+        "hits": _cache.hits,
+        "misses": _cache.misses,
+    }
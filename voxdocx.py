@@ -0,0 +1,372 @@
+"""
+voxdocx.py
+Fast template-based DOCX writer (and streaming reader) for VoxPrep notes.
+
+Writes the VO script document straight as WordprocessingML: the fixed
+parts of the package (content types, rels, styles, doc properties) come
+from the templates below, and word/document.xml is streamed into its zip
+entry one slide at a time. No python-docx object tree is built, so a
+1,000-slide export costs about as much as writing the text itself.
+
+The output is formatted like the python-docx export it replaces - body
+font and size in the Normal style, 1.5 line spacing, bold slide headers
+two points larger, a line of box-drawing characters under each header -
+and reads back through voxnotes.parse_notes_file() unchanged.
+
+Edited documents are read back with iter_paragraph_text(), which
+iterparses word/document.xml and discards each paragraph once its text
+has been produced.
+
+Example:
+    notes = voxnotes.iter_notes("Training.pptx")
+    write_notes_docx(notes, "Training_notes.docx", font_name="Calibri", font_size=14)
+
+    for text in iter_paragraph_text("Training_notes.docx"):
+        print(text)
+"""
+
+import os
+import time
+import zipfile
+from typing import Dict, Iterable, Iterator, Callable
+from xml.etree import ElementTree as ET
+from xml.sax.saxutils import escape
+
+LOG_PREFIX = "[voxdocx]"
+
+# Header/separator text shared with the txt export (and its parsers)
+SEPARATOR_TEXT = "─" * 50
+NO_NOTES_TEXT = "[No notes]"
+
+# Spacing in twentieths of a point, line spacing in 240ths of a line
+LINE_SPACING_ONE_POINT_FIVE = 360
+SPACE_AFTER_BODY = 240      # 12pt
+SPACE_BEFORE_HEADER = 360   # 18pt
+SPACE_AFTER_HEADER = 120    # 6pt
+SPACE_AFTER_SPACER = 120    # 6pt
+SEPARATOR_FONT_SIZE = 10    # pt
+
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_W = "{%s}" % _W_NS
+
+DOCUMENT_PART = "word/document.xml"
+
+# Extra entities for attribute values
+_ATTR_ENTITIES = {'"': "&quot;"}
+
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+
+_CONTENT_TYPES = (
+    _XML_DECLARATION +
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+    '<Override PartName="/docProps/core.xml" '
+    'ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>'
+    '<Override PartName="/docProps/app.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.extended-properties+xml"/>'
+    '{extra}'
+    '</Types>'
+)
+
+_CUSTOM_CONTENT_TYPE = (
+    '<Override PartName="/docProps/custom.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.custom-properties+xml"/>'
+)
+
+_PACKAGE_RELS = (
+    _XML_DECLARATION +
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" '
+    'Target="docProps/core.xml"/>'
+    '<Relationship Id="rId3" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/extended-properties" '
+    'Target="docProps/app.xml"/>'
+    '{extra}'
+    '</Relationships>'
+)
+
+_CUSTOM_RELATIONSHIP = (
+    '<Relationship Id="rId4" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/custom-properties" '
+    'Target="docProps/custom.xml"/>'
+)
+
+_DOCUMENT_RELS = (
+    _XML_DECLARATION +
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+_STYLES = (
+    _XML_DECLARATION +
+    '<w:styles xmlns:w="' + _W_NS + '">'
+    '<w:docDefaults>'
+    '<w:rPrDefault><w:rPr><w:lang w:val="en-US"/></w:rPr></w:rPrDefault>'
+    '<w:pPrDefault/>'
+    '</w:docDefaults>'
+    '<w:style w:type="paragraph" w:default="1" w:styleId="Normal">'
+    '<w:name w:val="Normal"/><w:qFormat/>'
+    '<w:pPr><w:spacing w:after="{space_after}" w:line="{line}" w:lineRule="auto"/></w:pPr>'
+    '<w:rPr><w:rFonts w:ascii="{font}" w:hAnsi="{font}" w:cs="{font}"/>'
+    '<w:sz w:val="{size}"/><w:szCs w:val="{size}"/></w:rPr>'
+    '</w:style>'
+    '</w:styles>'
+)
+
+_CORE_PROPERTIES = (
+    _XML_DECLARATION +
+    '<cp:coreProperties '
+    'xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+    'xmlns:dc="http://purl.org/dc/elements/1.1/" '
+    'xmlns:dcterms="http://purl.org/dc/terms/" '
+    'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+    '<dc:title>{title}</dc:title>'
+    '<dcterms:created xsi:type="dcterms:W3CDTF">{created}</dcterms:created>'
+    '<dcterms:modified xsi:type="dcterms:W3CDTF">{created}</dcterms:modified>'
+    '</cp:coreProperties>'
+)
+
+_APP_PROPERTIES = (
+    _XML_DECLARATION +
+    '<Properties xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties">'
+    '<Application>VoxPrep</Application>'
+    '</Properties>'
+)
+
+_CUSTOM_NS = "http://schemas.openxmlformats.org/officeDocument/2006/custom-properties"
+_VT_NS = "http://schemas.openxmlformats.org/officeDocument/2006/docPropsVTypes"
+
+# Format ID Word uses for user-defined custom properties
+_CUSTOM_FMTID = "{D5CDD505-2E9C-101B-9397-08002B2CF9AE}"
+
+CUSTOM_PROPERTIES_PART = "docProps/custom.xml"
+
+_DOCUMENT_START = (
+    _XML_DECLARATION +
+    '<w:document xmlns:w="' + _W_NS + '"><w:body>'
+)
+
+# US Letter, 1" margins
+_DOCUMENT_END = (
+    '<w:sectPr><w:pgSz w:w="12240" w:h="15840"/>'
+    '<w:pgMar w:top="1440" w:right="1440" w:bottom="1440" w:left="1440" '
+    'w:header="720" w:footer="720" w:gutter="0"/></w:sectPr>'
+    '</w:body></w:document>'
+)
+
+
+def log(msg: str):
+    """Simple logging helper."""
+    print(f"{LOG_PREFIX} {msg}", flush=True)
+
+
+def _run(text: str, props: str = "") -> str:
+    rpr = f"<w:rPr>{props}</w:rPr>" if props else ""
+    return f'<w:r>{rpr}<w:t xml:space="preserve">{escape(text)}</w:t></w:r>'
+
+
+def _paragraph(runs: str = "", spacing: str = "") -> str:
+    ppr = f"<w:pPr><w:spacing {spacing}/></w:pPr>" if spacing else ""
+    return f"<w:p>{ppr}{runs}</w:p>"
+
+
+def _slide_xml(note: Dict, font_size: int) -> str:
+    """WordprocessingML for one slide: header, separator, notes, spacer."""
+    slide_num = note["slide_number"]
+    title = note["slide_title"]
+    notes_text = note["notes"]
+
+    header_text = f"Slide {slide_num}: {title}" if title else f"Slide {slide_num}"
+    header_size = (font_size + 2) * 2
+
+    parts = [
+        _paragraph(_run(header_text, f'<w:b/><w:sz w:val="{header_size}"/><w:szCs w:val="{header_size}"/>'),
+                   f'w:before="{SPACE_BEFORE_HEADER}" w:after="{SPACE_AFTER_HEADER}"'),
+        _paragraph(_run(SEPARATOR_TEXT, f'<w:sz w:val="{SEPARATOR_FONT_SIZE * 2}"/>'),
+                   f'w:after="{SPACE_AFTER_BODY}"'),
+    ]
+
+    if notes_text:
+        for para_text in notes_text.split("\n"):
+            if para_text.strip():
+                parts.append(_paragraph(_run(para_text.strip()),
+                                        f'w:line="{LINE_SPACING_ONE_POINT_FIVE}" w:lineRule="auto"'))
+    else:
+        parts.append(_paragraph(_run(NO_NOTES_TEXT, "<w:i/>")))
+
+    parts.append(_paragraph(spacing=f'w:after="{SPACE_AFTER_SPACER}"'))
+    return "".join(parts)
+
+
+def _custom_properties_xml(properties: Dict[str, str]) -> str:
+    entries = "".join(
+        f'<property fmtid="{_CUSTOM_FMTID}" pid="{pid}" name="{escape(name, _ATTR_ENTITIES)}">'
+        f'<vt:lpwstr>{escape(value)}</vt:lpwstr></property>'
+        for pid, (name, value) in enumerate(sorted(properties.items()), start=2)
+    )
+    return f'{_XML_DECLARATION}<Properties xmlns="{_CUSTOM_NS}" xmlns:vt="{_VT_NS}">{entries}</Properties>'
+
+
+def write_notes_docx(notes: Iterable[Dict], output_path: str,
+                     font_name: str = "Calibri", font_size: int = 14,
+                     title: str = "Speaker Notes",
+                     custom_properties: Callable[[], Dict[str, str]] = None) -> int:
+    """
+    Write notes to a .docx, streaming document.xml slide by slide.
+
+    Args:
+        notes: Note dicts (slide_number, slide_title, notes), already sanitized
+        output_path: Where to save the .docx
+        font_name: Body font
+        font_size: Body size in points (headers are two points larger)
+        title: Document title property
+        custom_properties: Optional function returning {name: text} custom
+            document properties; called after the body has been written, so
+            values can summarize the notes that were streamed
+
+    Returns:
+        Number of slides that had notes
+
+    A failed write removes the partial file.
+    """
+    created = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    font = escape(font_name, _ATTR_ENTITIES)
+    slides_with_notes = 0
+
+    try:
+        with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            has_custom = custom_properties is not None
+            zf.writestr("[Content_Types].xml", _CONTENT_TYPES.format(
+                extra=_CUSTOM_CONTENT_TYPE if has_custom else ""))
+            zf.writestr("_rels/.rels", _PACKAGE_RELS.format(
+                extra=_CUSTOM_RELATIONSHIP if has_custom else ""))
+            zf.writestr("docProps/core.xml", _CORE_PROPERTIES.format(title=escape(title), created=created))
+            zf.writestr("docProps/app.xml", _APP_PROPERTIES)
+            zf.writestr("word/_rels/document.xml.rels", _DOCUMENT_RELS)
+            zf.writestr("word/styles.xml", _STYLES.format(
+                font=font, size=font_size * 2,
+                space_after=SPACE_AFTER_BODY, line=LINE_SPACING_ONE_POINT_FIVE
+            ))
+
+            with zf.open("word/document.xml", "w") as doc:
+                doc.write(_DOCUMENT_START.encode("utf-8"))
+                for note in notes:
+                    if note["notes"]:
+                        slides_with_notes += 1
+                    doc.write(_slide_xml(note, font_size).encode("utf-8"))
+                doc.write(_DOCUMENT_END.encode("utf-8"))
+
+            if has_custom:
+                zf.writestr(CUSTOM_PROPERTIES_PART, _custom_properties_xml(custom_properties()))
+    except BaseException:
+        try:
+            os.remove(output_path)
+        except OSError:
+            pass
+        raise
+
+    return slides_with_notes
+
+
+# =============================================================================
+# READER
+# =============================================================================
+
+def _main_document_part(zf: zipfile.ZipFile) -> str:
+    """Main document part name from the package rels (word/document.xml by default)."""
+    try:
+        rels = ET.fromstring(zf.read("_rels/.rels"))
+    except KeyError:
+        return DOCUMENT_PART
+    for rel in rels:
+        if rel.get("Type", "").endswith("/officeDocument"):
+            return rel.get("Target", DOCUMENT_PART).lstrip("/")
+    return DOCUMENT_PART
+
+
+def read_custom_properties(docx_path: str) -> Dict[str, str]:
+    """Text custom document properties of a .docx ({} if it has none)."""
+    with zipfile.ZipFile(docx_path) as zf:
+        try:
+            root = ET.fromstring(zf.read(CUSTOM_PROPERTIES_PART))
+        except KeyError:
+            return {}
+
+    properties = {}
+    for prop in root.findall("{%s}property" % _CUSTOM_NS):
+        value = prop.find("{%s}lpwstr" % _VT_NS)
+        if value is not None:
+            properties[prop.get("name", "")] = value.text or ""
+    return properties
+
+
+def iter_paragraph_text(docx_path: str) -> Iterator[str]:
+    """
+    Yield the text of each body-level paragraph of a .docx, in order.
+
+    Same paragraphs and text as python-docx's doc.paragraphs / para.text:
+    tables, text boxes and content controls are skipped, w:tab reads as a
+    tab and w:br / w:cr as a newline. Text inside tracked insertions is
+    included (deleted text is w:delText and never is), so a reviewer's
+    unaccepted edits still count.
+
+    Memory stays flat: each paragraph is cleared from the tree as soon as
+    it has been yielded.
+    """
+    body_path = (_W + "document", _W + "body")
+
+    with zipfile.ZipFile(docx_path) as zf:
+        with zf.open(_main_document_part(zf)) as part:
+            stack = []
+            body = None
+            current = None
+            # Open w:txbxContent / w:tbl elements inside the current paragraph
+            nested = 0
+
+            for event, elem in ET.iterparse(part, events=("start", "end")):
+                tag = elem.tag
+                if event == "start":
+                    stack.append(tag)
+                    if len(stack) == 2 and tuple(stack) == body_path:
+                        body = elem
+                    elif len(stack) == 3 and tag == _W + "p" and body is not None:
+                        current = []
+                    elif current is not None and tag in (_W + "txbxContent", _W + "tbl"):
+                        nested += 1
+                    continue
+
+                stack.pop()
+
+                if current is not None:
+                    if tag in (_W + "txbxContent", _W + "tbl"):
+                        nested -= 1
+                    elif nested:
+                        pass
+                    elif tag == _W + "t":
+                        current.append(elem.text or "")
+                    elif stack[-1] == _W + "r":
+                        # w:tab is also a tab stop under w:pPr/w:tabs - only runs count
+                        if tag == _W + "tab":
+                            current.append("\t")
+                        elif tag in (_W + "br", _W + "cr"):
+                            current.append("\n")
+
+                # Finished a direct child of w:body: emit and drop it
+                if len(stack) == 2 and body is not None:
+                    if tag == _W + "p" and current is not None:
+                        yield "".join(current)
+                    current = None
+                    nested = 0
+                    body.clear()
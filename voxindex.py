@@ -0,0 +1,466 @@
+"""
+voxindex.py
+Full-text search index over a library of decks for VoxPrep.
+
+Answers "which of our decks mention X?" without opening a single deck:
+slide titles, on-slide text and speaker notes of every .pptx/.pptm in
+the chosen folders are kept in a SQLite FTS5 table, so a query across
+hundreds of decks returns deck, slide and a highlighted snippet in
+milliseconds.
+
+Text comes straight from the OOXML package (voxooxml), never from
+PowerPoint. update() is incremental: a deck whose mtime and size are
+unchanged is skipped without being opened, and inside a changed deck only
+slides whose slide or notes part has a new zip CRC32/size are read again.
+Decks deleted from an indexed folder are dropped from the index.
+
+Example:
+    index = LibraryIndex("C:/Users/me/AppData/Local/VoxPrep/library.sqlite3")
+    index.add_folder("S:/Training/Decks")
+    index.update()
+    for hit in index.search("Acme Corp"):
+        print(hit["deck"], hit["slide_number"], hit["snippet"])
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Callable, Iterable
+
+import voxnotes
+import voxooxml
+
+LOG_PREFIX = "[voxindex]"
+
+SCHEMA_VERSION = 1
+
+# Default number of hits returned by search()
+DEFAULT_SEARCH_LIMIT = 50
+
+# Snippet markers and size (in tokens) around each hit
+SNIPPET_START = "["
+SNIPPET_END = "]"
+SNIPPET_ELLIPSIS = "..."
+SNIPPET_TOKENS = 12
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS folders (
+    path        TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS decks (
+    deck_id     INTEGER PRIMARY KEY,
+    path        TEXT NOT NULL UNIQUE,
+    mtime_ns    INTEGER NOT NULL,
+    size        INTEGER NOT NULL,
+    slide_count INTEGER NOT NULL,
+    updated     REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS slides (
+    slide_key    INTEGER PRIMARY KEY,
+    deck_id      INTEGER NOT NULL REFERENCES decks(deck_id) ON DELETE CASCADE,
+    slide_id     INTEGER NOT NULL,
+    slide_number INTEGER NOT NULL,
+    stamp        TEXT NOT NULL,
+    UNIQUE (deck_id, slide_id)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS slide_text USING fts5(
+    title, body, notes,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def log(msg: str):
+    """Simple logging helper."""
+    print(f"{LOG_PREFIX} {msg}", flush=True)
+
+
+def _path_key(path: str) -> str:
+    return os.path.normcase(str(Path(path).resolve()))
+
+
+def _phrase_query(text: str) -> str:
+    """FTS5 query matching text as one phrase (punctuation in text is not syntax)."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _slide_stamp(pkg, entry: Dict) -> str:
+    """Change stamp of a slide's text: its slide and notes parts' CRC32 and size."""
+    return f"{pkg.part_stamp(entry['slide_part'])}|{pkg.part_stamp(entry['notes_part'])}"
+
+
+def _slide_text(pkg, entry: Dict) -> Dict[str, str]:
+    """{"title", "body", "notes"} text of one slide, read from the package."""
+    slide_xml = pkg.get_xml(entry["slide_part"], cache=False)
+    body = [
+        text_body["text"] for text_body in voxooxml.iter_text_bodies(slide_xml)
+        if text_body["placeholder"] not in ("title", "ctrTitle") and text_body["text"].strip()
+    ]
+    notes = ""
+    if entry["notes_part"]:
+        notes = voxooxml.get_notes_text(pkg.get_xml(entry["notes_part"], cache=False))
+    return {
+        "title": voxooxml.get_slide_title(slide_xml),
+        "body": "\n".join(body),
+        "notes": notes,
+    }
+
+
+class LibraryIndex:
+    """
+    SQLite FTS5 index of the slide text of every deck in a set of folders.
+
+    One connection is shared across threads behind a lock. Each deck is
+    written in a single transaction, so an interrupted update leaves every
+    deck either fully old or fully new.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._migrate()
+
+    def _migrate(self):
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            # Derived data only - safe to throw away and rebuild (folders are kept)
+            self._conn.executescript(
+                "DROP TABLE IF EXISTS slide_text; DROP TABLE IF EXISTS slides; DROP TABLE IF EXISTS decks;"
+            )
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # --- folders ---
+
+    def add_folder(self, folder: str):
+        """Include every deck under folder (recursively) in future updates."""
+        if not os.path.isdir(folder):
+            raise FileNotFoundError(f"Folder not found: {folder}")
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO folders (path) VALUES (?)", (_path_key(folder),))
+
+    def remove_folder(self, folder: str):
+        """Stop indexing a folder and drop its decks from the index."""
+        key = _path_key(folder)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM folders WHERE path = ?", (key,))
+            self._drop_decks(
+                deck_id for deck_id, path in self._conn.execute("SELECT deck_id, path FROM decks").fetchall()
+                if path.startswith(key.rstrip(os.sep) + os.sep)
+            )
+
+    def folders(self) -> List[str]:
+        """Indexed folders."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT path FROM folders ORDER BY path")]
+
+    # --- indexing ---
+
+    def update(self, folders: Iterable[str] = None, log_callback: Callable = None) -> Dict:
+        """
+        Bring the index up to date with the decks on disk.
+
+        Args:
+            folders: Folders to scan (default: every folder added with add_folder())
+            log_callback: Optional function for progress logging
+
+        Returns:
+            {
+                "decks_indexed": 3,       # new or changed decks (re)read
+                "decks_unchanged": 797,
+                "decks_removed": 1,
+                "slides_indexed": 12,     # slides whose text was read
+                "errors": ["S:/.../Broken.pptx: Bad zip file"]
+            }
+        """
+        def _log(msg):
+            if log_callback:
+                log_callback(msg)
+            else:
+                log(msg)
+
+        folders = [_path_key(folder) for folder in (folders if folders is not None else self.folders())]
+        result = {"decks_indexed": 0, "decks_unchanged": 0, "decks_removed": 0,
+                  "slides_indexed": 0, "errors": []}
+        started = time.time()
+
+        seen = set()
+        for folder in folders:
+            if not os.path.isdir(folder):
+                result["errors"].append(f"{folder}: folder not found")
+                _log(f"Skipped missing folder: {folder}")
+                continue
+
+            for deck in voxnotes.find_decks(folder):
+                key = _path_key(deck)
+                seen.add(key)
+                try:
+                    slides_read = self._update_deck(key)
+                except Exception as e:
+                    result["errors"].append(f"{deck}: {e}")
+                    _log(f"  {os.path.relpath(deck, folder)}: FAILED - {e}")
+                    continue
+
+                if slides_read is None:
+                    result["decks_unchanged"] += 1
+                else:
+                    result["decks_indexed"] += 1
+                    result["slides_indexed"] += slides_read
+                    _log(f"  {os.path.relpath(deck, folder)}: {slides_read} slide(s) indexed")
+
+        # Decks that disappeared from the scanned folders
+        prefixes = tuple(folder.rstrip(os.sep) + os.sep for folder in folders if os.path.isdir(folder))
+        with self._lock, self._conn:
+            gone = [
+                deck_id for deck_id, path in self._conn.execute("SELECT deck_id, path FROM decks").fetchall()
+                if path.startswith(prefixes) and path not in seen
+            ]
+            self._drop_decks(gone)
+        result["decks_removed"] = len(gone)
+
+        _log(f"Index updated in {time.time() - started:.1f}s: {result['decks_indexed']} deck(s) indexed, "
+             f"{result['decks_unchanged']} unchanged, {result['decks_removed']} removed")
+        return result
+
+    def _update_deck(self, key: str):
+        """
+        Re-index one deck if it changed on disk.
+
+        Returns:
+            Number of slides whose text was read, or None if the deck was
+            unchanged and not opened
+        """
+        st = os.stat(key)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT deck_id, mtime_ns, size FROM decks WHERE path = ?", (key,)
+            ).fetchone()
+            if row is not None and (row[1], row[2]) == (st.st_mtime_ns, st.st_size):
+                return None
+            stored = {}
+            if row is not None:
+                stored = {
+                    slide_id: (slide_key, stamp) for slide_key, slide_id, stamp in self._conn.execute(
+                        "SELECT slide_key, slide_id, stamp FROM slides WHERE deck_id = ?", (row[0],)
+                    )
+                }
+
+        if not voxooxml.is_ooxml_package(key):
+            raise ValueError("not a .pptx/.pptm package")
+
+        # Read outside the lock; only slides whose parts changed are parsed
+        renumbered = []
+        changed = []
+        with voxooxml.DeckPackage(key) as pkg:
+            slide_count = pkg.slide_count
+            for entry in pkg.slide_index:
+                stamp = _slide_stamp(pkg, entry)
+                slide_key, old_stamp = stored.pop(entry["slide_id"], (None, None))
+                if slide_key is not None and old_stamp == stamp:
+                    renumbered.append((entry["slide_number"], slide_key))
+                else:
+                    changed.append((slide_key, entry, stamp, _slide_text(pkg, entry)))
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO decks (path, mtime_ns, size, slide_count, updated) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET mtime_ns = excluded.mtime_ns, size = excluded.size, "
+                "slide_count = excluded.slide_count, updated = excluded.updated",
+                (key, st.st_mtime_ns, st.st_size, slide_count, time.time())
+            )
+            deck_id = self._conn.execute("SELECT deck_id FROM decks WHERE path = ?", (key,)).fetchone()[0]
+
+            # Slides deleted from the deck
+            for slide_key, _ in stored.values():
+                self._conn.execute("DELETE FROM slide_text WHERE rowid = ?", (slide_key,))
+                self._conn.execute("DELETE FROM slides WHERE slide_key = ?", (slide_key,))
+
+            self._conn.executemany("UPDATE slides SET slide_number = ? WHERE slide_key = ?", renumbered)
+
+            for slide_key, entry, stamp, text in changed:
+                if slide_key is None:
+                    slide_key = self._conn.execute(
+                        "INSERT INTO slides (deck_id, slide_id, slide_number, stamp) VALUES (?, ?, ?, ?)",
+                        (deck_id, entry["slide_id"], entry["slide_number"], stamp)
+                    ).lastrowid
+                else:
+                    self._conn.execute(
+                        "UPDATE slides SET slide_number = ?, stamp = ? WHERE slide_key = ?",
+                        (entry["slide_number"], stamp, slide_key)
+                    )
+                    self._conn.execute("DELETE FROM slide_text WHERE rowid = ?", (slide_key,))
+                self._conn.execute(
+                    "INSERT INTO slide_text (rowid, title, body, notes) VALUES (?, ?, ?, ?)",
+                    (slide_key, text["title"], text["body"], text["notes"])
+                )
+
+        return len(changed)
+
+    def _drop_decks(self, deck_ids: Iterable[int]):
+        """Delete decks and their text (caller holds the lock and a transaction)."""
+        for deck_id in deck_ids:
+            self._conn.execute(
+                "DELETE FROM slide_text WHERE rowid IN (SELECT slide_key FROM slides WHERE deck_id = ?)",
+                (deck_id,)
+            )
+            self._conn.execute("DELETE FROM decks WHERE deck_id = ?", (deck_id,))
+
+    # --- queries ---
+
+    def search(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT, raw: bool = False) -> List[Dict]:
+        """
+        Slides whose title, slide text or notes match query, best first.
+
+        Args:
+            query: Text to find, matched as a phrase, ignoring case and accents
+            limit: Maximum number of hits
+            raw: Treat query as FTS5 syntax instead (AND/OR/NOT, "phrases",
+                prefix*, NEAR(...), column filters like notes: acme)
+
+        Returns:
+            [
+                {
+                    "deck": "S:/Training/Decks/Onboarding.pptx",
+                    "slide_number": 4,
+                    "slide_id": 259,
+                    "slide_title": "Our partners",
+                    "snippet": "...work with [Acme] [Corp] on..."
+                },
+                ...
+            ]
+        """
+        if not query or not query.strip():
+            raise ValueError("Search query cannot be empty")
+
+        sql = (
+            "SELECT d.path, s.slide_number, s.slide_id, t.title, "
+            "snippet(slide_text, -1, ?, ?, ?, ?) "
+            "FROM slide_text t "
+            "JOIN slides s ON s.slide_key = t.rowid "
+            "JOIN decks d ON d.deck_id = s.deck_id "
+            "WHERE slide_text MATCH ? ORDER BY rank LIMIT ?"
+        )
+        params = (SNIPPET_START, SNIPPET_END, SNIPPET_ELLIPSIS, SNIPPET_TOKENS,
+                  query if raw else _phrase_query(query), limit)
+
+        with self._lock:
+            try:
+                rows = self._conn.execute(sql, params).fetchall()
+            except sqlite3.OperationalError as e:
+                raise ValueError(f"Invalid search query: {e}")
+
+        return [
+            {"deck": path, "slide_number": slide_number, "slide_id": slide_id,
+             "slide_title": title, "snippet": " ".join(snippet.split())}
+            for path, slide_number, slide_id, title, snippet in rows
+        ]
+
+    def stats(self) -> Dict:
+        """{"folders": 2, "decks": 812, "slides": 20315}"""
+        with self._lock:
+            return {
+                "folders": self._conn.execute("SELECT COUNT(*) FROM folders").fetchone()[0],
+                "decks": self._conn.execute("SELECT COUNT(*) FROM decks").fetchone()[0],
+                "slides": self._conn.execute("SELECT COUNT(*) FROM slides").fetchone()[0],
+            }
+
+
+# =============================================================================
+# CLI for standalone testing
+# =============================================================================
+
+def _usage():
+    print("Usage: python voxindex.py <command> <index.sqlite3> <args>")
+    print()
+    print("Commands:")
+    print("  add <index> <folder>...        Index the decks under folder(s) and update")
+    print("  remove <index> <folder>        Stop indexing a folder")
+    print("  update <index>                 Re-scan indexed folders (changed decks only)")
+    print("  search <index> <query>         Find slides mentioning query")
+    print("  stats <index>                  Show index size")
+    print()
+    print("Options:")
+    print("  --raw                   Query uses FTS5 syntax (AND/OR, prefix*, notes:...)")
+    print("  --limit=N               Maximum number of hits (default 50)")
+
+
+if __name__ == "__main__":
+    import sys
+
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if len(args) < 2:
+        _usage()
+        sys.exit(64)
+
+    command = args[0].lower()
+    raw = "--raw" in sys.argv
+    limit = next((int(a.split("=", 1)[1]) for a in sys.argv if a.startswith("--limit=")), DEFAULT_SEARCH_LIMIT)
+
+    index = LibraryIndex(args[1])
+    try:
+        if command == "add":
+            if len(args) < 3:
+                print("Usage: python voxindex.py add <index> <folder>...")
+                sys.exit(64)
+            for folder in args[2:]:
+                index.add_folder(folder)
+            result = index.update()
+            if result["errors"]:
+                print(f"Errors: {len(result['errors'])}")
+
+        elif command == "remove":
+            if len(args) < 3:
+                print("Usage: python voxindex.py remove <index> <folder>")
+                sys.exit(64)
+            index.remove_folder(args[2])
+
+        elif command == "update":
+            result = index.update()
+            if result["errors"]:
+                print(f"Errors: {len(result['errors'])}")
+
+        elif command == "search":
+            if len(args) < 3:
+                print("Usage: python voxindex.py search <index> <query>")
+                sys.exit(64)
+            started = time.perf_counter()
+            hits = index.search(" ".join(args[2:]), limit, raw)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            decks = sorted({hit["deck"] for hit in hits})
+            print(f"\n{len(hits)} slide(s) in {len(decks)} deck(s) ({elapsed_ms:.1f} ms):")
+            for hit in hits:
+                print(f"\n  {hit['deck']}")
+                print(f"    Slide {hit['slide_number']}: {hit['slide_title'] or '(no title)'}")
+                print(f"      {hit['snippet']}")
+
+        elif command == "stats":
+            stats = index.stats()
+            print(f"Folders: {stats['folders']}")
+            print(f"Decks: {stats['decks']}")
+            print(f"Slides: {stats['slides']}")
+
+        else:
+            print(f"Unknown command: {command}")
+            _usage()
+            sys.exit(64)
+
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(2)
+    finally:
+        index.close()
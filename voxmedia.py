@@ -6,6 +6,7 @@ Handles audio/video embedded in PowerPoint decks:
 - Strip all audio from slides
 - Export media with slide-based naming (slide01.wav, slide02.mp4, etc.)
 - Import audio back using voxattach
+- Join per-chunk TTS audio (slide03_01.wav, slide03_02.wav) into slide03.wav
 
 Example:
     # Remove all audio
@@ -17,16 +18,25 @@ Example:
     
     # Import cleaned audio back
     import_audio("Training.pptx", "media_folder")
+    
+    # TTS audio synthesized per chunk (see voxnotes.export_tts_chunks)
+    assemble_chunk_audio("media_folder")
+    import_audio("Training.pptx", "media_folder")
 """
 
 import os
+import posixpath
 import re
 import shutil
+import string
 import time
+import wave
 import zipfile
 from pathlib import Path
 from typing import List, Dict, Optional, Callable
-from xml.etree import ElementTree as ET
+
+import voxdeck
+import voxnotes
 
 try:
     from win32com.client import Dispatch, gencache
@@ -54,6 +64,28 @@ LOG_PREFIX = "[voxmedia]"
 COM_RETRY_ATTEMPTS = 3
 COM_RETRY_DELAY = 1.5
 
+def _chunk_audio_pattern(chunk_id: str):
+    """
+    Regex matching chunk_id + ".wav", with a named group per field.
+    
+    A {field:0Nd} field only matches N or more digits, so extracted media
+    such as slide03_1.wav (see export_media) is not taken for a TTS chunk.
+    """
+    pattern = ""
+    for literal, field, spec, _ in string.Formatter().parse(chunk_id):
+        pattern += re.escape(literal)
+        if field is not None:
+            width = int(spec.rstrip("d").lstrip("0") or 1)
+            pattern += rf"(?P<{field}>\d{{{width},}})"
+    return re.compile(rf"^{pattern}\.wav$", re.IGNORECASE)
+
+
+# Per-chunk TTS audio, named by voxnotes.TTS_CHUNK_ID
+CHUNK_AUDIO_PATTERN = _chunk_audio_pattern(voxnotes.TTS_CHUNK_ID)
+
+# Frames copied per read when joining chunk audio
+CHUNK_COPY_FRAMES = 64 * 1024
+
 
 def log(msg: str):
     """Simple logging helper."""
@@ -193,62 +225,58 @@ def _parse_pptx_media_relationships(pptx_path: str) -> Dict[int, List[Dict]]:
     """
     Parse PPTX (ZIP) to map slides to their embedded media files.
     
+    Slide numbers are presentation (play) order from the shared slide index,
+    not the slideN.xml file names, so reordered decks export correctly.
+    
     Returns:
         Dict mapping slide_number -> list of {filename, media_type, internal_path}
     """
-    slide_media = {}
+    deck = voxdeck.get_deck(pptx_path)
+    media_by_slide = deck.slide_view("media", _collect_slide_media)
     
-    with zipfile.ZipFile(pptx_path, 'r') as zf:
-        # Find all slide relationship files
-        slide_rels = [n for n in zf.namelist() if re.match(r'ppt/slides/_rels/slide\d+\.xml\.rels', n)]
-        
-        for rel_path in slide_rels:
-            # Extract slide number from path
-            match = re.search(r'slide(\d+)\.xml\.rels', rel_path)
-            if not match:
-                continue
-            slide_num = int(match.group(1))
-            
-            # Parse the relationships XML
-            rel_content = zf.read(rel_path).decode('utf-8')
-            root = ET.fromstring(rel_content)
-            
-            media_files = []
-            ns = {'r': 'http://schemas.openxmlformats.org/package/2006/relationships'}
-            
-            for rel in root.findall('.//r:Relationship', ns):
-                rel_type = rel.get('Type', '')
-                target = rel.get('Target', '')
-                
-                # Look for audio or video relationships
-                if 'audio' in rel_type.lower() or 'video' in rel_type.lower():
-                    # Target is relative path like ../media/media1.m4a
-                    if target.startswith('../media/'):
-                        media_filename = target.replace('../media/', '')
-                        internal_path = f'ppt/media/{media_filename}'
-                        
-                        # Determine media type from extension
-                        ext = os.path.splitext(media_filename)[1].lower()
-                        if ext in ['.m4a', '.mp3', '.wav', '.wma', '.aiff']:
-                            media_type = 'audio'
-                        elif ext in ['.mp4', '.m4v', '.mov', '.wmv', '.avi']:
-                            media_type = 'video'
-                        else:
-                            media_type = 'unknown'
-                        
-                        media_files.append({
-                            'filename': media_filename,
-                            'media_type': media_type,
-                            'internal_path': internal_path,
-                            'extension': ext
-                        })
-            
-            if media_files:
-                slide_media[slide_num] = media_files
+    slide_media = {}
+    for slide, media_files in zip(deck.slides, media_by_slide):
+        if media_files:
+            slide_media[slide["slide_number"]] = [dict(m) for m in media_files]
     
     return slide_media
 
 
+def _collect_slide_media(pkg, slide: Dict) -> List[Dict]:
+    """Deck model view: audio/video parts related to one slide."""
+    media_files = []
+    
+    for rel in pkg.get_rels(slide["slide_part"]).values():
+        rel_type = rel["type"].lower()
+        internal_path = rel["part"]
+        
+        # Look for audio or video relationships (skip linked media)
+        if rel["external"] or not ('audio' in rel_type or 'video' in rel_type):
+            continue
+        if not internal_path.startswith('ppt/media/'):
+            continue
+        
+        media_filename = posixpath.basename(internal_path)
+        
+        # Determine media type from extension
+        ext = os.path.splitext(media_filename)[1].lower()
+        if ext in ['.m4a', '.mp3', '.wav', '.wma', '.aiff']:
+            media_type = 'audio'
+        elif ext in ['.mp4', '.m4v', '.mov', '.wmv', '.avi']:
+            media_type = 'video'
+        else:
+            media_type = 'unknown'
+        
+        media_files.append({
+            'filename': media_filename,
+            'media_type': media_type,
+            'internal_path': internal_path,
+            'extension': ext
+        })
+    
+    return media_files
+
+
 def export_media(pptx_path: str, output_folder: str, log_callback: Optional[Callable] = None) -> Dict:
     """
     Export all embedded audio/video from a PowerPoint deck.
@@ -354,7 +382,8 @@ def import_audio(pptx_path: str, media_folder: str, log_callback: Optional[Calla
     Import audio files back into PowerPoint slides.
     
     Looks for files named slideXX.wav in the media folder and attaches
-    them to the corresponding slides using voxattach.
+    them to the corresponding slides using voxattach. Per-chunk TTS audio
+    (slideXX_YY.wav) is not picked up; run assemble_chunk_audio() first.
     
     Args:
         pptx_path: Path to the PowerPoint file
@@ -450,6 +479,117 @@ def import_audio(pptx_path: str, media_folder: str, log_callback: Optional[Calla
     }
 
 
+# ============================================================
+# CHUNK AUDIO
+# ============================================================
+
+def assemble_chunk_audio(media_folder: str, gap_ms: int = 0,
+                         log_callback: Optional[Callable] = None) -> Dict:
+    """
+    Join per-chunk TTS audio into one slideXX.wav per slide.
+    
+    voxnotes.export_tts_chunks() names chunks slide03_01, slide03_02, ...;
+    synthesized to slide03_01.wav, slide03_02.wav, ... they are joined in
+    chunk order into slide03.wav, ready for import_audio(). All chunks of a
+    slide must share one WAV format. A slide with a missing chunk number
+    is reported and left unassembled rather than joined with a hole.
+    
+    Args:
+        media_folder: Folder containing slideXX_YY.wav files
+        gap_ms: Silence inserted between chunks, in milliseconds
+        log_callback: Optional function for progress logging
+    
+    Returns:
+        Dict with 'success', 'slides_assembled' (slide numbers) and 'errors'
+    """
+    def _log(msg):
+        if log_callback:
+            log_callback(msg)
+        else:
+            log(msg)
+    
+    if not os.path.isdir(media_folder):
+        raise FileNotFoundError(f"Media folder not found: {media_folder}")
+    
+    # slide number -> {chunk number: path}
+    chunks = {}
+    for filename in os.listdir(media_folder):
+        match = CHUNK_AUDIO_PATTERN.match(filename)
+        if match:
+            slide_chunks = chunks.setdefault(int(match.group("slide")), {})
+            slide_chunks[int(match.group("chunk"))] = os.path.join(media_folder, filename)
+    
+    if not chunks:
+        _log("No slideXX_YY.wav chunk files found in media folder.")
+        return {"success": True, "slides_assembled": [], "errors": []}
+    
+    _log(f"Assembling chunk audio for {len(chunks)} slide(s)")
+    
+    slides_assembled = []
+    errors = []
+    
+    for slide_num in sorted(chunks):
+        slide_chunks = chunks[slide_num]
+        order = sorted(slide_chunks)
+        out_path = os.path.join(media_folder, f"slide{slide_num:02d}.wav")
+        
+        missing = sorted(set(range(1, order[-1] + 1)) - set(order))
+        if missing:
+            errors.append(f"Slide {slide_num}: missing chunk(s) {', '.join(map(str, missing))}")
+            _log(f"  Slide {slide_num}: missing chunk(s) {', '.join(map(str, missing))} - skipped")
+            continue
+        
+        tmp_path = out_path + ".tmp"
+        try:
+            _join_wav([slide_chunks[n] for n in order], tmp_path, gap_ms)
+            os.replace(tmp_path, out_path)
+            slides_assembled.append(slide_num)
+            _log(f"  Slide {slide_num}: {len(order)} chunk(s) -> {os.path.basename(out_path)}")
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            errors.append(f"Slide {slide_num}: {e}")
+            _log(f"  Slide {slide_num}: failed - {e}")
+    
+    _log(f"Assembled audio for {len(slides_assembled)} slide(s)")
+    
+    return {
+        "success": not errors,
+        "slides_assembled": slides_assembled,
+        "errors": errors
+    }
+
+
+def _join_wav(paths: List[str], out_path: str, gap_ms: int = 0):
+    """Concatenate WAV files with identical formats, streaming frames."""
+    with wave.open(paths[0], 'rb') as first:
+        params = first.getparams()
+    
+    fmt = (params.nchannels, params.sampwidth, params.framerate)
+    frame_size = params.nchannels * params.sampwidth
+    # 8-bit WAV is unsigned: silence is 0x80, not 0x00
+    silence_byte = b"\x80" if params.sampwidth == 1 else b"\x00"
+    gap = silence_byte * (frame_size * (params.framerate * gap_ms // 1000))
+    
+    with wave.open(out_path, 'wb') as out:
+        out.setnchannels(params.nchannels)
+        out.setsampwidth(params.sampwidth)
+        out.setframerate(params.framerate)
+        
+        for index, path in enumerate(paths):
+            with wave.open(path, 'rb') as src:
+                if (src.getnchannels(), src.getsampwidth(), src.getframerate()) != fmt:
+                    raise ValueError(f"{os.path.basename(path)} has a different audio format than "
+                                     f"{os.path.basename(paths[0])}")
+                if index and gap:
+                    out.writeframes(gap)
+                while True:
+                    frames = src.readframes(CHUNK_COPY_FRAMES)
+                    if not frames:
+                        break
+                    out.writeframes(frames)
+
+
 # ============================================================
 # CLI
 # ============================================================
@@ -459,6 +599,7 @@ def _usage():
     print("  python voxmedia.py strip <deck.pptx>")
     print("  python voxmedia.py export <deck.pptx> <output_folder>")
     print("  python voxmedia.py import <deck.pptx> <media_folder>")
+    print("  python voxmedia.py assemble <media_folder> [gap_ms]")
 
 
 if __name__ == "__main__":
@@ -484,6 +625,14 @@ if __name__ == "__main__":
             result = export_media(deck_path, output_folder)
             print(f"Exported {result['files_exported']} file(s)")
             
+        elif command == "assemble":
+            # deck_path is the media folder for this command
+            gap_ms = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+            result = assemble_chunk_audio(deck_path, gap_ms)
+            print(f"Assembled {len(result['slides_assembled'])} slide(s)")
+            if result['errors']:
+                sys.exit(1)
+            
         elif command == "import":
             if len(sys.argv) < 4:
                 print("Error: media_folder required for import")
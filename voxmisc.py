@@ -19,6 +19,9 @@ import time
 from pathlib import Path
 from typing import Dict, Optional, Callable, List
 
+import voxdeck
+import voxooxml
+
 try:
     from win32com.client import Dispatch, gencache
     import pywintypes
@@ -93,6 +96,11 @@ def strip_all_animations(pptx_path: str, log_callback: Optional[Callable] = None
     
     Returns:
         Dict with 'success', 'slides_modified', 'effects_removed' counts
+    
+    .pptx packages are edited directly: each animated slide's p:timing
+    element is cut out of its XML and only those slide parts are rewritten
+    (media and every other part are copied through untouched). Other files
+    fall back to COM.
     """
     def _log(msg):
         if log_callback:
@@ -100,6 +108,12 @@ def strip_all_animations(pptx_path: str, log_callback: Optional[Callable] = None
         else:
             log(msg)
     
+    if voxooxml.is_ooxml_package(pptx_path):
+        try:
+            return _strip_animations_ooxml(pptx_path, _log)
+        except Exception as e:
+            raise RuntimeError(f"Strip animations failed: {e}")
+    
     if not HAS_COM:
         raise RuntimeError("Windows COM API not available (pywin32 not installed)")
     
@@ -201,6 +215,53 @@ def strip_all_animations(pptx_path: str, log_callback: Optional[Callable] = None
                 pass
 
 
+def _strip_animations_ooxml(pptx_path: str, _log: Callable) -> Dict:
+    """Remove p:timing (main + interactive sequences, build list) from every animated slide."""
+    timing_tag = f"{{{voxooxml.NS['p']}}}timing"
+    
+    total_removed = 0
+    slides_modified = []
+    changes = {}
+    
+    with voxooxml.DeckPackage(pptx_path) as pkg:
+        _log(f"Scanning {pkg.slide_count} slides for animations...")
+        
+        for entry in pkg.slide_index:
+            slide_num = entry["slide_number"]
+            part_name = entry["slide_part"]
+            
+            timing = pkg.get_xml(part_name).find("p:timing", voxooxml.NS)
+            if timing is None:
+                continue
+            
+            # Every effect (entrance, exit, emphasis, motion, media, trigger)
+            # has a time node carrying a presetClass
+            effect_count = sum(1 for ctn in timing.iter(f"{{{voxooxml.NS['p']}}}cTn")
+                               if ctn.get("presetClass"))
+            if effect_count == 0:
+                continue
+            
+            data = pkg.read_part(part_name)
+            spans = [s for s in voxooxml.find_element_spans(data, {timing_tag}) if s["depth"] == 1]
+            changes[part_name] = voxooxml.splice(data, [(s["start"], s["end"], b"") for s in spans])
+            
+            slides_modified.append(slide_num)
+            total_removed += effect_count
+            _log(f"  Slide {slide_num}: removed {effect_count} animation(s)")
+    
+    if changes:
+        voxooxml.write_package(pptx_path, pptx_path, changes)
+        _log(f"Saved. Removed {total_removed} animation(s) from {len(slides_modified)} slide(s).")
+    else:
+        _log("No animations found in deck.")
+    
+    return {
+        "success": True,
+        "effects_removed": total_removed,
+        "slides_modified": slides_modified
+    }
+
+
 # ============================================================
 # ANALYZE FONTS
 # ============================================================
@@ -215,6 +276,9 @@ def analyze_fonts(pptx_path: str, log_callback: Optional[Callable] = None) -> Di
     
     Returns:
         Dict with 'success', 'fonts' (dict of font_name -> count), 'total_runs'
+    
+    .pptx packages are read directly from the slide XML (no PowerPoint
+    needed); other files fall back to COM.
     """
     def _log(msg):
         if log_callback:
@@ -222,6 +286,29 @@ def analyze_fonts(pptx_path: str, log_callback: Optional[Callable] = None) -> Di
         else:
             log(msg)
     
+    if voxooxml.is_ooxml_package(pptx_path):
+        try:
+            deck = voxdeck.get_deck(pptx_path)
+            _log(f"Analyzing fonts in {deck.slide_count} slides...")
+            fonts = {}
+            for slide_fonts in deck.slide_view("fonts", _count_slide_fonts):
+                for font_name, count in slide_fonts.items():
+                    fonts[font_name] = fonts.get(font_name, 0) + count
+        except Exception as e:
+            raise RuntimeError(f"Analyze fonts failed: {e}")
+        
+        total_runs = sum(fonts.values())
+        
+        _log(f"Found {len(fonts)} unique font(s) across {total_runs} text run(s)")
+        for font_name, count in sorted(fonts.items(), key=lambda x: -x[1]):
+            _log(f"  {font_name}: {count}")
+        
+        return {
+            "success": True,
+            "fonts": fonts,
+            "total_runs": total_runs
+        }
+    
     if not HAS_COM:
         raise RuntimeError("Windows COM API not available (pywin32 not installed)")
     
@@ -286,6 +373,47 @@ def analyze_fonts(pptx_path: str, log_callback: Optional[Callable] = None) -> Di
                 pass
 
 
+def _count_slide_fonts(pkg, slide: Dict) -> Dict:
+    """
+    Deck model view: text runs per font on one slide, read from the slide XML.
+    
+    Runs without an explicit a:latin typeface inherit the theme font:
+    the major (heading) font for title placeholders, the minor (body)
+    font for everything else.
+    """
+    fonts = {}
+    
+    sp_tree = pkg.get_xml(slide["slide_part"], cache=False).find("p:cSld/p:spTree", voxooxml.NS)
+    if sp_tree is None:
+        return fonts
+    
+    theme = pkg.theme_fonts()
+    
+    for shape in voxooxml.iter_shapes(sp_tree):
+        # Group children are yielded on their own
+        if shape.tag.endswith("}grpSp"):
+            continue
+        
+        if voxooxml.placeholder_type(shape) in ("title", "ctrTitle"):
+            default_font = theme.get("major", "")
+        else:
+            default_font = theme.get("minor", "")
+        
+        for run in shape.iter(f"{{{voxooxml.NS['a']}}}r"):
+            latin = run.find("a:rPr/a:latin", voxooxml.NS)
+            font_name = latin.get("typeface", "") if latin is not None else ""
+            if font_name == "+mj-lt":
+                font_name = theme.get("major", "")
+            elif font_name == "+mn-lt":
+                font_name = theme.get("minor", "")
+            elif not font_name:
+                font_name = default_font
+            if font_name:
+                fonts[font_name] = fonts.get(font_name, 0) + 1
+    
+    return fonts
+
+
 def _analyze_shape_fonts(shape, fonts: Dict):
     """Recursively analyze fonts in a shape and its children."""
     try:
@@ -9,6 +9,7 @@ Export formats:
     - .docx: VO-friendly Word document (sans-serif, 14pt, generous spacing)
     - .txt: Plain text with slide markers
     - .md: Markdown with slide headers
+    - .jsonl: One JSON record per slide, for TTS pipelines and other tools
 
 Example:
     notes = extract_notes("Training.pptx")
@@ -18,13 +19,27 @@ Example:
     edited = parse_notes_file("Training_notes.docx")
     changes = compare_notes(notes, edited)
     apply_notes("Training.pptx", changes)
+    
+    # Or, preview then apply with one extraction:
+    session = ImportSession("Training.pptx", "Training_notes.docx")
+    session.preview()
+    session.apply()
 """
 
+import difflib
+import glob
+import hashlib
+import json
 import os
 import re
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Optional, Callable
+from typing import List, Dict, Optional, Callable, Iterable, Iterator
+
+import voxdeck
+import voxdocx
+import voxooxml
 
 try:
     from win32com.client import Dispatch, gencache
@@ -38,20 +53,28 @@ try:
 except Exception:
     HAS_WIN32API = False
 
-try:
-    from docx import Document
-    from docx.shared import Pt, Inches
-    from docx.enum.text import WD_LINE_SPACING
-    HAS_DOCX = True
-except Exception:
-    HAS_DOCX = False
-
 LOG_PREFIX = "[voxnotes]"
 
 # COM retry settings
 COM_RETRY_ATTEMPTS = 3
 COM_RETRY_DELAY = 1.5  # seconds
 
+# Write buffer for streamed text exports
+EXPORT_BUFFER_SIZE = 64 * 1024
+
+# TTS chunk export: default character budget per chunk, and chunk naming.
+# Chunk IDs extend voxmedia's slideNN audio names (slide03_01.wav, ...).
+TTS_CHUNK_CHARS = 2500
+TTS_CHUNK_ID = "slide{slide:02d}_{chunk:02d}"
+
+# Batch export: decks the COM-free reader can handle
+BATCH_DECK_EXTENSIONS = ('.pptx', '.pptm')
+
+# Export fingerprints: a docx custom property, or a trailing comment line in txt/md
+FINGERPRINT_VERSION = "v2"
+FINGERPRINT_PROPERTY = "VoxPrepFingerprint"
+FINGERPRINT_LINE = re.compile(r'^<!--\s*voxprep-fingerprint\s+(.*?)\s*-->$')
+
 
 def log(msg: str):
     """Simple logging helper."""
@@ -143,14 +166,34 @@ def extract_notes(pptx_path: str, log_callback: Callable = None) -> List[Dict]:
         [
             {
                 "slide_number": 1,
+                "slide_id": 256,        # p:sldId id, stable when slides move
                 "slide_title": "Introduction",
+                "section": "Overview",  # "" if the deck has no sections
                 "notes": "Welcome to this training module..."
             },
             ...
         ]
     
     Raises:
-        RuntimeError: If COM not available or file can't be opened
+        RuntimeError: If the deck can't be read (or, for non-OOXML decks,
+            COM is not available)
+    
+    .pptx/.pptm files are read straight from the notesSlide XML, without
+    PowerPoint; legacy formats fall back to COM.
+    """
+    return list(iter_notes(pptx_path, log_callback))
+
+
+def iter_notes(pptx_path: str, log_callback: Callable = None) -> Iterator[Dict]:
+    """
+    Yield speaker notes one slide at a time, in the same dicts as extract_notes().
+    
+    Slides are read lazily as the caller iterates, so an exporter can write
+    the first slides while later ones are still being read, and memory use
+    does not grow with deck size.
+    
+    Example:
+        export_to_txt(iter_notes("Training.pptx"), "Training_notes.txt")
     """
     def _log(msg):
         if log_callback:
@@ -158,6 +201,90 @@ def extract_notes(pptx_path: str, log_callback: Callable = None) -> List[Dict]:
         else:
             log(msg)
     
+    if voxooxml.is_ooxml_package(pptx_path):
+        try:
+            yield from _iter_notes_ooxml(pptx_path, _log)
+        except Exception as e:
+            raise RuntimeError(f"Failed to extract notes: {e}")
+    else:
+        yield from _iter_notes_com(pptx_path, _log)
+
+
+def read_slide_notes(pptx_path: str, slide_numbers: Iterable[int] = (),
+                     slide_ids: Iterable[int] = (),
+                     log_callback: Callable = None) -> List[Dict]:
+    """
+    Notes of selected slides only, in the same dicts as extract_notes().
+    
+    Slides are selected by current position, by slide ID, or both. For
+    .pptx/.pptm only those slides' notes pages are read (or served from the
+    deck cache); legacy decks are read in full through COM and filtered.
+    """
+    wanted = set(slide_numbers)
+    wanted_ids = set(slide_ids)
+    
+    if voxooxml.is_ooxml_package(pptx_path):
+        try:
+            deck = voxdeck.get_deck(pptx_path)
+            wanted.update(slide["slide_number"] for slide in deck.slides if slide["slide_id"] in wanted_ids)
+            sections = _section_names(deck)
+            return [
+                {
+                    "slide_number": slide["slide_number"],
+                    "slide_id": slide["slide_id"],
+                    "slide_title": sanitize_text(title),
+                    "section": sections.get(slide["slide_number"], ""),
+                    "notes": sanitize_text(notes_text)
+                }
+                for slide, title, notes_text in deck.iter_notes(wanted)
+            ]
+        except Exception as e:
+            raise RuntimeError(f"Failed to extract notes: {e}")
+    
+    return [
+        note for note in iter_notes(pptx_path, log_callback)
+        if note["slide_number"] in wanted or note["slide_id"] in wanted_ids
+    ]
+
+
+def _iter_notes_ooxml(pptx_path: str, _log: Callable) -> Iterator[Dict]:
+    """iter_notes() for .pptx/.pptm: read titles and notes from the package XML."""
+    deck = voxdeck.get_deck(pptx_path)
+    slide_count = deck.slide_count
+    sections = _section_names(deck)
+    
+    _log(f"Extracting notes from {slide_count} slides...")
+    
+    notes_count = 0
+    for i, (slide, title, notes_text) in enumerate(deck.iter_notes(), start=1):
+        if notes_text:
+            notes_count += 1
+            _log(f"  Slide {i}: {len(notes_text)} chars")
+        else:
+            _log(f"  Slide {i}: (no notes)")
+        
+        yield {
+            "slide_number": i,
+            "slide_id": slide["slide_id"],
+            "slide_title": sanitize_text(title),
+            "section": sections.get(i, ""),
+            "notes": sanitize_text(notes_text)
+        }
+    
+    _log(f"Extracted notes from {notes_count} of {slide_count} slides")
+
+
+def _section_names(deck) -> Dict[int, str]:
+    """Section name per 1-based slide position."""
+    names = {}
+    for name, first_slide, slide_count in deck.sections:
+        for slide_num in range(first_slide, first_slide + slide_count):
+            names[slide_num] = name
+    return names
+
+
+def _iter_notes_com(pptx_path: str, _log: Callable) -> Iterator[Dict]:
+    """iter_notes() through PowerPoint COM (legacy .ppt decks)."""
     if not HAS_COM:
         raise RuntimeError("Windows COM API not available (pywin32 not installed)")
     
@@ -176,7 +303,7 @@ def extract_notes(pptx_path: str, log_callback: Callable = None) -> List[Dict]:
         
         pres = open_presentation_with_retry(app, pptx_path, read_only=True)
         
-        notes_data = []
+        notes_count = 0
         slide_count = pres.Slides.Count
         
         _log(f"Extracting notes from {slide_count} slides...")
@@ -219,22 +346,34 @@ def extract_notes(pptx_path: str, log_callback: Callable = None) -> List[Dict]:
             except:
                 pass
             
-            notes_data.append({
-                "slide_number": i,
-                "slide_title": sanitize_text(title),
-                "notes": sanitize_text(notes_text)
-            })
-            
             if notes_text:
+                notes_count += 1
                 _log(f"  Slide {i}: {len(notes_text)} chars")
             else:
                 _log(f"  Slide {i}: (no notes)")
+            
+            try:
+                slide_id = slide.SlideID
+            except:
+                slide_id = None
+            
+            section = ""
+            try:
+                if pres.SectionProperties.Count:
+                    section = pres.SectionProperties.Name(slide.sectionIndex)
+            except:
+                pass
+            
+            yield {
+                "slide_number": i,
+                "slide_id": slide_id,
+                "slide_title": sanitize_text(title),
+                "section": sanitize_text(section),
+                "notes": sanitize_text(notes_text)
+            }
         
-        notes_count = sum(1 for n in notes_data if n["notes"])
         _log(f"Extracted notes from {notes_count} of {slide_count} slides")
         
-        return notes_data
-        
     except Exception as e:
         raise RuntimeError(f"Failed to extract notes: {e}")
     
@@ -252,13 +391,109 @@ def extract_notes(pptx_path: str, log_callback: Callable = None) -> List[Dict]:
                 pass
 
 
+# =============================================================================
+# FINGERPRINTS
+# =============================================================================
+
+def deck_fingerprint(pptx_path: str) -> str:
+    """
+    Cheap content fingerprint of a deck file.
+    
+    Built from the file size and voxdeck's quick hash of the first and last
+    64 KB - the tail is the zip central directory, which holds every part's
+    CRC. Unlike the cache signature it ignores mtime, so a copied deck
+    keeps its fingerprint.
+    """
+    _, size, quick_hash = voxdeck.deck_signature(pptx_path)
+    return f"{size:x}-{quick_hash[:16]}"
+
+
+def _format_fingerprint(deck_fp: Optional[str], slide_hashes: List) -> str:
+    """slide_hashes: (slide_number, slide_id or None, notes_hash) per exported slide."""
+    slides = ",".join(
+        f"{slide_num}:{'' if slide_id is None else slide_id}:{digest}"
+        for slide_num, slide_id, digest in slide_hashes
+    )
+    return f"{FINGERPRINT_VERSION} deck={deck_fp or '-'} slides={slides}"
+
+
+def _fingerprint_comment(deck_fp: Optional[str], slide_hashes: List) -> str:
+    """Trailing fingerprint line for txt/md exports."""
+    return f"\n<!-- voxprep-fingerprint {_format_fingerprint(deck_fp, slide_hashes)} -->\n"
+
+
+def _parse_fingerprint(value: str) -> Optional[Dict]:
+    parts = value.split()
+    if not parts or parts[0] not in ("v1", FINGERPRINT_VERSION):
+        return None
+    
+    fields = dict(part.split("=", 1) for part in parts[1:] if "=" in part)
+    
+    # v1 items are "number:hash", v2 items "number:slide_id:hash"
+    slides = {}
+    for item in fields.get("slides", "").split(","):
+        slide_num, _, rest = item.partition(":")
+        slide_id, _, digest = rest.rpartition(":")
+        if slide_num.isdigit() and digest:
+            slides[int(slide_num)] = {
+                "slide_id": int(slide_id) if slide_id.isdigit() else None,
+                "hash": digest,
+            }
+    
+    deck = fields.get("deck", "-")
+    return {"deck": "" if deck == "-" else deck, "slides": slides}
+
+
+def read_notes_fingerprint(file_path: str) -> Optional[Dict]:
+    """
+    Fingerprint embedded in an exported notes file, if it still has one.
+    
+    Every export records each slide's ID and the hash of its notes as
+    exported (and the deck_fingerprint() of the source deck), so an import
+    can tell which slides the editor touched without opening the deck, and
+    find them again after slides were inserted or reordered.
+    
+    Returns:
+        {
+            "deck": "1a2b3c-9f86d081884c7d65",
+            "slides": {1: {"slide_id": 256, "hash": "60303ae22b998861"}, ...}
+        }
+        or None for files without a (readable) fingerprint
+    """
+    ext = Path(file_path).suffix.lower()
+    value = None
+    
+    try:
+        if ext == '.docx':
+            value = voxdocx.read_custom_properties(file_path).get(FINGERPRINT_PROPERTY)
+        elif ext == '.jsonl':
+            slides = {
+                record["slide_number"]: {"slide_id": record.get("slide_id"), "hash": record["hash"]}
+                for record in iter_jsonl_notes(file_path) if record.get("hash")
+            }
+            # No deck fingerprint, so imports always check for conflicts
+            return {"deck": "", "slides": slides} if slides else None
+        elif ext in ('.txt', '.md'):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    match = FINGERPRINT_LINE.match(line.strip())
+                    if match:
+                        value = match.group(1)
+    except Exception as e:
+        log(f"Could not read fingerprint from {os.path.basename(file_path)}: {e}")
+        return None
+    
+    return _parse_fingerprint(value) if value else None
+
+
 # =============================================================================
 # EXPORT FUNCTIONS
 # =============================================================================
 
-def export_to_docx(notes: List[Dict], output_path: str, 
+def export_to_docx(notes: Iterable[Dict], output_path: str, 
                    font_name: str = "Calibri", font_size: int = 14,
-                   log_callback: Callable = None) -> str:
+                   log_callback: Callable = None,
+                   deck_fp: str = None) -> str:
     """
     Export notes to Word document formatted for VO recording.
     
@@ -268,16 +503,23 @@ def export_to_docx(notes: List[Dict], output_path: str,
         font_name: Font family (default: Calibri)
         font_size: Font size in points (default: 14)
         log_callback: Optional function for progress logging
+        deck_fp: Optional deck_fingerprint() of the source deck
     
     Returns:
         Path to created file
     
+    The fingerprint (see read_notes_fingerprint) is stored as a hidden
+    custom document property.
+    
     Format:
         - Sans-serif font (Calibri/Arial)
         - 14pt or larger
         - 1.5 line spacing
         - Clear slide separators
         - NO thumbnails (what breaks PowerPoint's export)
+    
+    Written by voxdocx straight from a template package, so python-docx
+    is not needed for export.
     """
     def _log(msg):
         if log_callback:
@@ -285,82 +527,63 @@ def export_to_docx(notes: List[Dict], output_path: str,
         else:
             log(msg)
     
-    if not HAS_DOCX:
-        raise RuntimeError("python-docx not installed (pip install python-docx)")
-    
     _log(f"Creating Word document: {os.path.basename(output_path)}")
     
-    doc = Document()
+    slide_hashes = []
     
-    # Set default font for document
-    style = doc.styles['Normal']
-    style.font.name = font_name
-    style.font.size = Pt(font_size)
-    style.paragraph_format.line_spacing_rule = WD_LINE_SPACING.ONE_POINT_FIVE
-    style.paragraph_format.space_after = Pt(12)
-    
-    slides_with_notes = 0
-    
-    for note in notes:
-        slide_num = note["slide_number"]
-        title = note["slide_title"]
-        notes_text = note["notes"]
-        
-        # Slide header
-        if title:
-            header_text = f"Slide {slide_num}: {sanitize_text(title)}"
-        else:
-            header_text = f"Slide {slide_num}"
-        
-        # Add slide header (bold, slightly larger)
-        header = doc.add_paragraph()
-        header_run = header.add_run(header_text)
-        header_run.bold = True
-        header_run.font.size = Pt(font_size + 2)
-        header.paragraph_format.space_before = Pt(18)
-        header.paragraph_format.space_after = Pt(6)
-        
-        # Add separator line
-        separator = doc.add_paragraph()
-        sep_run = separator.add_run("─" * 50)
-        sep_run.font.size = Pt(10)
-        separator.paragraph_format.space_after = Pt(12)
-        
-        # Add notes content (or placeholder)
-        if notes_text:
-            # Sanitize and split by paragraphs
-            clean_notes = sanitize_text(notes_text)
-            paragraphs = clean_notes.split('\n')
-            for para_text in paragraphs:
-                if para_text.strip():
-                    para = doc.add_paragraph(para_text.strip())
-                    para.paragraph_format.line_spacing_rule = WD_LINE_SPACING.ONE_POINT_FIVE
-            slides_with_notes += 1
-        else:
-            # Empty placeholder for slides without notes
-            para = doc.add_paragraph("[No notes]")
-            para.runs[0].italic = True
-        
-        # Add spacing after each slide's notes
-        spacer = doc.add_paragraph()
-        spacer.paragraph_format.space_after = Pt(6)
+    def _clean_notes():
+        for note in notes:
+            clean = {
+                "slide_number": note["slide_number"],
+                "slide_title": sanitize_text(note["slide_title"]),
+                "notes": sanitize_text(note["notes"])
+            }
+            slide_hashes.append((clean["slide_number"], note.get("slide_id"), notes_hash(clean["notes"])))
+            yield clean
     
-    doc.save(output_path)
+    slides_with_notes = voxdocx.write_notes_docx(
+        _clean_notes(), output_path, font_name, font_size,
+        custom_properties=lambda: {
+            FINGERPRINT_PROPERTY: _format_fingerprint(deck_fp, slide_hashes)
+        }
+    )
     
     _log(f"Exported {slides_with_notes} slides with notes to {os.path.basename(output_path)}")
     
     return output_path
 
 
-def export_to_txt(notes: List[Dict], output_path: str,
-                  log_callback: Callable = None) -> str:
+def _write_streamed(output_path: str, chunks: Iterable[str]):
+    """
+    Write text chunks through a buffered handle as they are produced.
+    
+    If producing a chunk fails part-way, the partial file is removed so a
+    half-written export is never left behind.
+    """
+    try:
+        with open(output_path, 'w', encoding='utf-8', buffering=EXPORT_BUFFER_SIZE) as f:
+            for chunk in chunks:
+                f.write(chunk)
+    except BaseException:
+        try:
+            os.remove(output_path)
+        except OSError:
+            pass
+        raise
+
+
+def export_to_txt(notes: Iterable[Dict], output_path: str,
+                  log_callback: Callable = None,
+                  deck_fp: str = None) -> str:
     """
     Export notes to plain text file.
     
     Args:
-        notes: List of note dicts from extract_notes()
+        notes: Note dicts from extract_notes() or iter_notes(); slides are
+            written as they arrive
         output_path: Where to save .txt file
         log_callback: Optional function for progress logging
+        deck_fp: Optional deck_fingerprint() of the source deck
     
     Returns:
         Path to created file
@@ -375,6 +598,8 @@ def export_to_txt(notes: List[Dict], output_path: str,
         
         Slide 2: Prerequisites
         ...
+        
+        <!-- voxprep-fingerprint v2 deck=... slides=1:256:...,2:257:... -->
     """
     def _log(msg):
         if log_callback:
@@ -384,51 +609,65 @@ def export_to_txt(notes: List[Dict], output_path: str,
     
     _log(f"Creating text file: {os.path.basename(output_path)}")
     
-    lines = []
     slides_with_notes = 0
+    slide_hashes = []
     
-    for note in notes:
-        slide_num = note["slide_number"]
-        title = note["slide_title"]
-        notes_text = note["notes"]
-        
-        # Slide header
-        if title:
-            lines.append(f"Slide {slide_num}: {title}")
-        else:
-            lines.append(f"Slide {slide_num}")
+    def _slides():
+        nonlocal slides_with_notes
+        separator = ""
         
-        lines.append("─" * 50)
-        lines.append("")
-        
-        # Notes content
-        if notes_text:
-            lines.append(notes_text)
-            slides_with_notes += 1
-        else:
-            lines.append("[No notes]")
+        for note in notes:
+            slide_num = note["slide_number"]
+            title = note["slide_title"]
+            notes_text = note["notes"]
+            
+            lines = []
+            
+            # Slide header
+            if title:
+                lines.append(f"Slide {slide_num}: {title}")
+            else:
+                lines.append(f"Slide {slide_num}")
+            
+            lines.append("─" * 50)
+            lines.append("")
+            
+            # Notes content
+            if notes_text:
+                lines.append(notes_text)
+                slides_with_notes += 1
+            else:
+                lines.append("[No notes]")
+            
+            lines.append("")
+            lines.append("═" * 50)
+            lines.append("")
+            
+            yield separator + '\n'.join(lines)
+            separator = '\n'
+            slide_hashes.append((slide_num, note.get("slide_id"), notes_hash(notes_text)))
         
-        lines.append("")
-        lines.append("═" * 50)
-        lines.append("")
+        yield _fingerprint_comment(deck_fp, slide_hashes)
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines))
+    _write_streamed(output_path, _slides())
     
     _log(f"Exported {slides_with_notes} slides with notes to {os.path.basename(output_path)}")
     
     return output_path
 
 
-def export_to_md(notes: List[Dict], output_path: str,
-                 log_callback: Callable = None) -> str:
+def export_to_md(notes: Iterable[Dict], output_path: str,
+                 log_callback: Callable = None,
+                 deck_fp: str = None) -> str:
     """
     Export notes to Markdown file.
     
     Args:
-        notes: List of note dicts from extract_notes()
+        notes: Note dicts from extract_notes() or iter_notes(); slides are
+            written as they arrive
         output_path: Where to save .md file
         log_callback: Optional function for progress logging
+        deck_fp: Optional deck_fingerprint() of the source deck
     
     Returns:
         Path to created file
@@ -442,6 +681,8 @@ def export_to_md(notes: List[Dict], output_path: str,
         
         ## Slide 2: Prerequisites
         ...
+        
+        <!-- voxprep-fingerprint v2 deck=... slides=1:256:...,2:257:... -->
     """
     def _log(msg):
         if log_callback:
@@ -451,39 +692,104 @@ def export_to_md(notes: List[Dict], output_path: str,
     
     _log(f"Creating Markdown file: {os.path.basename(output_path)}")
     
-    lines = []
     slides_with_notes = 0
+    slide_hashes = []
     
-    # Document title
-    lines.append("# Speaker Notes")
-    lines.append("")
-    
-    for note in notes:
-        slide_num = note["slide_number"]
-        title = note["slide_title"]
-        notes_text = note["notes"]
+    def _slides():
+        nonlocal slides_with_notes
         
-        # Slide header (H2)
-        if title:
-            lines.append(f"## Slide {slide_num}: {title}")
-        else:
-            lines.append(f"## Slide {slide_num}")
+        # Document title
+        yield "# Speaker Notes\n"
         
-        lines.append("")
+        for note in notes:
+            slide_num = note["slide_number"]
+            title = note["slide_title"]
+            notes_text = note["notes"]
+            
+            lines = []
+            
+            # Slide header (H2)
+            if title:
+                lines.append(f"## Slide {slide_num}: {title}")
+            else:
+                lines.append(f"## Slide {slide_num}")
+            
+            lines.append("")
+            
+            # Notes content
+            if notes_text:
+                lines.append(notes_text)
+                slides_with_notes += 1
+            else:
+                lines.append("*[No notes]*")
+            
+            lines.append("")
+            lines.append("---")
+            lines.append("")
+            
+            yield '\n' + '\n'.join(lines)
+            slide_hashes.append((slide_num, note.get("slide_id"), notes_hash(notes_text)))
         
-        # Notes content
-        if notes_text:
-            lines.append(notes_text)
-            slides_with_notes += 1
+        yield _fingerprint_comment(deck_fp, slide_hashes)
+    
+    _write_streamed(output_path, _slides())
+    
+    _log(f"Exported {slides_with_notes} slides with notes to {os.path.basename(output_path)}")
+    
+    return output_path
+
+
+def export_to_jsonl(notes: Iterable[Dict], output_path: str,
+                    log_callback: Callable = None) -> str:
+    """
+    Export notes as JSON Lines: one record per slide, one slide per line.
+    
+    Meant for tools rather than people: a reader can process one record
+    at a time without loading the file. The "hash" field is notes_hash()
+    of the notes as exported, so it also serves as the export fingerprint.
+    
+    Args:
+        notes: Note dicts from extract_notes() or iter_notes(); slides are
+            written as they arrive
+        output_path: Where to save .jsonl file
+        log_callback: Optional function for progress logging
+    
+    Returns:
+        Path to created file
+    
+    Format (UTF-8, one line per slide):
+        {"slide_number": 1, "slide_id": 256, "slide_title": "Introduction",
+         "section": "Overview", "notes": "Welcome to...", "hash": "60303ae22b998861"}
+    """
+    def _log(msg):
+        if log_callback:
+            log_callback(msg)
         else:
-            lines.append("*[No notes]*")
+            log(msg)
+    
+    _log(f"Creating JSON Lines file: {os.path.basename(output_path)}")
+    
+    slides_with_notes = 0
+    
+    def _records():
+        nonlocal slides_with_notes
         
-        lines.append("")
-        lines.append("---")
-        lines.append("")
+        for note in notes:
+            notes_text = sanitize_text(note["notes"])
+            if notes_text:
+                slides_with_notes += 1
+            
+            record = {
+                "slide_number": note["slide_number"],
+                "slide_id": note.get("slide_id"),
+                "slide_title": sanitize_text(note["slide_title"]),
+                "section": note.get("section", ""),
+                "notes": notes_text,
+                "hash": notes_hash(notes_text),
+            }
+            yield json.dumps(record, ensure_ascii=False) + '\n'
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines))
+    _write_streamed(output_path, _records())
     
     _log(f"Exported {slides_with_notes} slides with notes to {os.path.basename(output_path)}")
     
@@ -503,7 +809,7 @@ def export_notes(pptx_path: str, output_path: str, format: str = "docx",
     Args:
         pptx_path: Path to PowerPoint file
         output_path: Where to save exported notes
-        format: "docx", "txt", or "md"
+        format: "docx", "txt", "md", or "jsonl"
         font_name: Font for docx export (default: Calibri)
         font_size: Font size for docx export (default: 14)
         log_callback: Optional function for progress logging
@@ -520,20 +826,326 @@ def export_notes(pptx_path: str, output_path: str, format: str = "docx",
         else:
             log(msg)
     
-    # Extract notes
-    notes = extract_notes(pptx_path, log_callback)
+    # Fingerprint first, so it describes the deck the notes came from
+    deck_fp = deck_fingerprint(pptx_path)
+    
+    # Extract notes (lazily - exporters write slides as they are read)
+    notes = iter_notes(pptx_path, log_callback)
     
     # Export based on format
     format = format.lower().strip('.')
     
     if format == "docx":
-        return export_to_docx(notes, output_path, font_name, font_size, log_callback)
+        return export_to_docx(notes, output_path, font_name, font_size, log_callback, deck_fp)
     elif format == "txt":
-        return export_to_txt(notes, output_path, log_callback)
+        return export_to_txt(notes, output_path, log_callback, deck_fp)
     elif format == "md":
-        return export_to_md(notes, output_path, log_callback)
+        return export_to_md(notes, output_path, log_callback, deck_fp)
+    elif format == "jsonl":
+        return export_to_jsonl(notes, output_path, log_callback)
     else:
-        raise ValueError(f"Unknown format: {format}. Use 'docx', 'txt', or 'md'.")
+        raise ValueError(f"Unknown format: {format}. Use 'docx', 'txt', 'md', or 'jsonl'.")
+
+
+# =============================================================================
+# TTS CHUNKS
+# =============================================================================
+
+# Whitespace after sentence-ending punctuation (optionally after a closing quote/bracket)
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?\u2026])\s+|(?<=[.!?\u2026]["\'\u201d\u2019)\]])\s+')
+
+# Chunk text files from a previous export into the same folder
+_CHUNK_FILE = re.compile(r'^slide\d+_\d+\.txt$', re.IGNORECASE)
+
+
+def _tts_units(text: str, max_chars: int) -> Iterator:
+    """
+    (separator, text) pieces to pack into chunks: whole paragraphs, or the
+    sentences of paragraphs over budget. A sentence that is itself over
+    budget is broken between words (or, failing that, hard).
+    """
+    paragraphs = [p for p in re.split(r'\s*\n\s*', text.strip()) if p]
+    
+    for index, paragraph in enumerate(paragraphs):
+        sep = "\n" if index else ""
+        
+        if len(paragraph) <= max_chars:
+            yield sep, paragraph
+            continue
+        
+        for sentence in _SENTENCE_BREAK.split(paragraph):
+            while len(sentence) > max_chars:
+                cut = sentence.rfind(" ", 0, max_chars + 1)
+                if cut <= 0:
+                    cut = max_chars
+                yield sep, sentence[:cut].rstrip()
+                sentence = sentence[cut:].lstrip()
+                sep = " "
+            if sentence:
+                yield sep, sentence
+            sep = " "
+
+
+def split_tts_chunks(text: str, max_chars: int = TTS_CHUNK_CHARS) -> List[str]:
+    """
+    Split notes text into chunks of at most max_chars characters.
+    
+    Chunks end on paragraph or sentence boundaries; only a single sentence
+    longer than the budget is split mid-sentence (between words).
+    Paragraphs sharing a chunk stay separated by a newline.
+    
+    Example:
+        split_tts_chunks("One. Two.\nThree.", max_chars=10)
+        # -> ["One. Two.", "Three."]
+    """
+    if max_chars < 1:
+        raise ValueError("max_chars must be at least 1")
+    
+    chunks = []
+    current = ""
+    
+    for sep, unit in _tts_units(text or "", max_chars):
+        if current and len(current) + len(sep) + len(unit) <= max_chars:
+            current += sep + unit
+        else:
+            if current:
+                chunks.append(current)
+            current = unit
+    
+    if current:
+        chunks.append(current)
+    
+    return chunks
+
+
+def iter_tts_chunks(notes: Iterable[Dict], max_chars: int = TTS_CHUNK_CHARS) -> Iterator[Dict]:
+    """
+    Yield TTS chunks slide by slide. Slides without notes produce none.
+    
+    Yields:
+        {
+            "chunk_id": "slide03_02",   # stable: slide position + chunk index
+            "slide_number": 3,
+            "slide_id": 258,
+            "chunk": 2,                 # 1-based within the slide
+            "text": "..."
+        }
+    """
+    for note in notes:
+        slide_num = note["slide_number"]
+        for chunk, text in enumerate(split_tts_chunks(sanitize_text(note["notes"]), max_chars), start=1):
+            yield {
+                "chunk_id": TTS_CHUNK_ID.format(slide=slide_num, chunk=chunk),
+                "slide_number": slide_num,
+                "slide_id": note.get("slide_id"),
+                "chunk": chunk,
+                "text": text,
+            }
+
+
+def export_tts_chunks(notes: Iterable[Dict], output_path: str,
+                      max_chars: int = TTS_CHUNK_CHARS,
+                      log_callback: Callable = None) -> str:
+    """
+    Export notes split into TTS-sized chunks.
+    
+    Each chunk gets an ID like slide03_02 that matches voxmedia's slideNN
+    audio naming: synthesize every chunk to <chunk_id>.wav (in any order,
+    in parallel), then voxmedia.assemble_chunk_audio() joins them into
+    slide03.wav for import_audio().
+    
+    Args:
+        notes: Note dicts from extract_notes() or iter_notes()
+        output_path: A .jsonl file (one record per chunk, see
+            iter_tts_chunks()), or a folder to get one <chunk_id>.txt per chunk
+        max_chars: Character budget per chunk
+        log_callback: Optional function for progress logging
+    
+    Returns:
+        Path to the created file or folder
+    """
+    def _log(msg):
+        if log_callback:
+            log_callback(msg)
+        else:
+            log(msg)
+    
+    chunks = iter_tts_chunks(notes, max_chars)
+    count = 0
+    
+    if output_path.lower().endswith('.jsonl'):
+        _log(f"Creating TTS chunk file: {os.path.basename(output_path)} (max {max_chars} chars)")
+        
+        def _records():
+            nonlocal count
+            for chunk in chunks:
+                count += 1
+                yield json.dumps(chunk, ensure_ascii=False) + '\n'
+        
+        _write_streamed(output_path, _records())
+    else:
+        _log(f"Writing TTS chunks to {output_path} (max {max_chars} chars)")
+        os.makedirs(output_path, exist_ok=True)
+        
+        # Stale chunks from an earlier export would be synthesized into the wrong audio
+        stale = [name for name in os.listdir(output_path) if _CHUNK_FILE.match(name)]
+        for name in stale:
+            os.remove(os.path.join(output_path, name))
+        if stale:
+            _log(f"  Removed {len(stale)} chunk file(s) from a previous export")
+        
+        for chunk in chunks:
+            with open(os.path.join(output_path, f"{chunk['chunk_id']}.txt"), 'w', encoding='utf-8') as f:
+                f.write(chunk["text"])
+            count += 1
+    
+    _log(f"Exported {count} chunk(s)")
+    
+    return output_path
+
+
+# =============================================================================
+# BATCH EXPORT
+# =============================================================================
+
+def find_decks(source: str) -> List[str]:
+    """
+    Decks to batch-export: every .pptx/.pptm under a folder (recursively),
+    or every match of a glob pattern ("**" allowed). PowerPoint lock files
+    (~$*.pptx) are ignored.
+    """
+    path = Path(source)
+    if path.is_dir():
+        candidates = path.rglob("*")
+    else:
+        candidates = (Path(match) for match in glob.glob(source, recursive=True))
+    
+    return sorted(
+        str(candidate) for candidate in candidates
+        if candidate.suffix.lower() in BATCH_DECK_EXTENSIONS
+        and not candidate.name.startswith("~$")
+        and candidate.is_file()
+    )
+
+
+def _batch_output_path(deck: str, root: str, output_dir: Optional[str], format: str) -> str:
+    """Export path for one deck: next to the deck, or mirrored under output_dir."""
+    name = f"{Path(deck).stem}_notes.{format}"
+    if output_dir is None:
+        return str(Path(deck).with_name(name))
+    return str(Path(output_dir) / Path(deck).parent.relative_to(root) / name)
+
+
+def _quiet(msg: str):
+    pass
+
+
+def _export_one(pptx_path: str, output_path: str, format: str,
+                font_name: str, font_size: int) -> Dict:
+    """Export one deck inside a batch worker process; never raises."""
+    start = time.perf_counter()
+    try:
+        if not voxooxml.is_ooxml_package(pptx_path):
+            # Would fall back to COM; batches never launch PowerPoint
+            raise ValueError("not a readable .pptx/.pptm package")
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        export_notes(pptx_path, output_path, format, font_name, font_size, log_callback=_quiet)
+        error = None
+    except Exception as e:
+        error = str(e)
+    
+    return {
+        "deck": pptx_path,
+        "output": output_path,
+        "seconds": time.perf_counter() - start,
+        "error": error,
+    }
+
+
+def export_notes_batch(source: str, output_dir: str = None, format: str = "docx",
+                       font_name: str = "Calibri", font_size: int = 14,
+                       workers: int = None, log_callback: Callable = None) -> Dict:
+    """
+    Export notes from many decks in parallel, one deck per worker process.
+    
+    Decks are read with the COM-free OOXML reader, so no PowerPoint is
+    launched and throughput scales with the number of cores. Results are
+    logged as each deck finishes; one failing deck does not stop the batch.
+    
+    Args:
+        source: Folder (searched recursively) or glob pattern of decks
+        output_dir: Folder for exports, mirroring the source folder layout
+            (default: next to each deck)
+        format: "docx", "txt", "md", or "jsonl"
+        font_name: Font for docx export (default: Calibri)
+        font_size: Font size for docx export (default: 14)
+        workers: Worker processes (default: one per CPU core)
+        log_callback: Optional function for progress logging
+    
+    Returns:
+        {
+            "exported": [{"deck": "...", "output": "...", "seconds": 0.42, "error": None}, ...],
+            "failed": [{"deck": "...", "output": "...", "seconds": 0.05, "error": "..."}, ...],
+            "seconds": 12.3     # wall-clock time for the whole batch
+        }
+    
+    Example:
+        export_notes_batch("D:/Courses", "D:/Exports", "docx", workers=8)
+    """
+    def _log(msg):
+        if log_callback:
+            log_callback(msg)
+        else:
+            log(msg)
+    
+    format = format.lower().strip('.')
+    if format not in ("docx", "txt", "md", "jsonl"):
+        raise ValueError(f"Unknown format: {format}. Use 'docx', 'txt', 'md', or 'jsonl'.")
+    
+    result = {"exported": [], "failed": [], "seconds": 0.0}
+    
+    decks = find_decks(source)
+    if not decks:
+        _log(f"No .pptx/.pptm decks found in {source}")
+        return result
+    
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(deck)) for deck in decks])
+    jobs = [
+        (os.path.abspath(deck), _batch_output_path(os.path.abspath(deck), root, output_dir, format))
+        for deck in decks
+    ]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    
+    _log(f"Exporting notes from {len(jobs)} deck(s) with {workers} worker(s)...")
+    start = time.perf_counter()
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_export_one, deck, output_path, format, font_name, font_size): (deck, output_path)
+            for deck, output_path in jobs
+        }
+        
+        for done, future in enumerate(as_completed(futures), start=1):
+            deck, output_path = futures[future]
+            try:
+                item = future.result()
+            except Exception as e:
+                # Worker process died (e.g. out of memory)
+                item = {"deck": deck, "output": output_path, "seconds": 0.0, "error": str(e) or type(e).__name__}
+            
+            name = os.path.relpath(deck, root)
+            if item["error"] is None:
+                result["exported"].append(item)
+                _log(f"  [{done}/{len(jobs)}] {name}: {item['seconds']:.2f}s")
+            else:
+                result["failed"].append(item)
+                _log(f"  [{done}/{len(jobs)}] {name}: FAILED - {item['error']}")
+    
+    result["seconds"] = time.perf_counter() - start
+    _log(f"Exported {len(result['exported'])} of {len(jobs)} deck(s) in {result['seconds']:.1f}s"
+         + (f" ({len(result['failed'])} failed)" if result["failed"] else ""))
+    
+    return result
 
 
 # =============================================================================
@@ -542,7 +1154,7 @@ def export_notes(pptx_path: str, output_path: str, format: str = "docx",
 
 def parse_notes_file(file_path: str, log_callback: Callable = None) -> List[Dict]:
     """
-    Parse an edited notes file (docx, txt, or md) back into note dicts.
+    Parse an edited notes file (docx, txt, md, or jsonl) back into note dicts.
     
     Args:
         file_path: Path to edited notes file
@@ -550,7 +1162,9 @@ def parse_notes_file(file_path: str, log_callback: Callable = None) -> List[Dict
     
     Returns:
         List of dicts matching extract_notes() format:
-        [{"slide_number": 1, "slide_title": "...", "notes": "..."}, ...]
+        [{"slide_number": 1, "slide_id": 256, "slide_title": "...", "notes": "..."}, ...]
+        "slide_number" is the position at export time; "slide_id" comes
+        from the export fingerprint and is missing if the file has none.
     
     Raises:
         ValueError: If file format not recognized or parsing fails
@@ -564,13 +1178,25 @@ def parse_notes_file(file_path: str, log_callback: Callable = None) -> List[Dict
     ext = Path(file_path).suffix.lower()
     
     if ext == '.docx':
-        return _parse_docx(file_path, log_callback)
+        notes = _parse_docx(file_path, log_callback)
     elif ext == '.txt':
-        return _parse_txt(file_path, log_callback)
+        notes = _parse_txt(file_path, log_callback)
     elif ext == '.md':
-        return _parse_md(file_path, log_callback)
+        notes = _parse_md(file_path, log_callback)
+    elif ext == '.jsonl':
+        # Records carry their own slide IDs
+        return _parse_jsonl(file_path, log_callback)
     else:
-        raise ValueError(f"Unknown file format: {ext}. Use .docx, .txt, or .md")
+        raise ValueError(f"Unknown file format: {ext}. Use .docx, .txt, .md, or .jsonl")
+    
+    fingerprint = read_notes_fingerprint(file_path)
+    if fingerprint:
+        for note in notes:
+            exported = fingerprint["slides"].get(note["slide_number"])
+            if exported and exported["slide_id"] is not None:
+                note["slide_id"] = exported["slide_id"]
+    
+    return notes
 
 
 def _parse_docx(file_path: str, log_callback: Callable = None) -> List[Dict]:
@@ -581,13 +1207,8 @@ def _parse_docx(file_path: str, log_callback: Callable = None) -> List[Dict]:
         else:
             log(msg)
     
-    if not HAS_DOCX:
-        raise RuntimeError("python-docx not installed")
-    
     _log(f"Parsing Word document: {os.path.basename(file_path)}")
     
-    doc = Document(file_path)
-    
     notes_data = []
     current_slide = None
     current_notes = []
@@ -596,8 +1217,9 @@ def _parse_docx(file_path: str, log_callback: Callable = None) -> List[Dict]:
     slide_pattern = re.compile(r'^Slide\s+(\d+)(?::\s*(.*))?$', re.IGNORECASE)
     separator_pattern = re.compile(r'^[─═]{10,}$')
     
-    for para in doc.paragraphs:
-        text = para.text.strip()
+    # Streamed straight from word/document.xml (no python-docx object tree)
+    for para_text in voxdocx.iter_paragraph_text(file_path):
+        text = para_text.strip()
         
         # Skip empty lines and separators
         if not text or separator_pattern.match(text):
@@ -668,8 +1290,8 @@ def _parse_txt(file_path: str, log_callback: Callable = None) -> List[Dict]:
     for line in content.split('\n'):
         text = line.strip()
         
-        # Skip separators
-        if separator_pattern.match(text):
+        # Skip separators and the export fingerprint
+        if separator_pattern.match(text) or FINGERPRINT_LINE.match(text):
             continue
         
         # Check for slide header
@@ -735,8 +1357,8 @@ def _parse_md(file_path: str, log_callback: Callable = None) -> List[Dict]:
     for line in content.split('\n'):
         text = line.strip()
         
-        # Skip document title and horizontal rules
-        if text.startswith('# ') or text == '---':
+        # Skip document title, horizontal rules and the export fingerprint
+        if text.startswith('# ') or text == '---' or FINGERPRINT_LINE.match(text):
             continue
         
         # Check for slide header
@@ -779,11 +1401,149 @@ def _parse_md(file_path: str, log_callback: Callable = None) -> List[Dict]:
     return notes_data
 
 
+def iter_jsonl_notes(file_path: str) -> Iterator[Dict]:
+    """
+    Yield the records of a .jsonl notes export one line at a time.
+    
+    Records are returned as written (see export_to_jsonl()); blank lines
+    are skipped.
+    
+    Raises:
+        ValueError: On a line that is not a JSON object with an integer
+            slide_number and string notes
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line_num, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Line {line_num}: invalid JSON ({e.msg})")
+            if (not isinstance(record, dict)
+                    or not isinstance(record.get("slide_number"), int)
+                    or not isinstance(record.get("notes"), str)):
+                raise ValueError(f"Line {line_num}: not a notes record")
+            yield record
+
+
+def _parse_jsonl(file_path: str, log_callback: Callable = None) -> List[Dict]:
+    """Parse notes from an edited JSON Lines export."""
+    def _log(msg):
+        if log_callback:
+            log_callback(msg)
+        else:
+            log(msg)
+    
+    _log(f"Parsing JSON Lines file: {os.path.basename(file_path)}")
+    
+    notes_data = []
+    for record in iter_jsonl_notes(file_path):
+        note = {
+            "slide_number": record["slide_number"],
+            "slide_title": record.get("slide_title") or "",
+            "section": record.get("section") or "",
+            "notes": record["notes"].strip()
+        }
+        if isinstance(record.get("slide_id"), int):
+            note["slide_id"] = record["slide_id"]
+        notes_data.append(note)
+    
+    _log(f"Parsed {len(notes_data)} slides from JSON Lines file")
+    
+    return notes_data
+
+
+def normalize_notes(text: str) -> str:
+    """
+    Canonical form of notes text for change detection.
+    
+    Strips each line, collapses runs of spaces/tabs and drops blank lines,
+    so whitespace that the export formats don't preserve (docx drops empty
+    paragraphs, every parser strips lines) never shows up as an edit.
+    """
+    lines = (" ".join(line.split()) for line in (text or "").splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def notes_hash(text: str) -> str:
+    """Short stable hash of normalized notes text (see normalize_notes)."""
+    return hashlib.sha1(normalize_notes(text).encode("utf-8")).hexdigest()[:16]
+
+
+def _note_hash(note: Dict) -> str:
+    # Exports and sessions may carry the hash already
+    return note.get("notes_hash") or notes_hash(note["notes"])
+
+
+def word_diff(original: str, edited: str) -> List[Dict]:
+    """
+    Word-level differences between two notes strings.
+    
+    Returns:
+        One entry per changed run of words, in order:
+        [
+            {
+                "op": "replace",             # "replace", "delete" or "insert"
+                "original": "quick brown",   # words removed ("" for insert)
+                "edited": "slow red",        # words added ("" for delete)
+                "original_start": 4, "original_end": 15,   # char offsets in original
+                "edited_start": 4, "edited_end": 12        # char offsets in edited
+            },
+            ...
+        ]
+        Inserts have original_start == original_end at the insertion
+        point; deletes likewise in edited.
+    """
+    orig_tokens = [(m.group(), m.start(), m.end()) for m in re.finditer(r"\S+", original)]
+    edit_tokens = [(m.group(), m.start(), m.end()) for m in re.finditer(r"\S+", edited)]
+    
+    def _span(tokens, start, end):
+        if start < end:
+            return tokens[start][1], tokens[end - 1][2]
+        # Empty range: insertion point just after the previous word
+        offset = tokens[start - 1][2] if start > 0 else 0
+        return offset, offset
+    
+    matcher = difflib.SequenceMatcher(
+        None, [t[0] for t in orig_tokens], [t[0] for t in edit_tokens], autojunk=False
+    )
+    
+    ops = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        orig_start, orig_end = _span(orig_tokens, i1, i2)
+        edit_start, edit_end = _span(edit_tokens, j1, j2)
+        ops.append({
+            "op": tag,
+            "original": original[orig_start:orig_end],
+            "edited": edited[edit_start:edit_end],
+            "original_start": orig_start,
+            "original_end": orig_end,
+            "edited_start": edit_start,
+            "edited_end": edit_end,
+        })
+    
+    return ops
+
+
 def compare_notes(original: List[Dict], edited: List[Dict],
                   log_callback: Callable = None) -> List[Dict]:
     """
     Compare original notes with edited version to find changes.
     
+    Slides are compared by the hash of their normalized notes, so
+    unchanged slides cost one dict lookup; only changed slides get a
+    word-level diff, computed once here and carried in the change for
+    preview and apply to share.
+    
+    Edited notes that carry a slide_id (from the export fingerprint) are
+    matched to the deck by ID, so edits land on the right slide even if
+    slides were inserted or reordered since export; the change then holds
+    the slide's current position. Notes without an ID fall back to
+    matching by position.
+    
     Args:
         original: Notes from extract_notes()
         edited: Notes from parse_notes_file()
@@ -793,11 +1553,18 @@ def compare_notes(original: List[Dict], edited: List[Dict],
         List of changes:
         [
             {
-                "slide_number": 3,
+                "slide_number": 3,          # current position in the deck
+                "slide_id": 258,            # or None if unknown
                 "slide_title": "...",
                 "original_notes": "old text...",
                 "edited_notes": "new text...",
-                "change_type": "modified"  # "modified", "added", "removed"
+                "change_type": "modified",  # "modified", "added", "removed"
+                "original_hash": "9f86d081884c7d65",
+                "edited_hash": "60303ae22b998861",
+                "diff": [...],              # word_diff(original_notes, edited_notes)
+                "words_added": 5,
+                "words_removed": 2,
+                "word_delta": 3             # word count after minus before
             },
             ...
         ]
@@ -808,58 +1575,98 @@ def compare_notes(original: List[Dict], edited: List[Dict],
         else:
             log(msg)
     
-    # Build lookup by slide number
+    # Build lookups by slide ID and by slide number
+    original_by_id = {n["slide_id"]: n for n in original if n.get("slide_id") is not None}
     original_by_slide = {n["slide_number"]: n for n in original}
     edited_by_slide = {n["slide_number"]: n for n in edited}
     
     changes = []
+    moved = 0
     
     # Check all slides in edited version
     for slide_num, edited_note in edited_by_slide.items():
-        original_note = original_by_slide.get(slide_num)
+        slide_id = edited_note.get("slide_id")
+        edit_hash = _note_hash(edited_note)
+        
+        if slide_id is not None and original_by_id:
+            original_note = original_by_id.get(slide_id)
+            if original_note is None:
+                if edited_note["notes"]:
+                    _log(f"  Slide {slide_num} (ID {slide_id}) is no longer in the deck - skipped")
+                continue
+            if original_note["slide_number"] != slide_num:
+                moved += 1
+        else:
+            original_note = original_by_slide.get(slide_num)
         
         if original_note is None:
             # New slide (shouldn't happen normally, but handle it)
             if edited_note["notes"]:
-                changes.append({
-                    "slide_number": slide_num,
-                    "slide_title": edited_note["slide_title"],
-                    "original_notes": "",
-                    "edited_notes": edited_note["notes"],
-                    "change_type": "added"
-                })
+                changes.append(_make_change(
+                    slide_num, None, edited_note["slide_title"], "", edited_note["notes"],
+                    "added", notes_hash(""), edit_hash
+                ))
+            continue
+        
+        orig_hash = _note_hash(original_note)
+        if orig_hash == edit_hash:
+            continue
+        
+        orig_text = original_note["notes"].strip()
+        edit_text = edited_note["notes"].strip()
+        
+        if not orig_text and edit_text:
+            change_type = "added"
+        elif orig_text and not edit_text:
+            change_type = "removed"
         else:
-            # Compare notes
-            orig_text = original_note["notes"].strip()
-            edit_text = edited_note["notes"].strip()
-            
-            if orig_text != edit_text:
-                if not orig_text and edit_text:
-                    change_type = "added"
-                elif orig_text and not edit_text:
-                    change_type = "removed"
-                else:
-                    change_type = "modified"
-                
-                changes.append({
-                    "slide_number": slide_num,
-                    "slide_title": original_note["slide_title"],
-                    "original_notes": orig_text,
-                    "edited_notes": edit_text,
-                    "change_type": change_type
-                })
-    
+            change_type = "modified"
+        
+        changes.append(_make_change(
+            original_note["slide_number"], original_note.get("slide_id"),
+            original_note["slide_title"], orig_text, edit_text,
+            change_type, orig_hash, edit_hash
+        ))
+    
+    if moved:
+        _log(f"Matched {moved} moved slide(s) by slide ID")
     _log(f"Found {len(changes)} changed slide(s)")
     
     return changes
 
 
+def _make_change(slide_num: int, slide_id: Optional[int], title: str,
+                 orig_text: str, edit_text: str,
+                 change_type: str, orig_hash: str, edit_hash: str) -> Dict:
+    diff = word_diff(orig_text, edit_text)
+    words_added = sum(len(op["edited"].split()) for op in diff)
+    words_removed = sum(len(op["original"].split()) for op in diff)
+    return {
+        "slide_number": slide_num,
+        "slide_id": slide_id,
+        "slide_title": title,
+        "original_notes": orig_text,
+        "edited_notes": edit_text,
+        "change_type": change_type,
+        "original_hash": orig_hash,
+        "edited_hash": edit_hash,
+        "diff": diff,
+        "words_added": words_added,
+        "words_removed": words_removed,
+        "word_delta": words_added - words_removed,
+    }
+
+
 def apply_notes(pptx_path: str, changes: List[Dict], 
                 slides_to_apply: List[int] = None,
                 log_callback: Callable = None) -> Dict:
     """
     Apply note changes back to PowerPoint file.
     
+    .pptx/.pptm decks are patched directly: only the changed notesSlide
+    parts are rewritten, every other zip entry is copied through as-is.
+    Legacy formats go through PowerPoint (COM).
+    
     Args:
         pptx_path: Path to PowerPoint file
         changes: List of changes from compare_notes()
@@ -880,11 +1687,6 @@ def apply_notes(pptx_path: str, changes: List[Dict],
         else:
             log(msg)
     
-    if not HAS_COM:
-        raise RuntimeError("Windows COM API not available")
-    
-    pptx_path = get_short_path(str(Path(pptx_path).resolve()))
-    
     # Filter changes if specific slides requested
     if slides_to_apply is not None:
         changes = [c for c in changes if c["slide_number"] in slides_to_apply]
@@ -893,6 +1695,17 @@ def apply_notes(pptx_path: str, changes: List[Dict],
         _log("No changes to apply")
         return {"applied": [], "skipped": [], "errors": []}
     
+    if voxooxml.is_ooxml_package(pptx_path):
+        try:
+            return _apply_notes_ooxml(pptx_path, changes, _log)
+        except Exception as e:
+            raise RuntimeError(f"Failed to apply notes: {e}")
+    
+    if not HAS_COM:
+        raise RuntimeError("Windows COM API not available")
+    
+    pptx_path = get_short_path(str(Path(pptx_path).resolve()))
+    
     _log(f"Applying changes to {len(changes)} slide(s)...")
     
     result = {"applied": [], "skipped": [], "errors": []}
@@ -956,6 +1769,188 @@ def apply_notes(pptx_path: str, changes: List[Dict],
                 pass
 
 
+def _apply_notes_ooxml(pptx_path: str, changes: List[Dict], _log: Callable) -> Dict:
+    """apply_notes() for .pptx/.pptm: splice new notes into the notesSlide XML."""
+    _log(f"Applying changes to {len(changes)} slide(s)...")
+    
+    result = {"applied": [], "skipped": [], "errors": []}
+    updates = {}
+    
+    with voxooxml.DeckPackage(pptx_path) as pkg:
+        # Notes pages created in this batch, by slide part
+        created = {}
+        
+        for change in changes:
+            slide_num = change["slide_number"]
+            new_notes = sanitize_text(change["edited_notes"] or "")
+            
+            try:
+                if change.get("slide_id") is not None:
+                    entry = pkg.slide_index.by_slide_id(change["slide_id"])
+                else:
+                    entry = pkg.slide_index.at(slide_num)
+                if entry is None:
+                    raise ValueError("slide not found in deck")
+                
+                notes_part = entry["notes_part"] or created.get(entry["slide_part"])
+                if notes_part:
+                    notes_xml = updates[notes_part] if notes_part in updates else pkg.read_part(notes_part)
+                    updates[notes_part] = voxooxml.replace_notes_text(notes_xml, new_notes)
+                    _log(f"  Slide {slide_num}: Updated")
+                else:
+                    created[entry["slide_part"]] = voxooxml.add_notes_slide(
+                        pkg, entry["slide_part"], new_notes, updates
+                    )
+                    _log(f"  Slide {slide_num}: Updated (new notes page)")
+                
+                result["applied"].append(slide_num)
+                
+            except Exception as e:
+                result["errors"].append(f"Slide {slide_num}: {e}")
+                _log(f"  Slide {slide_num}: Error - {e}")
+    
+    if updates:
+        voxooxml.write_package(pptx_path, pptx_path, updates)
+    
+    _log(f"Applied changes to {len(result['applied'])} slide(s)")
+    
+    return result
+
+
+def _file_stamp(path: str):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+class ImportSession:
+    """
+    One import of an edited notes file into a deck.
+    
+    The deck's notes are extracted and the notes file parsed once, when the
+    session is created. Preview and apply then both work from that
+    baseline, so a Preview followed by Apply reads the deck once and
+    writes it at most once.
+    
+    If the notes file carries an export fingerprint, only the slides the
+    editor touched are read from the deck at all.
+    
+    Example:
+        session = ImportSession("Training.pptx", "Training_notes.docx")
+        print(f"Found {len(session.changes)} changes")
+        result = session.apply()
+    """
+    
+    def __init__(self, pptx_path: str, notes_file: str, log_callback: Callable = None):
+        self.pptx_path = str(Path(pptx_path).resolve())
+        self.notes_file = str(Path(notes_file).resolve())
+        self.log_callback = log_callback
+        
+        self._stamps = (_file_stamp(self.pptx_path), _file_stamp(self.notes_file))
+        
+        self.edited = parse_notes_file(self.notes_file, log_callback)
+        self.fingerprint = read_notes_fingerprint(self.notes_file)
+        
+        # Slides changed in the deck after export as well as in the notes file
+        self.conflicts = []
+        
+        if self.fingerprint is None:
+            # Older export or hand-made file: compare against the whole deck
+            self.original = extract_notes(self.pptx_path, log_callback)
+            self.changes = compare_notes(self.original, self.edited, log_callback)
+        else:
+            self._compare_touched()
+        
+        # Apply result, once the deck has been written
+        self.result = None
+    
+    def _log(self, msg):
+        if self.log_callback:
+            self.log_callback(msg)
+        else:
+            log(msg)
+    
+    def _compare_touched(self):
+        """
+        Compare only the slides whose notes differ from the export fingerprint.
+        
+        Untouched slides are never read from the deck; self.original holds
+        just the touched slides.
+        """
+        exported = self.fingerprint["slides"]
+        touched = [
+            note for note in self.edited
+            if _note_hash(note) != exported.get(note["slide_number"], {}).get("hash")
+        ]
+        self._log(f"Notes file fingerprint: {len(touched)} of {len(self.edited)} slide(s) edited since export")
+        
+        if touched:
+            self.original = read_slide_notes(
+                self.pptx_path,
+                slide_numbers=[note["slide_number"] for note in touched if note.get("slide_id") is None],
+                slide_ids=[note["slide_id"] for note in touched if note.get("slide_id") is not None],
+                log_callback=self.log_callback
+            )
+        else:
+            self.original = []
+        self.changes = compare_notes(self.original, touched, self.log_callback)
+        
+        if self.fingerprint["deck"] != deck_fingerprint(self.pptx_path):
+            exported_by_id = {
+                slide["slide_id"]: slide["hash"]
+                for slide in exported.values() if slide["slide_id"] is not None
+            }
+            for change in self.changes:
+                if change["slide_id"] in exported_by_id:
+                    exported_hash = exported_by_id[change["slide_id"]]
+                else:
+                    exported_hash = exported.get(change["slide_number"], {}).get("hash")
+                if exported_hash is not None and change["original_hash"] != exported_hash:
+                    self.conflicts.append(change["slide_number"])
+            for change in self.changes:
+                change["conflict"] = change["slide_number"] in self.conflicts
+            if self.conflicts:
+                self._log(f"Warning: slide(s) {', '.join(map(str, self.conflicts))} were also edited "
+                          f"in the deck since export; applying will replace those edits")
+    
+    def matches(self, pptx_path: str, notes_file: str) -> bool:
+        """True if this session is for these files and neither has changed on disk since."""
+        try:
+            return (str(Path(pptx_path).resolve()) == self.pptx_path
+                    and str(Path(notes_file).resolve()) == self.notes_file
+                    and (_file_stamp(self.pptx_path), _file_stamp(self.notes_file)) == self._stamps)
+        except OSError:
+            return False
+    
+    def preview(self) -> Dict:
+        """{"changes": [...], "preview": True}"""
+        return {"changes": self.changes, "preview": True}
+    
+    def apply(self, slides_to_apply: List[int] = None) -> Dict:
+        """
+        Write the changes into the deck (once per session).
+        
+        Args:
+            slides_to_apply: Optional list of slide numbers to apply (default: all)
+        
+        Returns:
+            {"applied": [...], "skipped": [...], "errors": [...]}
+        
+        Raises:
+            RuntimeError: If the session was already applied, or the deck or
+                notes file changed on disk after the session was created
+        """
+        if self.result is not None:
+            raise RuntimeError("These changes were already applied; start a new import")
+        if not self.matches(self.pptx_path, self.notes_file):
+            raise RuntimeError("Deck or notes file changed since the preview; preview again")
+        
+        if not self.changes:
+            self.result = {"applied": [], "skipped": [], "errors": []}
+        else:
+            self.result = apply_notes(self.pptx_path, self.changes, slides_to_apply, self.log_callback)
+        return self.result
+
+
 def import_notes(pptx_path: str, notes_file: str, preview_only: bool = False,
                  slides_to_apply: List[int] = None,
                  log_callback: Callable = None) -> Dict:
@@ -983,30 +1978,16 @@ def import_notes(pptx_path: str, notes_file: str, preview_only: bool = False,
         # Apply all changes
         result = import_notes("Training.pptx", "Training_notes.docx")
         print(f"Applied to {len(result['applied'])} slides")
-    """
-    def _log(msg):
-        if log_callback:
-            log_callback(msg)
-        else:
-            log(msg)
-    
-    # Extract original notes
-    original = extract_notes(pptx_path, log_callback)
     
-    # Parse edited file
-    edited = parse_notes_file(notes_file, log_callback)
-    
-    # Compare
-    changes = compare_notes(original, edited, log_callback)
+    Use ImportSession directly to preview and then apply without
+    extracting the deck twice.
+    """
+    session = ImportSession(pptx_path, notes_file, log_callback)
     
     if preview_only:
-        return {"changes": changes, "preview": True}
+        return session.preview()
     
-    # Apply changes
-    if not changes:
-        return {"applied": [], "skipped": [], "errors": []}
-    
-    return apply_notes(pptx_path, changes, slides_to_apply, log_callback)
+    return session.apply(slides_to_apply)
 
 
 # =============================================================================
@@ -1020,8 +2001,12 @@ def _usage():
     print("  export <deck.pptx> <output_file>     Export notes to file")
     print("  import <deck.pptx> <notes_file>      Import notes from file")
     print("  preview <deck.pptx> <notes_file>     Preview changes without applying")
+    print("  chunks <deck.pptx> <folder|file.jsonl> [max_chars]")
+    print("                                       Export notes as TTS-sized chunks")
+    print("  batch <folder|glob> <format> [output_dir] [--workers N]")
+    print("                                       Export notes from many decks in parallel")
     print()
-    print("Output formats: .docx, .txt, .md (determined by extension)")
+    print("Output formats: .docx, .txt, .md, .jsonl (determined by extension)")
 
 
 if __name__ == "__main__":
@@ -1074,7 +2059,33 @@ if __name__ == "__main__":
             else:
                 print(f"\nFound {len(result['changes'])} change(s):")
                 for change in result['changes']:
-                    print(f"  Slide {change['slide_number']}: {change['change_type']}")
+                    print(f"  Slide {change['slide_number']}: {change['change_type']} "
+                          f"(+{change['words_added']} / -{change['words_removed']} words)")
+        
+        elif command == "chunks":
+            if len(sys.argv) < 4:
+                print("Usage: python voxnotes.py chunks <deck.pptx> <folder|file.jsonl> [max_chars]")
+                sys.exit(64)
+            
+            max_chars = int(sys.argv[4]) if len(sys.argv) > 4 else TTS_CHUNK_CHARS
+            result = export_tts_chunks(iter_notes(sys.argv[2]), sys.argv[3], max_chars)
+            print(f"\nCreated: {result}")
+        
+        elif command == "batch":
+            args = sys.argv[2:]
+            workers = None
+            if "--workers" in args:
+                i = args.index("--workers")
+                workers = int(args[i + 1])
+                del args[i:i + 2]
+            
+            if len(args) < 2:
+                print("Usage: python voxnotes.py batch <folder|glob> <format> [output_dir] [--workers N]")
+                sys.exit(64)
+            
+            result = export_notes_batch(args[0], args[2] if len(args) > 2 else None, args[1], workers=workers)
+            if result['failed']:
+                sys.exit(1)
                     
         else:
             print(f"Unknown command: {command}")
@@ -0,0 +1,1195 @@
+"""
+voxooxml.py
+Direct OOXML package reader for VoxPrep.
+
+Reads a .pptx straight out of its zip container - no PowerPoint process,
+no COM. Slide, notesSlide, relationship and presentation.xml parts are
+only read and parsed the first time something asks for them, then kept
+for the life of the package object.
+
+Slide order comes from p:sldIdLst in presentation.xml (the order the deck
+plays in), never from slideN.xml file names, which go stale as soon as a
+deck is reordered.
+
+Changes are written with write_package(), which streams every untouched
+zip entry to the output byte-for-byte (compressed data and CRC as-is) and
+only deflates the parts that were actually modified.
+
+Example:
+    with DeckPackage("Training.pptx") as pkg:
+        for entry in pkg.slide_index:
+            slide = pkg.get_xml(entry["slide_part"])
+            print(entry["slide_number"], get_slide_title(slide))
+
+    write_package("Training.pptx", "Training.pptx",
+                  {"ppt/notesSlides/notesSlide3.xml": new_xml_bytes})
+"""
+
+import os
+import posixpath
+import re
+import shutil
+import struct
+import tempfile
+import time
+import zipfile
+import zlib
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+from xml.etree import ElementTree as ET
+from xml.parsers import expat
+from xml.sax.saxutils import escape
+
+LOG_PREFIX = "[voxooxml]"
+
+# OOXML namespaces used by the readers
+NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "p14": "http://schemas.microsoft.com/office/powerpoint/2010/main",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+    "ct": "http://schemas.openxmlformats.org/package/2006/content-types",
+}
+
+# Relationship type suffixes (the prefix differs between strict/transitional)
+REL_OFFICE_DOCUMENT = "/officeDocument"
+REL_SLIDE = "/slide"
+REL_NOTES_SLIDE = "/notesSlide"
+REL_THEME = "/theme"
+REL_SLIDE_MASTER = "/slideMaster"
+REL_NOTES_MASTER = "/notesMaster"
+
+# Used when a deck gives no better hint (see _rel_type_base)
+TRANSITIONAL_REL_BASE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+NOTES_SLIDE_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.notesSlide+xml"
+
+CONTENT_TYPES_PART = "[Content_Types].xml"
+DEFAULT_PRESENTATION_PART = "ppt/presentation.xml"
+
+_A = "{%s}" % NS["a"]
+_P = "{%s}" % NS["p"]
+_R = "{%s}" % NS["r"]
+
+# Shape text (p:txBody) and table cell text (a:txBody)
+_TEXT_BODY_TAGS = {_P + "txBody", _A + "txBody"}
+# Elements a run-level text edit needs to locate
+_TEXT_RUN_TAGS = _TEXT_BODY_TAGS | {_A + "p", _A + "r", _A + "fld", _A + "br", _A + "t"}
+
+
+def log(msg: str):
+    """Simple logging helper."""
+    print(f"{LOG_PREFIX} {msg}", flush=True)
+
+
+def is_ooxml_package(path: str) -> bool:
+    """Return True if path is a zip-based OOXML package (.pptx/.pptm/.potx)."""
+    try:
+        if not zipfile.is_zipfile(path):
+            return False
+        with zipfile.ZipFile(path, "r") as zf:
+            zf.getinfo(CONTENT_TYPES_PART)
+        return True
+    except Exception:
+        return False
+
+
+def rels_part_name(part_name: str) -> str:
+    """Return the relationships part for a part, e.g. ppt/slides/_rels/slide1.xml.rels."""
+    folder, filename = posixpath.split(part_name)
+    return posixpath.join(folder, "_rels", filename + ".rels")
+
+
+def resolve_target(source_part: str, target: str) -> str:
+    """Resolve a relationship Target relative to the part that owns it."""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    folder = posixpath.dirname(source_part)
+    return posixpath.normpath(posixpath.join(folder, target))
+
+
+# =============================================================================
+# SLIDE INDEX
+# =============================================================================
+
+class SlideIndex:
+    """
+    Presentation-order slide index for one package.
+
+    Resolves p:sldIdLst -> r:id -> slide part -> notesSlide part -> rels
+    once, into an ordered list of entry dicts:
+
+        {
+            "slide_number": 1,          # 1-based play position
+            "slide_id": 256,            # p:sldId/@id, stable across reorders
+            "r_id": "rId7",
+            "slide_part": "ppt/slides/slide3.xml",
+            "slide_rels_part": "ppt/slides/_rels/slide3.xml.rels",
+            "notes_part": "ppt/notesSlides/notesSlide3.xml",   # or None
+            "notes_rels_part": "ppt/notesSlides/_rels/notesSlide3.xml.rels",  # or None
+        }
+
+    Lookups by position, slide ID and part name (slide, notes or rels
+    part) are all dict/list lookups.
+    """
+
+    def __init__(self, pkg: "DeckPackage"):
+        self.entries = []
+        self._by_id = {}
+        self._by_part = {}
+
+        pres_part = pkg.presentation_part
+        pres = pkg.get_xml(pres_part)
+        rels = pkg.get_rels(pres_part)
+
+        for sld_id in pres.iterfind("p:sldIdLst/p:sldId", NS):
+            rel = rels.get(sld_id.get(_R + "id", ""))
+            if not rel or not rel["part"] or not pkg.has_part(rel["part"]):
+                continue
+
+            slide_part = rel["part"]
+            notes_part = pkg.related_part(slide_part, REL_NOTES_SLIDE)
+            if notes_part and not pkg.has_part(notes_part):
+                notes_part = None
+
+            slide_rels = rels_part_name(slide_part)
+            notes_rels = rels_part_name(notes_part) if notes_part else None
+
+            entry = {
+                "slide_number": len(self.entries) + 1,
+                "slide_id": int(sld_id.get("id", "0")),
+                "r_id": sld_id.get(_R + "id", ""),
+                "slide_part": slide_part,
+                "slide_rels_part": slide_rels if pkg.has_part(slide_rels) else None,
+                "notes_part": notes_part,
+                "notes_rels_part": notes_rels if notes_rels and pkg.has_part(notes_rels) else None,
+            }
+            self.entries.append(entry)
+            self._by_id[entry["slide_id"]] = entry
+            for name in (slide_part, entry["slide_rels_part"], notes_part, entry["notes_rels_part"]):
+                if name:
+                    self._by_part[name] = entry
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def at(self, slide_number: int) -> Optional[Dict]:
+        """Entry for a 1-based slide position, or None if out of range."""
+        if 1 <= slide_number <= len(self.entries):
+            return self.entries[slide_number - 1]
+        return None
+
+    def by_slide_id(self, slide_id: int) -> Optional[Dict]:
+        """Entry for a p:sldId id, or None."""
+        return self._by_id.get(int(slide_id))
+
+    def by_part_name(self, part_name: str) -> Optional[Dict]:
+        """Entry owning a slide, notesSlide or rels part, or None."""
+        return self._by_part.get(part_name)
+
+
+# =============================================================================
+# PACKAGE
+# =============================================================================
+
+class DeckPackage:
+    """
+    Read-only view of a .pptx package.
+
+    Nothing is read from the zip until it is asked for. Raw part bytes are
+    not kept; parsed XML trees and relationship maps are cached per part so
+    repeated lookups cost nothing.
+    """
+
+    def __init__(self, pptx_path: str):
+        self.path = str(Path(pptx_path).resolve())
+
+        if not os.path.isfile(self.path):
+            raise FileNotFoundError(f"PowerPoint file not found: {self.path}")
+
+        try:
+            self._zip = zipfile.ZipFile(self.path, "r")
+        except zipfile.BadZipFile as e:
+            raise ValueError(f"Not a valid .pptx package: {e}")
+
+        self._xml = {}
+        self._rels = {}
+        self._presentation_part = None
+        self._slide_index = None
+
+    # --- lifecycle ---
+
+    def close(self):
+        """Close the underlying zip file."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # --- raw parts ---
+
+    def has_part(self, part_name: str) -> bool:
+        """Return True if the package contains the part."""
+        try:
+            self._zip.getinfo(part_name)
+            return True
+        except KeyError:
+            return False
+
+    def part_names(self) -> List[str]:
+        """All part names in the package, in zip order."""
+        return self._zip.namelist()
+
+    def part_stamp(self, part_name: Optional[str]) -> Optional[str]:
+        """
+        Change stamp of a part, "crc32:size", from the zip central directory.
+
+        Nothing is decompressed, so stamping every part of a large deck is
+        cheap. Returns None if the part does not exist.
+        """
+        if not part_name:
+            return None
+        try:
+            info = self._zip.getinfo(part_name)
+        except KeyError:
+            return None
+        return f"{info.CRC:08x}:{info.file_size}"
+
+    def read_part(self, part_name: str) -> bytes:
+        """Read the raw (uncompressed) bytes of a part."""
+        return self._zip.read(part_name)
+
+    def get_xml(self, part_name: str, cache: bool = True) -> ET.Element:
+        """
+        Parse an XML part, caching the tree for later calls.
+
+        Pass cache=False for parts read once in a pass over every slide, so
+        memory stays flat on large decks.
+        """
+        root = self._xml.get(part_name)
+        if root is None:
+            root = ET.fromstring(self.read_part(part_name))
+            if cache:
+                self._xml[part_name] = root
+        return root
+
+    # --- relationships ---
+
+    def get_rels(self, part_name: str) -> Dict[str, Dict]:
+        """
+        Relationships owned by a part, keyed by r:id.
+
+        Returns:
+            {"rId2": {"type": "...", "target": "../notesSlides/notesSlide1.xml",
+                      "part": "ppt/notesSlides/notesSlide1.xml", "external": False}}
+        """
+        rels = self._rels.get(part_name)
+        if rels is not None:
+            return rels
+
+        rels = {}
+        rels_name = rels_part_name(part_name)
+        if self.has_part(rels_name):
+            root = ET.fromstring(self.read_part(rels_name))
+            for rel in root.findall("rel:Relationship", NS):
+                target = rel.get("Target", "")
+                external = rel.get("TargetMode", "") == "External"
+                rels[rel.get("Id", "")] = {
+                    "type": rel.get("Type", ""),
+                    "target": target,
+                    "part": None if external else resolve_target(part_name, target),
+                    "external": external,
+                }
+
+        self._rels[part_name] = rels
+        return rels
+
+    def related_part(self, part_name: str, rel_type: str) -> Optional[str]:
+        """First internal part related to part_name with the given type suffix."""
+        for rel in self.get_rels(part_name).values():
+            if not rel["external"] and rel["type"].endswith(rel_type):
+                return rel["part"]
+        return None
+
+    # --- presentation ---
+
+    @property
+    def presentation_part(self) -> str:
+        """Name of the main presentation part (normally ppt/presentation.xml)."""
+        if self._presentation_part is None:
+            part = self.related_part("", REL_OFFICE_DOCUMENT)
+            self._presentation_part = part or DEFAULT_PRESENTATION_PART
+        return self._presentation_part
+
+    @property
+    def slide_index(self) -> SlideIndex:
+        """Presentation-order slide index, built once per package."""
+        if self._slide_index is None:
+            self._slide_index = SlideIndex(self)
+        return self._slide_index
+
+    def slide_part_names(self) -> List[str]:
+        """Slide part names in presentation (play) order."""
+        return [entry["slide_part"] for entry in self.slide_index]
+
+    @property
+    def slide_count(self) -> int:
+        return len(self.slide_index)
+
+    def notes_part_name(self, slide_part: str) -> Optional[str]:
+        """The notesSlide part for a slide, or None if the slide has no notes page."""
+        entry = self.slide_index.by_part_name(slide_part)
+        return entry["notes_part"] if entry else None
+
+    def get_sections(self) -> List[Tuple[str, int, int]]:
+        """
+        Sections from the p14:sectionLst extension in presentation.xml.
+
+        Returns:
+            List of (section_name, first_slide, slide_count) with 1-based
+            slide positions. A deck without sections returns one unnamed
+            section covering every slide.
+        """
+        index = self.slide_index
+        pres = self.get_xml(self.presentation_part)
+
+        section_list = pres.find(".//p14:sectionLst", NS)
+        if section_list is None:
+            return [("", 1, len(index))]
+
+        sections = []
+        next_slide = 1
+        for section in section_list.findall("p14:section", NS):
+            positions = []
+            for s in section.iterfind("p14:sldIdLst/p14:sldId", NS):
+                entry = index.by_slide_id(s.get("id", "0"))
+                if entry:
+                    positions.append(entry["slide_number"])
+            first_slide = min(positions) if positions else next_slide
+            sections.append((section.get("name", ""), first_slide, len(positions)))
+            next_slide = first_slide + len(positions)
+
+        return sections
+
+    def theme_fonts(self) -> Dict[str, str]:
+        """
+        Theme major/minor latin fonts, used to resolve +mj-lt/+mn-lt references.
+
+        Returns:
+            {"major": "Calibri Light", "minor": "Calibri"} (missing keys if unset)
+        """
+        fonts = {}
+        master = self.related_part(self.presentation_part, REL_SLIDE_MASTER)
+        theme = self.related_part(master, REL_THEME) if master else None
+        if not theme:
+            theme = self.related_part(self.presentation_part, REL_THEME)
+        if not theme or not self.has_part(theme):
+            return fonts
+
+        scheme = self.get_xml(theme).find(".//a:fontScheme", NS)
+        if scheme is None:
+            return fonts
+        for key, tag in (("major", "a:majorFont/a:latin"), ("minor", "a:minorFont/a:latin")):
+            latin = scheme.find(tag, NS)
+            if latin is not None and latin.get("typeface"):
+                fonts[key] = latin.get("typeface")
+        return fonts
+
+    def design_parts(self) -> List[Tuple[str, str]]:
+        """
+        Slide masters and their layouts, in presentation order.
+
+        Returns:
+            [("master", "ppt/slideMasters/slideMaster1.xml"),
+             ("layout", "ppt/slideLayouts/slideLayout1.xml"), ...] - each
+            master followed by its layouts
+        """
+        parts = []
+        pres_rels = self.get_rels(self.presentation_part)
+        pres = self.get_xml(self.presentation_part)
+        for master_id in pres.iterfind("p:sldMasterIdLst/p:sldMasterId", NS):
+            rel = pres_rels.get(master_id.get(_R + "id", ""))
+            if not rel or not rel["part"] or not self.has_part(rel["part"]):
+                continue
+            master = rel["part"]
+            parts.append(("master", master))
+
+            master_rels = self.get_rels(master)
+            for layout_id in self.get_xml(master).iterfind("p:sldLayoutIdLst/p:sldLayoutId", NS):
+                layout_rel = master_rels.get(layout_id.get(_R + "id", ""))
+                if layout_rel and layout_rel["part"] and self.has_part(layout_rel["part"]):
+                    parts.append(("layout", layout_rel["part"]))
+        return parts
+
+
+# =============================================================================
+# SHAPE / TEXT HELPERS
+# =============================================================================
+
+def iter_shapes(container: ET.Element):
+    """Yield every shape under a spTree, descending into p:grpSp groups."""
+    for child in container:
+        yield child
+        if child.tag == _P + "grpSp":
+            yield from iter_shapes(child)
+
+
+def placeholder_type(shape: ET.Element) -> Optional[str]:
+    """Placeholder type of a shape ("title", "body", ...), or None if not a placeholder."""
+    ph = shape.find("./*/p:nvPr/p:ph", NS)
+    if ph is None:
+        return None
+    # ECMA-376: a p:ph without a type attribute is an "obj" placeholder
+    return ph.get("type", "obj")
+
+
+def paragraph_text(paragraph: ET.Element) -> str:
+    """Text of one a:p - runs, fields and line breaks in document order."""
+    parts = []
+    for child in paragraph:
+        if child.tag in (_A + "r", _A + "fld"):
+            t = child.find("a:t", NS)
+            if t is not None and t.text:
+                parts.append(t.text)
+        elif child.tag == _A + "br":
+            parts.append("\n")
+    return "".join(parts)
+
+
+def text_body_text(tx_body: ET.Element) -> str:
+    """Text of a txBody, one line per paragraph."""
+    return "\n".join(paragraph_text(p) for p in tx_body.findall("a:p", NS))
+
+
+def shape_text(shape: ET.Element) -> str:
+    """Text of a p:sp shape's text body ("" if it has none)."""
+    tx_body = shape.find("p:txBody", NS)
+    if tx_body is None:
+        return ""
+    return text_body_text(tx_body)
+
+
+def get_slide_title(slide: ET.Element) -> str:
+    """Text of the slide's title (or centered title) placeholder."""
+    sp_tree = slide.find("p:cSld/p:spTree", NS)
+    if sp_tree is None:
+        return ""
+    for shape in iter_shapes(sp_tree):
+        if shape.tag == _P + "sp" and placeholder_type(shape) in ("title", "ctrTitle"):
+            return shape_text(shape).strip()
+    return ""
+
+
+def get_notes_text(notes_slide: ET.Element) -> str:
+    """Text of a notesSlide's body placeholder - the speaker notes ("" if none)."""
+    sp_tree = notes_slide.find("p:cSld/p:spTree", NS)
+    if sp_tree is None:
+        return ""
+    for shape in iter_shapes(sp_tree):
+        if shape.tag == _P + "sp" and placeholder_type(shape) == "body":
+            return shape_text(shape).strip()
+    return ""
+
+
+def iter_text_bodies(part: ET.Element):
+    """
+    Yield every text body of a slide, layout, master or notes page.
+
+    Covers p:sp text, a:tbl cells in graphic frames and shapes inside
+    p:grpSp groups, in document order:
+
+        {"shape_id": 4, "shape_name": "Table 3", "placeholder": None,
+         "location": "table r2c1", "body_index": 5, "text": "..."}
+
+    location is "text" for a shape's own text body. body_index is the
+    text body's position among all text bodies of the part, as
+    replace_text_spans() expects.
+    """
+    sp_tree = part.find("p:cSld/p:spTree", NS)
+    if sp_tree is None:
+        return
+    order = {id(el): i for i, el in enumerate(el for el in part.iter() if el.tag in _TEXT_BODY_TAGS)}
+
+    for shape in iter_shapes(sp_tree):
+        c_nv_pr = shape.find("./*/p:cNvPr", NS)
+        info = {
+            "shape_id": int(c_nv_pr.get("id") or 0) if c_nv_pr is not None else None,
+            "shape_name": c_nv_pr.get("name", "") if c_nv_pr is not None else "",
+            "placeholder": placeholder_type(shape),
+        }
+
+        if shape.tag == _P + "sp":
+            tx_body = shape.find("p:txBody", NS)
+            if tx_body is not None:
+                yield dict(info, location="text", body_index=order[id(tx_body)],
+                           text=text_body_text(tx_body))
+
+        elif shape.tag == _P + "graphicFrame":
+            rows = shape.iterfind("a:graphic/a:graphicData/a:tbl/a:tr", NS)
+            for row_number, row in enumerate(rows, start=1):
+                for col_number, cell in enumerate(row.findall("a:tc", NS), start=1):
+                    tx_body = cell.find("a:txBody", NS)
+                    if tx_body is not None:
+                        yield dict(info, location=f"table r{row_number}c{col_number}",
+                                   body_index=order[id(tx_body)], text=text_body_text(tx_body))
+
+
+# =============================================================================
+# RAW XML EDITING
+# =============================================================================
+
+def find_element_spans(xml_bytes: bytes, tags) -> List[Dict]:
+    """
+    Locate elements in raw XML by byte offset, so edits can be spliced in
+    without re-serializing (and reformatting) the rest of the part.
+
+    Args:
+        xml_bytes: Raw part bytes
+        tags: Clark names to report, e.g. {"{...presentationml/2006/main}timing"}
+
+    Returns:
+        List of spans in document order:
+        {"tag": clark_name, "start": <index of '<'>, "inner_start": <after start tag>,
+         "inner_end": <index of '</'>, "end": <after closing '>'>, "depth": n}
+        Empty elements have inner_start == inner_end == end.
+    """
+    tags = set(tags)
+    spans = []
+    stack = []
+    state = {"last": None}
+
+    parser = expat.ParserCreate(namespace_separator=" ")
+
+    def _clark(name):
+        uri, _, local = name.rpartition(" ")
+        return "{%s}%s" % (uri, local) if uri else local
+
+    def _start(name, attrs):
+        index = parser.CurrentByteIndex
+        span = None
+        tag = _clark(name)
+        if tag in tags:
+            span = {"tag": tag, "start": index, "inner_start": _tag_end(xml_bytes, index),
+                    "inner_end": None, "end": None, "depth": len(stack)}
+            spans.append(span)
+        stack.append(span)
+        state["last"] = ("start", span)
+
+    def _end(name):
+        index = parser.CurrentByteIndex
+        span = stack.pop()
+        empty = (state["last"] == ("start", span) and xml_bytes[index - 2:index] == b"/>")
+        if span is not None:
+            if empty:
+                span["inner_start"] = span["inner_end"] = span["end"] = index
+            else:
+                span["inner_end"] = index
+                span["end"] = xml_bytes.index(b">", index) + 1
+        state["last"] = ("end", None)
+
+    def _chars(data):
+        state["last"] = ("chars", None)
+
+    parser.StartElementHandler = _start
+    parser.EndElementHandler = _end
+    parser.CharacterDataHandler = _chars
+    parser.Parse(xml_bytes, True)
+
+    return spans
+
+
+def _tag_end(data: bytes, start: int) -> int:
+    """Index just past the '>' closing the tag that starts at start (quote-aware)."""
+    quote = None
+    i = start
+    n = len(data)
+    while i < n:
+        c = data[i]
+        if quote is not None:
+            if c == quote:
+                quote = None
+        elif c in (0x22, 0x27):  # " or '
+            quote = c
+        elif c == 0x3E:  # >
+            return i + 1
+        i += 1
+    raise ValueError("Unterminated tag in XML part")
+
+
+def splice(data: bytes, edits: List[Tuple[int, int, bytes]]) -> bytes:
+    """Apply (start, end, replacement) byte edits; edits must not overlap."""
+    out = []
+    pos = 0
+    for start, end, replacement in sorted(edits, key=lambda e: e[0]):
+        out.append(data[pos:start])
+        out.append(replacement)
+        pos = end
+    out.append(data[pos:])
+    return b"".join(out)
+
+
+def _ns_prefix(data: bytes, uri: str) -> bytes:
+    """Qualified-name prefix ("a:", or "" for a default namespace) bound to uri in a part."""
+    match = re.search(rb'xmlns(?::([\w.-]+))?\s*=\s*["\']' + re.escape(uri.encode("utf-8")) + rb'["\']', data)
+    if match is None:
+        raise ValueError(f"Namespace not declared in part: {uri}")
+    return match.group(1) + b":" if match.group(1) else b""
+
+
+def _rename_tag(element: bytes, new_local: bytes) -> bytes:
+    """Rename an element's start (and end) tag, keeping its prefix, attributes and children."""
+    element = re.sub(rb"^<([\w.-]+:)?[\w.-]+", lambda m: b"<" + (m.group(1) or b"") + new_local, element, count=1)
+    return re.sub(rb"</([\w.-]+:)?[\w.-]+>$", lambda m: b"</" + (m.group(1) or b"") + new_local + b">", element, count=1)
+
+
+def append_child(data: bytes, parent_tag: str, child: bytes) -> bytes:
+    """Append raw child XML as the last child of the first parent_tag element."""
+    spans = find_element_spans(data, {parent_tag})
+    if not spans:
+        raise ValueError(f"Element not found: {parent_tag}")
+    parent = spans[0]
+
+    if parent["inner_start"] != parent["end"]:
+        return splice(data, [(parent["inner_end"], parent["inner_end"], child)])
+
+    # Empty element (<Types/>): open it up
+    start_tag = data[parent["start"]:parent["end"]]
+    qname = re.match(rb"<([\w.:-]+)", start_tag).group(1)
+    start_tag = start_tag[:-2].rstrip() + b">"
+    return splice(data, [(parent["start"], parent["end"], start_tag + child + b"</" + qname + b">")])
+
+
+# =============================================================================
+# NOTES WRITING
+# =============================================================================
+
+_NOTES_SLIDE_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+    '<p:notes xmlns:a="{a}" xmlns:r="{r}" xmlns:p="{p}">'
+    '<p:cSld><p:spTree>'
+    '<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr><p:grpSpPr/>'
+    '<p:sp><p:nvSpPr><p:cNvPr id="2" name="Slide Image Placeholder 1"/>'
+    '<p:cNvSpPr><a:spLocks noGrp="1" noRot="1" noChangeAspect="1"/></p:cNvSpPr>'
+    '<p:nvPr><p:ph type="sldImg"/></p:nvPr></p:nvSpPr><p:spPr/></p:sp>'
+    '<p:sp><p:nvSpPr><p:cNvPr id="3" name="Notes Placeholder 2"/>'
+    '<p:cNvSpPr><a:spLocks noGrp="1"/></p:cNvSpPr>'
+    '<p:nvPr><p:ph type="body" idx="1"/></p:nvPr></p:nvSpPr><p:spPr/>'
+    '<p:txBody><a:bodyPr/><a:lstStyle/>{paragraphs}</p:txBody></p:sp>'
+    '</p:spTree></p:cSld>'
+    '<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr>'
+    '</p:notes>'
+)
+
+
+def _notes_paragraphs(text: str, a: bytes, p_pr: bytes = b"", r_pr: bytes = b"",
+                      end_r_pr: bytes = b"") -> bytes:
+    """
+    DrawingML paragraphs for plain text, one a:p per line.
+
+    Args:
+        text: Notes text ("\n" separates paragraphs)
+        a: DrawingML prefix, e.g. b"a:"
+        p_pr, r_pr, end_r_pr: Raw a:pPr / a:rPr / a:endParaRPr copied onto
+            every paragraph so edited notes keep their formatting
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n").replace("\v", "\n")
+    out = []
+    for line in text.split("\n"):
+        if line:
+            run_text = escape(line).encode("utf-8")
+            out.append(b"<%sp>%s<%sr>%s<%st>%s</%st></%sr></%sp>"
+                       % (a, p_pr, a, r_pr, a, run_text, a, a, a))
+        else:
+            out.append(b"<%sp>%s%s</%sp>" % (a, p_pr, end_r_pr, a))
+    return b"".join(out)
+
+
+def replace_notes_text(notes_xml: bytes, text: str) -> bytes:
+    """
+    Replace the text of a notesSlide's body placeholder, splicing raw bytes.
+
+    Paragraph and run properties of the first existing paragraph (bullets,
+    indents, font, language) are reused for every new paragraph. The rest
+    of the part is left byte-for-byte as it was.
+
+    Raises:
+        ValueError: If the notes page has no body placeholder
+    """
+    spans = find_element_spans(notes_xml, {
+        _P + "sp", _P + "txBody", _A + "p", _A + "pPr", _A + "r", _A + "rPr", _A + "endParaRPr",
+    })
+    shape, _ = _notes_body(notes_xml, spans)
+
+    def _children(parent, tag):
+        return _child_spans(spans, parent, tag)
+
+    a = _ns_prefix(notes_xml, NS["a"])
+
+    tx_bodies = _children(shape, _P + "txBody")
+    if not tx_bodies:
+        p = _ns_prefix(notes_xml, NS["p"])
+        tx_body = b"<%stxBody><%sbodyPr/><%slstStyle/>%s</%stxBody>" % (
+            p, a, a, _notes_paragraphs(text, a), p)
+        return splice(notes_xml, [(shape["inner_end"], shape["inner_end"], tx_body)])
+    tx_body = tx_bodies[0]
+
+    paragraphs = _children(tx_body, _A + "p")
+    if not paragraphs:
+        return splice(notes_xml, [(tx_body["inner_end"], tx_body["inner_end"], _notes_paragraphs(text, a))])
+
+    # Formatting template: first paragraph with a run, else the first paragraph
+    template = next((para for para in paragraphs if _children(para, _A + "r")), paragraphs[0])
+
+    def _raw(spans_found):
+        return notes_xml[spans_found[0]["start"]:spans_found[0]["end"]] if spans_found else b""
+
+    p_pr = _raw(_children(template, _A + "pPr"))
+    runs = _children(template, _A + "r")
+    r_pr = _raw(_children(runs[0], _A + "rPr")) if runs else b""
+    end_r_pr = _raw(_children(template, _A + "endParaRPr"))
+    if not r_pr and end_r_pr:
+        r_pr = _rename_tag(end_r_pr, b"rPr")
+    if not end_r_pr and r_pr:
+        end_r_pr = _rename_tag(r_pr, b"endParaRPr")
+
+    # Spelling-error marks belong to the old text
+    r_pr = re.sub(rb'\s+err="[^"]*"', b"", r_pr)
+    end_r_pr = re.sub(rb'\s+err="[^"]*"', b"", end_r_pr)
+
+    new_paragraphs = _notes_paragraphs(text, a, p_pr, r_pr, end_r_pr)
+    return splice(notes_xml, [(paragraphs[0]["start"], paragraphs[-1]["end"], new_paragraphs)])
+
+
+def _child_spans(spans: List[Dict], parent: Dict, tag: str) -> List[Dict]:
+    """Spans of parent's direct children with the given tag."""
+    return [span for span in spans
+            if span["tag"] == tag and span["depth"] == parent["depth"] + 1
+            and parent["inner_start"] <= span["start"] < parent["inner_end"]]
+
+
+def _notes_body(notes_xml: bytes, spans: List[Dict]) -> Tuple[Dict, ET.Element]:
+    """Span and parsed element of the notes body placeholder (spans must include p:sp)."""
+    shapes = list(ET.fromstring(notes_xml).iter(_P + "sp"))
+    body_index = next((i for i, shape in enumerate(shapes) if placeholder_type(shape) == "body"), None)
+    if body_index is None:
+        raise ValueError("Notes page has no notes placeholder")
+    return [span for span in spans if span["tag"] == _P + "sp"][body_index], shapes[body_index]
+
+
+def replace_notes_spans(notes_xml: bytes, edits: List[Tuple[int, int, str]],
+                        original_text: str) -> bytes:
+    """
+    Apply text edits to the notes, rewriting only the runs they touch.
+
+    The notes text (as get_notes_text() returns it) is mapped back onto
+    the a:t of each a:r. An edit inside one run rewrites that run's text;
+    an edit spanning several runs puts the replacement in the first and
+    removes the covered text from the others. Run and paragraph
+    properties, and every untouched run, stay byte-for-byte as they were,
+    so bold/italic emphasis survives.
+
+    Args:
+        notes_xml: Raw notesSlide part
+        edits: (start, end, replacement) offsets into original_text;
+            must not overlap
+        original_text: The notes text the offsets refer to
+
+    Raises:
+        ValueError: If the notes text is not original_text, or an edit
+            cannot stay within runs (it crosses a line or paragraph break,
+            touches a field, or its replacement contains a line break).
+            Callers fall back to replace_notes_text().
+    """
+    spans = find_element_spans(notes_xml, {_P + "sp"} | _TEXT_RUN_TAGS)
+    shape_span, shape = _notes_body(notes_xml, spans)
+
+    tx_spans = _child_spans(spans, shape_span, _P + "txBody")
+    tx_body = shape.find("p:txBody", NS)
+    if not tx_spans or tx_body is None:
+        raise ValueError("Notes placeholder has no text")
+
+    return splice(notes_xml, _text_body_edits(spans, tx_spans[0], tx_body, edits, original_text, strip=True))
+
+
+def replace_text_spans(part_xml: bytes, body_index: int, edits: List[Tuple[int, int, str]],
+                       original_text: str) -> bytes:
+    """
+    Apply text edits to one text body of a slide, layout or master part.
+
+    Like replace_notes_spans(), only the runs the edits touch are
+    rewritten. Offsets are into the text body's text as
+    iter_text_bodies() reports it (not stripped).
+
+    Args:
+        part_xml: Raw part
+        body_index: "body_index" from iter_text_bodies()
+        edits: (start, end, replacement) offsets into original_text
+        original_text: The text body's text the offsets refer to
+
+    Raises:
+        ValueError: If the text body is gone or its text is not
+            original_text, or an edit cannot stay within runs
+    """
+    spans = find_element_spans(part_xml, _TEXT_RUN_TAGS)
+    tx_spans = [span for span in spans if span["tag"] in _TEXT_BODY_TAGS]
+    tx_bodies = [el for el in ET.fromstring(part_xml).iter() if el.tag in _TEXT_BODY_TAGS]
+    if len(tx_spans) != len(tx_bodies) or not 0 <= body_index < len(tx_bodies):
+        raise ValueError("Text body not found")
+
+    return splice(part_xml, _text_body_edits(spans, tx_spans[body_index], tx_bodies[body_index],
+                                             edits, original_text, strip=False))
+
+
+def _text_body_edits(spans: List[Dict], tx_span: Dict, tx_body: ET.Element,
+                     edits: List[Tuple[int, int, str]], original_text: str,
+                     strip: bool) -> List[Tuple[int, int, bytes]]:
+    """
+    Byte edits rewriting the a:t runs of one txBody that text edits touch.
+
+    spans must come from find_element_spans() with _TEXT_RUN_TAGS; strip
+    says whether original_text is the stripped text (as for notes).
+    """
+    paragraphs = tx_body.findall("a:p", NS)
+    paragraph_spans = _child_spans(spans, tx_span, _A + "p")
+    if len(paragraphs) != len(paragraph_spans):
+        raise ValueError("Could not map text paragraphs")
+
+    # Flatten as text_body_text() does: (start, end, a:t span or None if not editable, text)
+    segments = []
+    pos = 0
+    inline = (_A + "r", _A + "fld", _A + "br")
+    for index, (paragraph, paragraph_span) in enumerate(zip(paragraphs, paragraph_spans)):
+        if index:
+            segments.append((pos, pos + 1, None, "\n"))
+            pos += 1
+
+        children = [child for child in paragraph if child.tag in inline]
+        child_spans = [span for tag in inline for span in _child_spans(spans, paragraph_span, tag)]
+        child_spans.sort(key=lambda span: span["start"])
+
+        for child, child_span in zip(children, child_spans):
+            if child.tag == _A + "br":
+                segments.append((pos, pos + 1, None, "\n"))
+                pos += 1
+                continue
+            t = child.find("a:t", NS)
+            text = t.text if t is not None and t.text else ""
+            if not text:
+                continue
+            t_spans = _child_spans(spans, child_span, _A + "t")
+            editable = child.tag == _A + "r" and t_spans
+            segments.append((pos, pos + len(text), t_spans[0] if editable else None, text))
+            pos += len(text)
+
+    full_text = "".join(segment[3] for segment in segments)
+    if (full_text.strip() if strip else full_text) != original_text:
+        raise ValueError("Text does not match")
+    lead = len(full_text) - len(full_text.lstrip()) if strip else 0
+
+    # Per-run edits, in run-local offsets
+    run_edits = {}
+    for start, end, replacement in sorted(edits, key=lambda edit: edit[0]):
+        if any(ch in replacement for ch in "\r\n\v"):
+            raise ValueError("Replacement contains a line break")
+        start += lead
+        end += lead
+
+        touched = [i for i, segment in enumerate(segments) if segment[0] < end and start < segment[1]]
+        if start == end:
+            # Pure insertion: into the run it falls in (or ends)
+            touched = [i for i, segment in enumerate(segments)
+                       if segment[0] <= start <= segment[1] and segment[2] is not None][:1]
+        if not touched or any(segments[i][2] is None for i in touched):
+            raise ValueError("Edit crosses a line break, paragraph break or field")
+
+        for n, i in enumerate(touched):
+            seg_start, seg_end = segments[i][0], segments[i][1]
+            run_edits.setdefault(i, []).append(
+                (max(start, seg_start) - seg_start, min(end, seg_end) - seg_start, replacement if n == 0 else "")
+            )
+
+    byte_edits = []
+    for i, local_edits in run_edits.items():
+        _, _, t_span, text = segments[i]
+        for local_start, local_end, replacement in sorted(local_edits, reverse=True):
+            text = text[:local_start] + replacement + text[local_end:]
+        byte_edits.append((t_span["inner_start"], t_span["inner_end"], escape(text).encode("utf-8")))
+    return byte_edits
+
+
+def _rel_type_base(pkg: "DeckPackage") -> str:
+    """Relationship type namespace the deck uses (transitional or strict)."""
+    for rel in pkg.get_rels("").values():
+        if rel["type"].endswith(REL_OFFICE_DOCUMENT):
+            return rel["type"][:-len(REL_OFFICE_DOCUMENT)]
+    return TRANSITIONAL_REL_BASE
+
+
+def _relationship_xml(r_id: str, rel_type: str, source_part: str, target_part: str) -> bytes:
+    target = posixpath.relpath(target_part, posixpath.dirname(source_part))
+    return ('<Relationship Id="%s" Type="%s" Target="%s"/>'
+            % (r_id, escape(rel_type, {'"': "&quot;"}), escape(target, {'"': "&quot;"}))).encode("utf-8")
+
+
+def add_notes_slide(pkg: "DeckPackage", slide_part: str, text: str,
+                    changes: Dict[str, Optional[bytes]]) -> str:
+    """
+    Create a notesSlide part for a slide that has none.
+
+    Adds the notesSlide and its rels (notes master + slide), a notesSlide
+    relationship on the slide, and a content-type override - all as
+    entries in changes, ready for write_package(). Parts already present
+    in changes (from earlier edits in the same batch) are built upon.
+
+    Returns:
+        Name of the new notesSlide part
+
+    Raises:
+        ValueError: If the deck has no notes master to base the page on
+    """
+    notes_master = pkg.related_part(pkg.presentation_part, REL_NOTES_MASTER)
+    if notes_master is None:
+        raise ValueError("Deck has no notes master (add notes to any slide in PowerPoint once)")
+
+    def _current(part_name):
+        if part_name in changes:
+            return changes[part_name]
+        return pkg.read_part(part_name) if pkg.has_part(part_name) else None
+
+    taken = set(pkg.part_names()) | set(changes)
+    number = 1
+    while f"ppt/notesSlides/notesSlide{number}.xml" in taken:
+        number += 1
+    notes_part = f"ppt/notesSlides/notesSlide{number}.xml"
+
+    rel_base = _rel_type_base(pkg)
+
+    changes[notes_part] = _NOTES_SLIDE_XML.format(
+        a=NS["a"], r=NS["r"], p=NS["p"],
+        paragraphs=_notes_paragraphs(text, b"a:").decode("utf-8")
+    ).encode("utf-8")
+
+    changes[rels_part_name(notes_part)] = (
+        b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+        b'<Relationships xmlns="' + NS["rel"].encode("utf-8") + b'">'
+        + _relationship_xml("rId1", rel_base + REL_NOTES_MASTER, notes_part, notes_master)
+        + _relationship_xml("rId2", rel_base + REL_SLIDE, notes_part, slide_part)
+        + b'</Relationships>'
+    )
+
+    slide_rels_part = rels_part_name(slide_part)
+    slide_rels = _current(slide_rels_part)
+    if slide_rels is None:
+        slide_rels = (b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+                      b'<Relationships xmlns="' + NS["rel"].encode("utf-8") + b'"/>')
+    used_ids = [int(n) for n in re.findall(rb'\bId="rId(\d+)"', slide_rels)]
+    r_id = f"rId{max(used_ids, default=0) + 1}"
+    changes[slide_rels_part] = append_child(
+        slide_rels, "{%s}Relationships" % NS["rel"],
+        _relationship_xml(r_id, rel_base + REL_NOTES_SLIDE, slide_part, notes_part)
+    )
+
+    override = ('<Override PartName="/%s" ContentType="%s"/>'
+                % (notes_part, NOTES_SLIDE_CONTENT_TYPE)).encode("utf-8")
+    changes[CONTENT_TYPES_PART] = append_child(
+        _current(CONTENT_TYPES_PART), "{%s}Types" % NS["ct"], override
+    )
+
+    return notes_part
+
+
+# =============================================================================
+# PACKAGE WRITER
+# =============================================================================
+
+# Zip record layouts (same as the stdlib zipfile module)
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_CENTRAL_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+_END_RECORD = struct.Struct("<4s4H2LH")
+_ZIP32_LIMIT = 0xFFFFFFFF
+
+_FLAG_ENCRYPTED = 0x1
+_FLAG_DATA_DESCRIPTOR = 0x8
+_FLAG_UTF8 = 0x800
+
+COPY_CHUNK_SIZE = 1024 * 1024
+DEFLATE_LEVEL = 6
+
+
+def _dos_datetime(date_time) -> Tuple[int, int]:
+    year, month, day, hour, minute, second = date_time
+    dos_date = max(year - 1980, 0) << 9 | month << 5 | day
+    dos_time = hour << 11 | minute << 5 | (second // 2)
+    return dos_time, dos_date
+
+
+def write_package(src_path: str, dst_path: str,
+                  changes: Dict[str, Optional[bytes]],
+                  compress_level: int = DEFLATE_LEVEL) -> Dict:
+    """
+    Write a copy of a package with some parts replaced, added or removed.
+
+    Untouched entries are streamed straight from the source: the compressed
+    bytes are copied as-is and the CRC/sizes reused, so a 600 MB deck with
+    one edited notes slide costs one small deflate plus a file copy. The
+    output is written to a temp file next to dst_path and moved into place,
+    so dst_path may be the source itself.
+
+    Args:
+        src_path: Source .pptx
+        dst_path: Output path (may equal src_path)
+        changes: {part_name: new_bytes} - existing parts are replaced in
+                 place, new names are appended, None removes the part
+        compress_level: zlib level for rewritten parts
+
+    Returns:
+        {"copied": 412, "rewritten": 1, "added": 0, "removed": 0, "bytes_written": 629145600}
+    """
+    src_path = str(Path(src_path).resolve())
+    dst_path = str(Path(dst_path).resolve())
+
+    stats = {"copied": 0, "rewritten": 0, "added": 0, "removed": 0, "bytes_written": 0}
+    pending = dict(changes)
+    central = []
+
+    fd, tmp_path = tempfile.mkstemp(prefix=".vox", suffix=".tmp", dir=os.path.dirname(dst_path))
+    try:
+        with zipfile.ZipFile(src_path, "r") as zin, open(src_path, "rb") as src, os.fdopen(fd, "wb") as out:
+            for info in zin.infolist():
+                if info.filename in pending:
+                    data = pending.pop(info.filename)
+                    if data is None:
+                        stats["removed"] += 1
+                        continue
+                    central.append(_write_new_entry(out, info.filename, data, compress_level))
+                    stats["rewritten"] += 1
+                else:
+                    central.append(_copy_raw_entry(out, src, info))
+                    stats["copied"] += 1
+
+            for part_name, data in pending.items():
+                if data is None:
+                    continue
+                central.append(_write_new_entry(out, part_name, data, compress_level))
+                stats["added"] += 1
+
+            _write_central_directory(out, central)
+            stats["bytes_written"] = out.tell()
+
+        try:
+            shutil.copymode(src_path, tmp_path)
+        except OSError:
+            pass
+        os.replace(tmp_path, dst_path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    return stats
+
+
+def _copy_raw_entry(out, src, info: zipfile.ZipInfo) -> Dict:
+    """Copy one entry's compressed bytes unchanged; returns its central record."""
+    if info.flag_bits & _FLAG_ENCRYPTED:
+        raise ValueError(f"Encrypted zip entry not supported: {info.filename}")
+
+    src.seek(info.header_offset)
+    header = _LOCAL_HEADER.unpack(src.read(_LOCAL_HEADER.size))
+    name_len, extra_len = header[10], header[11]
+    src.seek(info.header_offset + _LOCAL_HEADER.size + name_len + extra_len)
+
+    record = {
+        "name": _encode_name(info.filename, info.flag_bits),
+        "flags": info.flag_bits & ~_FLAG_DATA_DESCRIPTOR,
+        "method": info.compress_type,
+        "date_time": info.date_time,
+        "crc": info.CRC,
+        "compress_size": info.compress_size,
+        "file_size": info.file_size,
+        "external_attr": info.external_attr,
+    }
+    _write_local_header(out, record)
+
+    remaining = info.compress_size
+    while remaining > 0:
+        chunk = src.read(min(COPY_CHUNK_SIZE, remaining))
+        if not chunk:
+            raise ValueError(f"Truncated zip entry: {info.filename}")
+        out.write(chunk)
+        remaining -= len(chunk)
+
+    return record
+
+
+def _write_new_entry(out, part_name: str, data: bytes, compress_level: int) -> Dict:
+    """Deflate and write one modified or added part; returns its central record."""
+    compressor = zlib.compressobj(compress_level, zlib.DEFLATED, -15)
+    compressed = compressor.compress(data) + compressor.flush()
+
+    record = {
+        "name": part_name.encode("utf-8"),
+        "flags": _FLAG_UTF8 if not part_name.isascii() else 0,
+        "method": zipfile.ZIP_DEFLATED,
+        "date_time": time.localtime(time.time())[:6],
+        "crc": zlib.crc32(data) & 0xFFFFFFFF,
+        "compress_size": len(compressed),
+        "file_size": len(data),
+        "external_attr": 0,
+    }
+    _write_local_header(out, record)
+    out.write(compressed)
+    return record
+
+
+def _encode_name(filename: str, flags: int) -> bytes:
+    if flags & _FLAG_UTF8:
+        return filename.encode("utf-8")
+    return filename.encode("cp437")
+
+
+def _write_local_header(out, record: Dict):
+    offset = out.tell()
+    if max(offset, record["compress_size"], record["file_size"]) >= _ZIP32_LIMIT:
+        raise ValueError("Package too large for the raw-copy writer (zip64 not supported)")
+
+    record["offset"] = offset
+    dos_time, dos_date = _dos_datetime(record["date_time"])
+    out.write(_LOCAL_HEADER.pack(
+        b"PK\x03\x04", 20, 0, record["flags"], record["method"], dos_time, dos_date,
+        record["crc"], record["compress_size"], record["file_size"],
+        len(record["name"]), 0,
+    ))
+    out.write(record["name"])
+
+
+def _write_central_directory(out, central: List[Dict]):
+    if len(central) > 0xFFFF:
+        raise ValueError("Package has too many parts for the raw-copy writer (zip64 not supported)")
+
+    cd_start = out.tell()
+    for record in central:
+        dos_time, dos_date = _dos_datetime(record["date_time"])
+        out.write(_CENTRAL_HEADER.pack(
+            b"PK\x01\x02", 20, 0, 20, 0, record["flags"], record["method"], dos_time, dos_date,
+            record["crc"], record["compress_size"], record["file_size"],
+            len(record["name"]), 0, 0, 0, 0, record["external_attr"], record["offset"],
+        ))
+        out.write(record["name"])
+    cd_size = out.tell() - cd_start
+
+    if cd_start + cd_size >= _ZIP32_LIMIT:
+        raise ValueError("Package too large for the raw-copy writer (zip64 not supported)")
+
+    out.write(_END_RECORD.pack(b"PK\x05\x06", 0, 0, len(central), len(central), cd_size, cd_start, 0))
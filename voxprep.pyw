@@ -30,11 +30,19 @@ import voxnotes
 import voxreplace
 import voxmedia
 import voxmisc
+import voxdeck
 
 # --- App Configuration ---
 APP_NAME = "VoxPrep"
 APP_VERSION = "v1.0"
 
+# Memory budget for parsed decks kept between operations (settings.json: deck_cache_mb)
+DEFAULT_DECK_CACHE_MB = 256
+
+# Import preview: word-level edits listed per slide, and their max width
+IMPORT_PREVIEW_MAX_EDITS = 3
+IMPORT_PREVIEW_WIDTH = 90
+
 # --- Logging Setup (matches Voxsmith pattern) ---
 LOG_PREFIX = "[voxprep]"
 
@@ -190,11 +198,26 @@ def do_export_notes(deck_path: str, output_path: str, format: str, log_callback=
         return {"success": False, "error": str(e)}
 
 
+# Import session from the last preview, reused by Apply while both files are unchanged
+_import_session = None
+
+
 def do_import_notes(deck_path: str, notes_file: str, preview_only: bool = False, log_callback=None):
-    """Wrapper for voxnotes.import_notes with logging."""
+    """Wrapper for voxnotes.ImportSession with logging."""
+    global _import_session
     logger = logging.getLogger("voxprep")
     try:
-        result = voxnotes.import_notes(deck_path, notes_file, preview_only, log_callback=log_callback)
+        session = _import_session
+        if session is None or session.result is not None or not session.matches(deck_path, notes_file):
+            session = voxnotes.ImportSession(deck_path, notes_file, log_callback=log_callback)
+            _import_session = session
+        session.log_callback = log_callback
+        
+        if preview_only:
+            result = session.preview()
+        else:
+            result = session.apply()
+            _import_session = None
         logger.info(f"IMPORT deck={os.path.basename(deck_path)} notes={os.path.basename(notes_file)} preview={preview_only}")
         
         if preview_only:
@@ -202,17 +225,18 @@ def do_import_notes(deck_path: str, notes_file: str, preview_only: bool = False,
             changes = result.get("changes", [])
             normalized = []
             for c in changes:
-                # Count word difference
-                orig_words = len(c.get("original_notes", "").split())
-                new_words = len(c.get("edited_notes", "").split())
-                word_diff = new_words - orig_words
-                diff_str = f"+{word_diff}" if word_diff > 0 else str(word_diff)
+                # Word counts come from the diff compare_notes already made
+                word_delta = c.get("word_delta", 0)
+                diff_str = f"+{word_delta}" if word_delta > 0 else str(word_delta)
                 
                 normalized.append({
                     "slide": c["slide_number"],
                     "slide_title": c.get("slide_title", ""),
                     "change_type": c.get("change_type", "modified"),
-                    "word_diff": diff_str
+                    "word_diff": diff_str,
+                    "words_added": c.get("words_added", 0),
+                    "words_removed": c.get("words_removed", 0),
+                    "diff": c.get("diff", [])
                 })
             return {"changes": normalized, "preview": True}
         else:
@@ -231,13 +255,28 @@ def do_import_notes(deck_path: str, notes_file: str, preview_only: bool = False,
         return {"success": False, "error": str(e)}
 
 
+# Replace plan from the last Find/Replace preview; Replace All applies it as-is
+_replace_plan = None
+
+
+def _replace_plan_matches(plan, deck_path: str, find_text: str, replace_text: str, case_sensitive: bool) -> bool:
+    return (plan is not None
+            and os.path.normcase(plan["pptx_path"]) == os.path.normcase(os.path.realpath(deck_path))
+            and plan["search_term"] == find_text
+            and plan["replace_term"] == replace_text
+            and plan["case_sensitive"] == case_sensitive)
+
+
 def do_find_replace(deck_path: str, find_text: str, replace_text: str,
                     case_sensitive: bool = False, preview_only: bool = False, log_callback=None):
     """Wrapper for voxreplace with logging."""
+    global _replace_plan
     logger = logging.getLogger("voxprep")
     try:
         if preview_only:
-            results = voxreplace.preview_replace(deck_path, find_text, replace_text, case_sensitive, log_callback=log_callback)
+            plan = voxreplace.plan_replace(deck_path, find_text, replace_text, case_sensitive, log_callback=log_callback)
+            _replace_plan = plan
+            results = plan["slides"]
             logger.info(f"FIND deck={os.path.basename(deck_path)} find='{find_text}' matches={len(results)}")
             # Normalize for UI
             normalized = []
@@ -249,7 +288,12 @@ def do_find_replace(deck_path: str, find_text: str, replace_text: str,
                 })
             return normalized
         else:
-            result = voxreplace.replace_in_notes(deck_path, find_text, replace_text, case_sensitive, log_callback=log_callback)
+            plan, _replace_plan = _replace_plan, None
+            if _replace_plan_matches(plan, deck_path, find_text, replace_text, case_sensitive):
+                # Write what Preview showed; slides edited since then are skipped
+                result = voxreplace.apply_replace_plan(plan, log_callback=log_callback)
+            else:
+                result = voxreplace.replace_in_notes(deck_path, find_text, replace_text, case_sensitive, log_callback=log_callback)
             logger.info(f"REPLACE deck={os.path.basename(deck_path)} find='{find_text}' replace='{replace_text}' count={result.get('total_replacements', 0)}")
             return {
                 "success": True,
@@ -271,6 +315,20 @@ def main():
     logger = logging.getLogger("voxprep")
     logger.info(f"=== {APP_NAME} {APP_VERSION} started ===")
 
+    # Parsed decks are reused across Analyze/Export/Import/Find until the file changes
+    try:
+        cache_mb = int(load_settings().get("deck_cache_mb", DEFAULT_DECK_CACHE_MB))
+    except (TypeError, ValueError):
+        cache_mb = DEFAULT_DECK_CACHE_MB
+    voxdeck.configure_cache(cache_mb * 1024 * 1024)
+
+    # Remember what we learned about decks across restarts (settings.json: deck_index)
+    if load_settings().get("deck_index", True):
+        try:
+            voxdeck.enable_store(os.path.join(_get_app_paths()["root"], "deckindex.sqlite3"))
+        except Exception as e:
+            logger.warning(f"Deck index unavailable: {e}")
+
     # --- Window Setup ---
     ctk.set_appearance_mode("light")
     ctk.set_default_color_theme("blue")
@@ -600,7 +658,7 @@ def main():
     format_menu = ctk.CTkOptionMenu(
         format_frame,
         variable=export_format_var,
-        values=["docx", "txt", "md"],
+        values=["docx", "txt", "md", "jsonl"],
         width=120
     )
     format_menu.pack(side="left", padx=10)
@@ -609,7 +667,8 @@ def main():
         export_frame,
         text="* docx: Word document with VO-friendly formatting (14pt, 1.5 spacing)\n"
              "* txt: Plain text file\n"
-             "* md: Markdown (good for version control)",
+             "* md: Markdown (good for version control)\n"
+             "* jsonl: One JSON record per slide (for scripts and TTS tools)",
         font=("Open Sans", 11),
         justify="left"
     )
@@ -632,7 +691,8 @@ def main():
         filetypes = {
             "docx": [("Word Document", "*.docx"), ("All files", "*.*")],
             "txt": [("Text File", "*.txt"), ("All files", "*.*")],
-            "md": [("Markdown", "*.md"), ("All files", "*.*")]
+            "md": [("Markdown", "*.md"), ("All files", "*.*")],
+            "jsonl": [("JSON Lines", "*.jsonl"), ("All files", "*.*")]
         }
         
         # Show Save As dialog
@@ -683,10 +743,11 @@ def main():
         path = filedialog.askopenfilename(
             title="Select Notes File",
             filetypes=[
-                ("All supported", "*.docx;*.txt;*.md"),
+                ("All supported", "*.docx;*.txt;*.md;*.jsonl"),
                 ("Word", "*.docx"),
                 ("Text", "*.txt"),
-                ("Markdown", "*.md")
+                ("Markdown", "*.md"),
+                ("JSON Lines", "*.jsonl")
             ]
         )
         if path:
@@ -723,7 +784,22 @@ def main():
         if result.get("changes"):
             changes_label.configure(text=f"Changes to apply: {len(result['changes'])} slides")
             for change in result["changes"]:
-                changes_listbox.insert(tk.END, f"Slide {change['slide']}: {change.get('word_diff', '?')} words changed")
+                changes_listbox.insert(
+                    tk.END,
+                    f"Slide {change['slide']}: {change.get('word_diff', '?')} words "
+                    f"(+{change.get('words_added', 0)} / -{change.get('words_removed', 0)})"
+                )
+                for op in change.get("diff", [])[:IMPORT_PREVIEW_MAX_EDITS]:
+                    if op["op"] == "insert":
+                        detail = f'+ "{op["edited"]}"'
+                    elif op["op"] == "delete":
+                        detail = f'- "{op["original"]}"'
+                    else:
+                        detail = f'"{op["original"]}" -> "{op["edited"]}"'
+                    changes_listbox.insert(tk.END, f"      {detail[:IMPORT_PREVIEW_WIDTH]}")
+                hidden = len(change.get("diff", [])) - IMPORT_PREVIEW_MAX_EDITS
+                if hidden > 0:
+                    changes_listbox.insert(tk.END, f"      ... {hidden} more edit(s)")
         else:
             changes_label.configure(text="Changes to apply: (none)")
             changes_listbox.insert(tk.END, "(No changes detected or preview not available)")
@@ -3,7 +3,17 @@ voxreplace.py
 Find and replace in PowerPoint speaker notes for VoxPrep.
 
 Searches across all slide notes and performs bulk replacements.
-Supports case-sensitive and regex matching.
+Supports case-sensitive and regex matching. Searching and previewing
+.pptx/.pptm decks reads the notes XML directly (no PowerPoint), fast
+enough for find-as-you-type.
+
+User regexes (use_regex=True) are checked for nested quantifiers and run
+in a worker process under per-slide and per-job time budgets, so a
+pattern that backtracks forever is cancelled instead of hanging VoxPrep.
+
+On .pptx/.pptm decks a scope widens the search beyond the notes:
+"slides" (on-slide text, including table cells and grouped shapes),
+"masters" (slide layouts and masters) or "all".
 
 Example:
     # Preview changes
@@ -15,13 +25,42 @@ Example:
     
     # Apply replacement
     result = replace_in_notes("Training.pptx", "Acme Corp", "Acme Industries")
+    
+    # Or preview once and apply exactly what was previewed
+    plan = plan_replace("Training.pptx", "Acme Corp", "Acme Industries")
+    result = apply_replace_plan(plan)
+    
+    # Many terms at once (e.g. a pronunciation lexicon file)
+    result = batch_replace("Training.pptx", load_lexicon("lexicon.tsv"))
+    
+    # Which decks in the library mention a product?
+    hits = find_in_library("library.sqlite3", "Acme Corp", folders=["S:/Training"])
+    
+    # Rebrand on-slide text too
+    result = replace_in_notes("Training.pptx", "Acme Corp", "Acme Industries", scope="all")
 """
 
+import csv
+import hashlib
+import multiprocessing
 import os
+import posixpath
 import re
+import threading
 import time
 from pathlib import Path
-from typing import List, Dict, Optional, Callable, Tuple
+from typing import List, Dict, Optional, Callable, Tuple, Union
+from xml.etree import ElementTree as ET
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants  # Python 3.11+
+except ImportError:
+    import sre_parse
+    import sre_constants
+
+import voxdeck
+import voxindex
+import voxooxml
 
 try:
     from win32com.client import Dispatch, gencache
@@ -41,6 +80,24 @@ LOG_PREFIX = "[voxreplace]"
 COM_RETRY_ATTEMPTS = 3
 COM_RETRY_DELAY = 1.5  # seconds
 
+# Compiled lexicon files kept in memory, by path
+LEXICON_CACHE_SIZE = 8
+
+# Matching time allowed for a user-supplied regex (use_regex), in seconds
+REGEX_SLIDE_BUDGET = 2.0
+REGEX_JOB_BUDGET = 20.0
+
+# Time allowed for the regex worker process to start (not part of the budgets)
+REGEX_WORKER_START_TIMEOUT = 60.0
+
+# Find/replace scopes -> kinds of package part each one searches
+SCOPES = {
+    "notes": ("notes",),
+    "slides": ("slide",),
+    "masters": ("master", "layout"),
+    "all": ("slide", "notes", "master", "layout"),
+}
+
 
 def log(msg: str):
     """Simple logging helper."""
@@ -145,12 +202,579 @@ def _get_slide_title(pres, slide_num: int) -> str:
     return ""
 
 
+def _build_pattern(search_term: str, case_sensitive: bool, use_regex: bool) -> "re.Pattern":
+    """Compile the search pattern (a literal search_term is escaped)."""
+    if not search_term:
+        raise ValueError("Search term cannot be empty")
+    
+    flags = 0 if case_sensitive else re.IGNORECASE
+    if use_regex:
+        try:
+            pattern = re.compile(search_term, flags)
+        except re.error as e:
+            raise ValueError(f"Invalid regex pattern: {e}")
+        if _nested_quantifier(sre_parse.parse(search_term, flags)):
+            raise ValueError(
+                "Regex repeats a group that is itself only repeats (like (a+)+ or (\\w+\\s?)*), "
+                "which can take practically forever to fail - rewrite it without the nested repetition"
+            )
+        return pattern
+    
+    # Escape special regex chars for literal search
+    return re.compile(re.escape(search_term), flags)
+
+
+def _match_details(found: List[Tuple[int, int, Optional[str]]], notes_text: str) -> List[Dict]:
+    """Each match (from _Matcher.scan()) with offsets and a context snippet (50 chars before/after)."""
+    match_details = []
+    for match_start, match_end, _ in found:
+        start = max(0, match_start - 50)
+        end = min(len(notes_text), match_end + 50)
+        context = notes_text[start:end]
+        if start > 0:
+            context = "..." + context
+        if end < len(notes_text):
+            context = context + "..."
+        
+        match_details.append({
+            "start": match_start,
+            "end": match_end,
+            "matched_text": notes_text[match_start:match_end],
+            "context": context
+        })
+    return match_details
+
+
+def _find_result(slide_num: int, title: str, notes_text: str, match_details: List[Dict]) -> Dict:
+    return {
+        "slide_number": slide_num,
+        "slide_title": title,
+        "match_count": len(match_details),
+        "matches": match_details,
+        "notes_preview": notes_text[:200] + ("..." if len(notes_text) > 200 else "")
+    }
+
+
+def _iter_ooxml_notes(pptx_path: str):
+    """(slide, title, notes_text) for each slide of a .pptx/.pptm, from the deck cache."""
+    deck = voxdeck.get_deck(pptx_path)
+    for slide, title, notes_text in deck.iter_notes():
+        yield slide, sanitize_text(title), sanitize_text(notes_text)
+
+
+def _text_hash(text: str) -> str:
+    """Hash of the exact notes text a plan was computed from."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _apply_edits(text: str, edits: List[Tuple[int, int, str]]) -> str:
+    """Text with each (start, end, replacement) applied; edits are in order and don't overlap."""
+    parts = []
+    pos = 0
+    for start, end, replacement in edits:
+        parts.append(text[pos:start])
+        parts.append(replacement)
+        pos = end
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def _edit_notes_xml(notes_xml: bytes, edits: List[Tuple[int, int, str]],
+                    original_text: str, new_text: str) -> Tuple[bytes, Optional[str]]:
+    """
+    New notesSlide XML with the edits applied.
+    
+    Only the runs the edits touch are rewritten, so formatting elsewhere in
+    the notes is kept. If an edit can't be kept within runs (e.g. it spans
+    a line break), the whole notes text is replaced with new_text instead.
+    
+    Returns:
+        (notes_xml, reason) - reason is None for a run-level edit, else why
+        the whole text was rewritten
+    """
+    try:
+        return voxooxml.replace_notes_spans(notes_xml, edits, original_text), None
+    except ValueError as e:
+        return voxooxml.replace_notes_text(notes_xml, new_text), str(e)
+
+
+# =============================================================================
+# SCOPES (slide, layout and master text)
+# =============================================================================
+
+def _scoped(pptx_path: str, scope: str) -> bool:
+    """Check scope; True if it needs the package scan (anything beyond the notes)."""
+    if scope not in SCOPES:
+        raise ValueError(f"Unknown scope '{scope}' (use one of: {', '.join(SCOPES)})")
+    if scope == "notes":
+        return False
+    if not os.path.isfile(pptx_path):
+        raise FileNotFoundError(f"PowerPoint file not found: {pptx_path}")
+    if not voxooxml.is_ooxml_package(pptx_path):
+        raise ValueError(f"Scope '{scope}' needs a .pptx/.pptm deck")
+    return True
+
+
+def _iter_scope_text(pptx_path: str, scope: str):
+    """
+    Every text body in scope, from one pass over the package.
+    
+    Yields dicts tagging where the text lives:
+        {
+            "part": "ppt/slides/slide3.xml",
+            "kind": "slide",            # "notes", "layout" or "master"
+            "slide_number": 3, "slide_id": 258, "slide_title": "Configuration",
+            "shape_id": 4, "shape_name": "Table 3",
+            "location": "table r2c1",   # "text", "table rNcM" or "notes"
+            "body_index": 5,
+            "text": "..."
+        }
+    
+    Layouts and masters have no slide number or ID; their slide_title is
+    the layout/master name. Notes pages contribute only the notes
+    placeholder, stripped as everywhere else in VoxPrep.
+    """
+    kinds = SCOPES[scope]
+    slide_kinds = {"slide", "notes"} & set(kinds)
+    
+    with voxooxml.DeckPackage(pptx_path) as pkg:
+        for entry in (pkg.slide_index if slide_kinds else ()):
+            # Titles come from the same parse, so the package is opened once
+            slide_xml = pkg.get_xml(entry["slide_part"], cache=False)
+            slide = {
+                "slide_number": entry["slide_number"],
+                "slide_id": entry["slide_id"],
+                "slide_title": sanitize_text(voxdeck.slide_title(slide_xml)),
+            }
+            
+            if "slide" in kinds:
+                for body in voxooxml.iter_text_bodies(slide_xml):
+                    yield _scope_item(entry["slide_part"], "slide", slide, body)
+            
+            if "notes" in kinds and entry["notes_part"]:
+                for body in voxooxml.iter_text_bodies(pkg.get_xml(entry["notes_part"], cache=False)):
+                    if body["placeholder"] == "body" and body["location"] == "text":
+                        body = dict(body, location="notes", text=body["text"].strip())
+                        yield _scope_item(entry["notes_part"], "notes", slide, body)
+                        break
+        
+        for kind, part in pkg.design_parts():
+            if kind not in kinds:
+                continue
+            root = pkg.get_xml(part)
+            c_sld = root.find("p:cSld", voxooxml.NS)
+            design = {
+                "slide_number": None,
+                "slide_id": None,
+                "slide_title": c_sld.get("name", "") if c_sld is not None else "",
+            }
+            for body in voxooxml.iter_text_bodies(root):
+                yield _scope_item(part, kind, design, body)
+
+
+def _scope_item(part: str, kind: str, owner: Dict, body: Dict) -> Dict:
+    item = {"part": part, "kind": kind}
+    item.update(owner)
+    for key in ("shape_id", "shape_name", "location", "body_index"):
+        item[key] = body[key]
+    item["text"] = sanitize_text(body["text"])
+    return item
+
+
+def _scope_label(item: Dict) -> str:
+    """Where a scoped match lives, for logs: "Slide 3, shape 4 (table r2c1)"."""
+    if item["kind"] == "notes":
+        return f"Slide {item['slide_number']} notes"
+    if item["kind"] == "slide":
+        where = f"Slide {item['slide_number']}"
+    else:
+        where = f"{item['kind'].title()} '{item['slide_title'] or posixpath.basename(item['part'])}'"
+    return f"{where}, shape {item['shape_id']} ({item['location']})"
+
+
+# =============================================================================
+# REGEX GUARD
+# =============================================================================
+
+_REPEAT_OPS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+# Constructs that never backtrack into themselves (Python 3.11+)
+_NO_BACKTRACK_OPS = tuple(
+    getattr(sre_constants, name) for name in ("POSSESSIVE_REPEAT", "ATOMIC_GROUP") if hasattr(sre_constants, name)
+)
+
+
+def _only_repeats(items) -> bool:
+    """True if items are all quantified (looking through groups) and at least one is variable-length."""
+    variable = False
+    for op, av in items:
+        if op == sre_constants.SUBPATTERN:
+            if not _only_repeats(av[-1]):
+                return False
+            variable = True
+        elif op in _REPEAT_OPS:
+            variable = variable or av[0] != av[1]
+        else:
+            return False
+    return variable
+
+
+def _nested_quantifier(parsed) -> bool:
+    """
+    True if an unbounded repeat wraps a body made only of repeats.
+    
+    (a+)+, (a*)* and (\\w+\\s?)+ can split the same text between the inner
+    and outer repeat in exponentially many ways, so a near-miss makes the
+    regex engine try them all. (\\d+,)* is fine: the comma pins each split.
+    """
+    for op, av in parsed:
+        if op in _NO_BACKTRACK_OPS:
+            continue
+        if op in _REPEAT_OPS:
+            _, high, body = av
+            if high == sre_constants.MAXREPEAT and _only_repeats(body):
+                return True
+            if _nested_quantifier(body):
+                return True
+            continue
+        for value in (av if isinstance(av, (tuple, list)) else (av,)):
+            for sub in (value if isinstance(value, list) else (value,)):
+                if isinstance(sub, sre_parse.SubPattern) and _nested_quantifier(sub):
+                    return True
+    return False
+
+
+def _regex_worker(conn):
+    """Worker process: match (pattern, flags, template, text) requests until the pipe closes."""
+    conn.send(("ready", None))
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        pattern_text, flags, template, text = request
+        try:
+            pattern = re.compile(pattern_text, flags)
+            found = [
+                (m.start(), m.end(), m.expand(template) if template is not None else None)
+                for m in pattern.finditer(text)
+            ]
+        except (re.error, IndexError) as e:
+            conn.send(("error", f"Invalid replacement: {e}"))
+        else:
+            conn.send(("ok", found))
+
+
+class _RegexWorker:
+    """
+    One long-lived process that runs user regexes.
+    
+    The regex engine can't be interrupted from another thread, but a
+    process can be killed: a search that runs over budget is cancelled by
+    killing the worker, and the next search starts a fresh one. The
+    process is reused between searches, so only the first regex search
+    pays for starting it. Start-up is never counted against a budget: the
+    clock starts once the worker has reported that it is ready.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._process = None
+        self._conn = None
+    
+    def _start(self):
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(target=_regex_worker, args=(child_conn,), daemon=True)
+        self._process.start()
+        child_conn.close()
+        
+        # Spawning re-imports the app's modules, which can be slow on a cold start
+        try:
+            if not self._conn.poll(REGEX_WORKER_START_TIMEOUT):
+                raise EOFError
+            self._conn.recv()
+        except (EOFError, OSError):
+            self.stop()
+            raise RuntimeError(f"Regex search could not start: the worker process was not "
+                               f"ready within {REGEX_WORKER_START_TIMEOUT:g}s")
+    
+    def stop(self):
+        if self._process is not None:
+            self._process.kill()
+            self._process.join()
+            self._conn.close()
+        self._process = None
+        self._conn = None
+    
+    def run(self, pattern, template: Optional[str], text: str, timeout: float):
+        """
+        Match pattern against text in the worker, giving up after timeout seconds.
+        
+        Returns:
+            (matches or None, seconds spent matching) - the time to start
+            the worker is not included
+        
+        Raises:
+            ValueError: If the replacement template is invalid
+            RuntimeError: If the worker process could not be started
+        """
+        with self._lock:
+            if self._process is None or not self._process.is_alive():
+                self.stop()
+                self._start()
+            started = time.perf_counter()
+            try:
+                self._conn.send((pattern.pattern, pattern.flags, template, text))
+                if not self._conn.poll(timeout):
+                    self.stop()
+                    return None, time.perf_counter() - started
+                status, value = self._conn.recv()
+            except BaseException:
+                # Pipe state unknown (interrupted mid-request) - start clean next time
+                self.stop()
+                raise
+        elapsed = time.perf_counter() - started
+        if status == "error":
+            raise ValueError(value)
+        return value, elapsed
+
+
+_regex_worker_process = _RegexWorker()
+
+
+class _Matcher:
+    """
+    Finds a search pattern's matches, one slide's text at a time.
+    
+    Literal searches run in-process. Regex searches (use_regex) run in the
+    regex worker process, with REGEX_SLIDE_BUDGET seconds per slide and
+    REGEX_JOB_BUDGET seconds for the whole find/replace job; going over
+    either cancels the job with an error naming the slide. Nothing has
+    been written at that point (replacements are only written after the
+    whole deck has been scanned, or saved at the end through COM).
+    """
+    
+    def __init__(self, pattern, use_regex: bool, template: Optional[str] = None):
+        self.pattern = pattern
+        self.guarded = use_regex
+        self.template = template
+        self.spent = 0.0
+    
+    def scan(self, text: str, label: str) -> List[Tuple[int, int, Optional[str]]]:
+        """
+        [(start, end, replacement), ...] for each match in text (replacement
+        is None without a template).
+        
+        Args:
+            text: Notes (or other) text to search
+            label: Where text comes from, for errors ("Slide 12")
+        """
+        if not self.guarded:
+            try:
+                return [
+                    (m.start(), m.end(), m.expand(self.template) if self.template is not None else None)
+                    for m in self.pattern.finditer(text)
+                ]
+            except (re.error, IndexError) as e:
+                raise ValueError(f"Invalid replacement: {e}")
+        
+        remaining = REGEX_JOB_BUDGET - self.spent
+        timeout = min(REGEX_SLIDE_BUDGET, remaining)
+        found, elapsed = _regex_worker_process.run(self.pattern, self.template, text, max(timeout, 0))
+        self.spent += elapsed
+        
+        if found is None:
+            if timeout < REGEX_SLIDE_BUDGET:
+                raise RuntimeError(f"Regex search cancelled at {label}: the search took more than "
+                                   f"{REGEX_JOB_BUDGET:g}s in total - simplify the pattern")
+            raise RuntimeError(f"Regex search cancelled at {label}: the pattern took more than "
+                               f"{REGEX_SLIDE_BUDGET:g}s on this slide - simplify the pattern")
+        return found
+
+
+# =============================================================================
+# LEXICON (multi-term matcher)
+# =============================================================================
+
+def _trie_pattern(terms: List[str]) -> str:
+    """
+    One regex matching any of terms, built as a trie of the terms.
+    
+    Alternatives are grouped by shared prefix, so at each position the
+    regex engine only follows branches that match the next character,
+    instead of trying every term in turn. A node that ends a term makes
+    its continuation optional (greedy), so the longest term matching at a
+    position wins.
+    
+    The end of each term is marked by an empty group named t<index into
+    terms>, so match.lastgroup tells which term matched. (Re-keying the
+    matched text is not reliable: IGNORECASE folds some characters, such
+    as the long s and the Kelvin sign, that str.lower() leaves alone.)
+    """
+    trie = {}
+    for index, term in enumerate(terms):
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = index  # end of term
+    
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        end = f"(?P<t{node['']}>)" if "" in node else ""
+        if not branches:
+            return end
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            return "(?:" + body + "|" + end + ")"
+        return body
+    
+    return build(trie)
+
+
+class Lexicon:
+    """
+    A list of (search, replace) terms compiled into a single matcher.
+    
+    apply() replaces every term in one left-to-right pass: at each position
+    the longest matching term wins, and replaced text is never matched
+    again by other terms. Terms are literal text, and so are replacements
+    (no regex groups or backslash escapes).
+    
+    When a search term appears more than once (ignoring case, unless
+    case_sensitive), the last entry wins.
+    
+    Example:
+        lexicon = Lexicon([("SQL", "sequel"), ("SQL Server", "sequel server")])
+        lexicon.apply("SQL Server and SQL")
+        # -> ("sequel server and sequel", {"SQL Server": 1, "SQL": 1})
+    """
+    
+    def __init__(self, replacements: List[Tuple[str, str]], case_sensitive: bool = False):
+        self.case_sensitive = case_sensitive
+        
+        # normalized search term -> (search term as given, replacement)
+        self._terms = {}
+        for search_term, replace_term in replacements:
+            if search_term:
+                self._terms[self._key(search_term)] = (search_term, replace_term)
+        
+        if self._terms:
+            flags = 0 if case_sensitive else re.IGNORECASE
+            self._entries = list(self._terms.values())
+            self.pattern = re.compile(_trie_pattern(list(self._terms)), flags)
+        else:
+            self.pattern = None
+    
+    def __len__(self) -> int:
+        return len(self._terms)
+    
+    def _key(self, text: str) -> str:
+        return text if self.case_sensitive else text.lower()
+    
+    @property
+    def terms(self) -> List[str]:
+        """Search terms, as given."""
+        return [search_term for search_term, _ in self._terms.values()]
+    
+    def matches(self, text: str) -> List[Tuple[int, int, str, str]]:
+        """
+        Every term occurrence in text, left to right.
+        
+        Returns:
+            [(start, end, search_term, replace_term), ...]
+        """
+        if self.pattern is None or not text:
+            return []
+        found = []
+        for match in self.pattern.finditer(text):
+            search_term, replace_term = self._entries[int(match.lastgroup[1:])]
+            found.append((match.start(), match.end(), search_term, replace_term))
+        return found
+    
+    def apply(self, text: str) -> Tuple[str, Dict[str, int]]:
+        """
+        Replace every term in text in a single pass.
+        
+        Returns:
+            (new_text, {search_term: replacements made}) - terms with no
+            match are left out of the counts
+        """
+        counts = {}
+        matches = self.matches(text)
+        if not matches:
+            return text, counts
+        
+        for _, _, search_term, _ in matches:
+            counts[search_term] = counts.get(search_term, 0) + 1
+        return _apply_edits(text, [(start, end, new) for start, end, _, new in matches]), counts
+
+
+_lexicon_cache = {}
+_lexicon_lock = threading.Lock()
+
+
+def _read_lexicon_file(path: str) -> List[Tuple[str, str]]:
+    """
+    (search, replace) pairs from a lexicon file.
+    
+    .csv files have two columns; any other file has one "search<TAB>replace"
+    entry per line. Blank lines and lines starting with # are skipped.
+    """
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if Path(path).suffix.lower() == '.csv':
+            rows = csv.reader(f)
+        else:
+            rows = (line.rstrip('\r\n').split('\t') for line in f)
+        
+        entries = []
+        for line_num, row in enumerate(rows, start=1):
+            if not row or not "".join(row).strip() or row[0].lstrip().startswith('#'):
+                continue
+            if len(row) != 2 or not row[0]:
+                raise ValueError(f"{os.path.basename(path)} line {line_num}: expected search and replacement")
+            entries.append((row[0], row[1]))
+    
+    return entries
+
+
+def load_lexicon(path: str, case_sensitive: bool = False) -> Lexicon:
+    """
+    Load and compile a lexicon file (see _read_lexicon_file for the format).
+    
+    Compiled lexicons are cached by path; the file is re-read only when its
+    size or modification time changes.
+    
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: On a malformed line
+    """
+    key = (os.path.normcase(os.path.abspath(path)), case_sensitive)
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    
+    with _lexicon_lock:
+        cached = _lexicon_cache.get(key)
+        if cached and cached[0] == stamp:
+            return cached[1]
+    
+    lexicon = Lexicon(_read_lexicon_file(path), case_sensitive)
+    
+    with _lexicon_lock:
+        _lexicon_cache.pop(key, None)
+        _lexicon_cache[key] = (stamp, lexicon)
+        while len(_lexicon_cache) > LEXICON_CACHE_SIZE:
+            _lexicon_cache.pop(next(iter(_lexicon_cache)))
+    
+    return lexicon
+
+
 # =============================================================================
 # FIND FUNCTIONS
 # =============================================================================
 
 def find_in_notes(pptx_path: str, search_term: str,
                   case_sensitive: bool = False, use_regex: bool = False,
+                  scope: str = "notes",
                   log_callback: Callable = None) -> List[Dict]:
     """
     Find all occurrences of search term in speaker notes.
@@ -160,6 +784,7 @@ def find_in_notes(pptx_path: str, search_term: str,
         search_term: Text to search for
         case_sensitive: Whether to match case (default: False)
         use_regex: Whether to treat search_term as regex (default: False)
+        scope: "notes" (default), "slides", "masters" or "all"
         log_callback: Optional function for progress logging
     
     Returns:
@@ -170,13 +795,23 @@ def find_in_notes(pptx_path: str, search_term: str,
                 "slide_title": "Configuration",
                 "match_count": 2,
                 "matches": [
-                    {"start": 45, "end": 54, "context": "...the Acme Corp system..."},
-                    {"start": 120, "end": 129, "context": "...contact Acme Corp for..."}
+                    {"start": 45, "end": 54, "matched_text": "Acme Corp",
+                     "context": "...the Acme Corp system..."},
+                    {"start": 120, "end": 129, "matched_text": "Acme Corp",
+                     "context": "...contact Acme Corp for..."}
                 ],
                 "notes_preview": "First 200 chars of notes..."
             },
             ...
         ]
+        With a scope other than "notes", there is one entry per matching
+        text body, also carrying part, kind, slide_id, shape_id,
+        shape_name and location (see _iter_scope_text()); slide_number
+        is None for layouts and masters.
+    
+    .pptx/.pptm decks are searched in the notes XML (cached by voxdeck, so
+    repeated searches of an unchanged deck only run the regex); legacy
+    formats go through PowerPoint (COM) and only support the notes scope.
     """
     def _log(msg):
         if log_callback:
@@ -184,30 +819,51 @@ def find_in_notes(pptx_path: str, search_term: str,
         else:
             log(msg)
     
+    matcher = _Matcher(_build_pattern(search_term, case_sensitive, use_regex), use_regex)
+    
+    if _scoped(pptx_path, scope):
+        try:
+            results = []
+            for item in _iter_scope_text(pptx_path, scope):
+                if not item["text"]:
+                    continue
+                match_details = _match_details(matcher.scan(item["text"], _scope_label(item)), item["text"])
+                if match_details:
+                    result = _find_result(item["slide_number"], item["slide_title"], item["text"], match_details)
+                    result.update((key, item[key]) for key in
+                                  ("part", "kind", "slide_id", "shape_id", "shape_name", "location"))
+                    results.append(result)
+        except Exception as e:
+            raise RuntimeError(f"Search failed: {e}")
+        
+        total_matches = sum(r["match_count"] for r in results)
+        _log(f"Found {total_matches} match(es) in {len(results)} text box(es) for: {search_term}")
+        return results
+    
+    if voxooxml.is_ooxml_package(pptx_path):
+        try:
+            results = []
+            for slide, title, notes_text in _iter_ooxml_notes(pptx_path):
+                if not notes_text:
+                    continue
+                match_details = _match_details(matcher.scan(notes_text, f"Slide {slide['slide_number']}"), notes_text)
+                if match_details:
+                    results.append(_find_result(slide["slide_number"], title, notes_text, match_details))
+        except Exception as e:
+            raise RuntimeError(f"Search failed: {e}")
+        
+        total_matches = sum(r["match_count"] for r in results)
+        _log(f"Found {total_matches} match(es) across {len(results)} slide(s) for: {search_term}")
+        return results
+    
     if not HAS_COM:
         raise RuntimeError("Windows COM API not available")
     
-    if not search_term:
-        raise ValueError("Search term cannot be empty")
-    
     pptx_path = get_short_path(str(Path(pptx_path).resolve()))
     
     if not os.path.isfile(pptx_path):
         raise FileNotFoundError(f"PowerPoint file not found: {pptx_path}")
     
-    # Build regex pattern
-    if use_regex:
-        try:
-            flags = 0 if case_sensitive else re.IGNORECASE
-            pattern = re.compile(search_term, flags)
-        except re.error as e:
-            raise ValueError(f"Invalid regex pattern: {e}")
-    else:
-        # Escape special regex chars for literal search
-        escaped = re.escape(search_term)
-        flags = 0 if case_sensitive else re.IGNORECASE
-        pattern = re.compile(escaped, flags)
-    
     results = []
     
     app = None
@@ -232,39 +888,14 @@ def find_in_notes(pptx_path: str, search_term: str,
                 continue
             
             # Find all matches
-            matches = list(pattern.finditer(notes_text))
+            match_details = _match_details(matcher.scan(notes_text, f"Slide {i}"), notes_text)
             
-            if matches:
+            if match_details:
                 title = sanitize_text(_get_slide_title(pres, i))
+                results.append(_find_result(i, title, notes_text, match_details))
                 
-                match_details = []
-                for m in matches:
-                    # Build context snippet (50 chars before/after)
-                    start = max(0, m.start() - 50)
-                    end = min(len(notes_text), m.end() + 50)
-                    context = notes_text[start:end]
-                    if start > 0:
-                        context = "..." + context
-                    if end < len(notes_text):
-                        context = context + "..."
-                    
-                    match_details.append({
-                        "start": m.start(),
-                        "end": m.end(),
-                        "matched_text": m.group(),
-                        "context": context
-                    })
-                
-                results.append({
-                    "slide_number": i,
-                    "slide_title": title,
-                    "match_count": len(matches),
-                    "matches": match_details,
-                    "notes_preview": notes_text[:200] + ("..." if len(notes_text) > 200 else "")
-                })
-                
-                total_matches += len(matches)
-                _log(f"  Slide {i}: {len(matches)} match(es)")
+                total_matches += len(match_details)
+                _log(f"  Slide {i}: {len(match_details)} match(es)")
         
         _log(f"Found {total_matches} match(es) across {len(results)} slide(s)")
         
@@ -287,12 +918,60 @@ def find_in_notes(pptx_path: str, search_term: str,
                 pass
 
 
+def find_in_library(index_path: str, search_term: str, folders: List[str] = None,
+                    update: bool = False, limit: int = voxindex.DEFAULT_SEARCH_LIMIT,
+                    log_callback: Callable = None) -> List[Dict]:
+    """
+    Find which decks of a library mention search_term, from the full-text index.
+    
+    Searches slide titles, slide text and notes of every deck in the
+    indexed folders (see voxindex) without opening any deck. Matching is
+    by whole words, ignoring case and accents.
+    
+    Args:
+        index_path: Library index database (created if missing)
+        search_term: Text to search for (matched as a phrase)
+        folders: Optional folders to add to the index before searching
+        update: Re-scan the indexed folders first (only changed decks are
+            read); implied when folders are given
+        limit: Maximum number of slides returned
+        log_callback: Optional function for progress logging
+    
+    Returns:
+        [
+            {"deck": "S:/Training/Onboarding.pptx", "slide_number": 4, "slide_id": 259,
+             "slide_title": "Our partners", "snippet": "...with [Acme] [Corp] on..."},
+            ...
+        ]
+    """
+    def _log(msg):
+        if log_callback:
+            log_callback(msg)
+        else:
+            log(msg)
+    
+    index = voxindex.LibraryIndex(index_path)
+    try:
+        for folder in folders or ():
+            index.add_folder(folder)
+        if update or folders:
+            index.update(log_callback=log_callback)
+        results = index.search(search_term, limit)
+    finally:
+        index.close()
+    
+    decks = {r["deck"] for r in results}
+    _log(f"Found '{search_term}' on {len(results)} slide(s) in {len(decks)} deck(s)")
+    return results
+
+
 # =============================================================================
 # REPLACE FUNCTIONS
 # =============================================================================
 
 def preview_replace(pptx_path: str, search_term: str, replace_term: str,
                     case_sensitive: bool = False, use_regex: bool = False,
+                    scope: str = "notes",
                     log_callback: Callable = None) -> List[Dict]:
     """
     Preview what replacements would be made without applying them.
@@ -317,6 +996,51 @@ def preview_replace(pptx_path: str, search_term: str, replace_term: str,
             },
             ...
         ]
+        (the slides of plan_replace(), which also carry hashes and spans)
+    """
+    plan = plan_replace(pptx_path, search_term, replace_term, case_sensitive, use_regex, scope, log_callback)
+    return plan["slides"]
+
+
+def plan_replace(pptx_path: str, search_term: str, replace_term: str,
+                 case_sensitive: bool = False, use_regex: bool = False,
+                 scope: str = "notes",
+                 log_callback: Callable = None) -> Dict:
+    """
+    Scan the deck once and compute every replacement, without applying it.
+    
+    The plan can be shown as a preview and then handed to
+    apply_replace_plan(), which writes exactly the previewed text without
+    scanning the deck again.
+    
+    Returns:
+        {
+            "pptx_path": "C:/.../Training.pptx",
+            "signature": (mtime_ns, size, quick_hash),  # deck file when planned
+            "search_term": "Acme Corp", "replace_term": "Acme Industries",
+            "case_sensitive": False, "use_regex": False,
+            "total_replacements": 5,
+            "slides": [
+                {
+                    "slide_number": 3,
+                    "slide_id": 258,            # None for legacy decks
+                    "slide_title": "Configuration",
+                    "match_count": 2,
+                    "spans": [(45, 54), (120, 129)],   # in original_notes
+                    "original_hash": "9f86d081884c7d65",
+                    "original_notes": "...original text...",
+                    "preview_notes": "...text after replacement..."
+                },
+                ...
+            ]
+        }
+    
+    With a scope other than "notes" (see find_in_notes()), "slides" has
+    one entry per matching text body, tagged as in _iter_scope_text();
+    original_notes/preview_notes then hold that text body's text.
+    
+    .pptx/.pptm decks are read from the notes XML; legacy formats go
+    through PowerPoint (COM).
     """
     def _log(msg):
         if log_callback:
@@ -324,30 +1048,94 @@ def preview_replace(pptx_path: str, search_term: str, replace_term: str,
         else:
             log(msg)
     
-    if not HAS_COM:
-        raise RuntimeError("Windows COM API not available")
-    
-    if not search_term:
-        raise ValueError("Search term cannot be empty")
-    
-    pptx_path = get_short_path(str(Path(pptx_path).resolve()))
+    matcher = _Matcher(_build_pattern(search_term, case_sensitive, use_regex), use_regex, replace_term)
+    pptx_path = str(Path(pptx_path).resolve())
     
     if not os.path.isfile(pptx_path):
         raise FileNotFoundError(f"PowerPoint file not found: {pptx_path}")
     
-    # Build regex pattern
-    if use_regex:
+    plan = {
+        "pptx_path": pptx_path,
+        "signature": voxdeck.deck_signature(pptx_path),
+        "search_term": search_term,
+        "replace_term": replace_term,
+        "case_sensitive": case_sensitive,
+        "use_regex": use_regex,
+        "scope": scope,
+        "total_replacements": 0,
+        "slides": [],
+    }
+    
+    _log(f"Previewing replacement: '{search_term}' -> '{replace_term}'")
+    
+    if _scoped(pptx_path, scope):
         try:
-            flags = 0 if case_sensitive else re.IGNORECASE
-            pattern = re.compile(search_term, flags)
-        except re.error as e:
-            raise ValueError(f"Invalid regex pattern: {e}")
+            for item in _iter_scope_text(pptx_path, scope):
+                if not item["text"]:
+                    continue
+                tags = {key: item[key] for key in
+                        ("part", "kind", "shape_id", "shape_name", "location", "body_index")}
+                _plan_slide(plan, matcher.scan(item["text"], _scope_label(item)), item["slide_number"],
+                            item["slide_id"], item["slide_title"], item["text"], **tags)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Preview failed: {e}")
+    elif voxooxml.is_ooxml_package(pptx_path):
+        try:
+            for slide, title, notes_text in _iter_ooxml_notes(pptx_path):
+                if not notes_text:
+                    continue
+                found = matcher.scan(notes_text, f"Slide {slide['slide_number']}")
+                _plan_slide(plan, found, slide["slide_number"], slide["slide_id"], title, notes_text)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Preview failed: {e}")
     else:
-        escaped = re.escape(search_term)
-        flags = 0 if case_sensitive else re.IGNORECASE
-        pattern = re.compile(escaped, flags)
+        _plan_replace_com(plan, matcher)
     
-    results = []
+    where = "slide(s)" if scope == "notes" else "text box(es)"
+    _log(f"Preview: {plan['total_replacements']} replacement(s) across {len(plan['slides'])} {where}")
+    
+    return plan
+
+
+def _plan_slide(plan: Dict, found: List[Tuple[int, int, str]], slide_num: int, slide_id: Optional[int],
+                title, notes_text: str, **tags):
+    """
+    Add one slide's replacement to the plan, if its notes match.
+    
+    found comes from _Matcher.scan() with the replace term as template:
+    the replacement text per match (group references expanded), so the
+    writer can splice each one into the runs it covers. tags mark where
+    the text lives in scoped plans.
+    """
+    if not found:
+        return
+    
+    spans = [(start, end) for start, end, _ in found]
+    replacements = [new for _, _, new in found]
+    new_text = _apply_edits(notes_text, found)
+    
+    plan["slides"].append(dict(tags, **{
+        "slide_number": slide_num,
+        "slide_id": slide_id,
+        "slide_title": title() if callable(title) else title,
+        "match_count": len(spans),
+        "spans": spans,
+        "replacements": replacements,
+        "original_hash": _text_hash(notes_text),
+        "original_notes": notes_text,
+        "preview_notes": new_text,
+    }))
+    plan["total_replacements"] += len(spans)
+
+
+def _plan_replace_com(plan: Dict, matcher: "_Matcher"):
+    """plan_replace() through PowerPoint COM (legacy decks)."""
+    if not HAS_COM:
+        raise RuntimeError("Windows COM API not available")
     
     app = None
     pres = None
@@ -357,45 +1145,267 @@ def preview_replace(pptx_path: str, search_term: str, replace_term: str,
         app = Dispatch("PowerPoint.Application")
         app.Visible = True
         
-        pres = open_presentation_with_retry(app, pptx_path, read_only=True)
-        slide_count = pres.Slides.Count
-        
-        _log(f"Previewing replacement: '{search_term}' -> '{replace_term}'")
+        pres = open_presentation_with_retry(app, get_short_path(plan["pptx_path"]), read_only=True)
         
-        total_replacements = 0
-        
-        for i in range(1, slide_count + 1):
+        for i in range(1, pres.Slides.Count + 1):
             notes_text = sanitize_text(_get_slide_notes(pres, i))
-            
             if not notes_text:
                 continue
-            
-            # Check for matches
-            matches = list(pattern.finditer(notes_text))
-            
-            if matches:
-                title = sanitize_text(_get_slide_title(pres, i))
+            # Title is only looked up for slides that match
+            _plan_slide(plan, matcher.scan(notes_text, f"Slide {i}"), i, None,
+                        lambda: sanitize_text(_get_slide_title(pres, i)), notes_text)
+        
+    except ValueError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"Preview failed: {e}")
+    
+    finally:
+        # Always clean up COM objects
+        if pres is not None:
+            try:
+                pres.Close()
+            except:
+                pass
+        if app is not None:
+            try:
+                app.Quit()
+            except:
+                pass
+
+
+def apply_replace_plan(plan: Dict, slides_to_apply: List[int] = None,
+                       log_callback: Callable = None) -> Dict:
+    """
+    Write the replacements of a plan from plan_replace().
+    
+    Nothing is searched again. If the deck file is unchanged since the plan
+    was made, the planned slides are written straight away; otherwise each
+    slide's current notes are checked against the planned hash first, and
+    slides edited in the meantime are skipped and reported in "errors".
+    
+    Args:
+        plan: Plan from plan_replace()
+        slides_to_apply: Optional list of slide numbers to apply (default: all)
+        log_callback: Optional function for progress logging
+    
+    Returns:
+        Result dict (as replace_in_notes()):
+        {
+            "slides_modified": [3, 7, 12],
+            "total_replacements": 5,
+            "errors": []
+        }
+        Scoped plans also report "parts_modified" (part names written).
+    """
+    def _log(msg):
+        if log_callback:
+            log_callback(msg)
+        else:
+            log(msg)
+    
+    pptx_path = plan["pptx_path"]
+    if not os.path.isfile(pptx_path):
+        raise FileNotFoundError(f"PowerPoint file not found: {pptx_path}")
+    
+    slides = [
+        slide for slide in plan["slides"]
+        if slides_to_apply is None or slide["slide_number"] in slides_to_apply
+    ]
+    result = {"slides_modified": [], "total_replacements": 0, "errors": []}
+    
+    if not slides:
+        _log("No replacements to apply")
+        return result
+    
+    verify = tuple(voxdeck.deck_signature(pptx_path)) != tuple(plan["signature"])
+    if verify:
+        _log("Deck changed since preview - checking each slide's notes")
+    
+    _log(f"Replacing: '{plan['search_term']}' -> '{plan['replace_term']}'")
+    
+    if plan.get("scope", "notes") != "notes":
+        try:
+            _apply_plan_parts(pptx_path, slides, verify, result, _log)
+        except Exception as e:
+            raise RuntimeError(f"Replace failed: {e}")
+    elif voxooxml.is_ooxml_package(pptx_path):
+        try:
+            _apply_plan_ooxml(pptx_path, slides, verify, result, _log)
+        except Exception as e:
+            raise RuntimeError(f"Replace failed: {e}")
+    else:
+        _apply_plan_com(pptx_path, slides, result, _log)
+    
+    _log(f"Completed: {result['total_replacements']} replacement(s) across {len(result['slides_modified'])} slide(s)")
+    
+    return result
+
+
+def _apply_plan_ooxml(pptx_path: str, slides: List[Dict], verify: bool, result: Dict, _log: Callable):
+    """apply_replace_plan() for .pptx/.pptm: splice the replacements into each notesSlide's runs."""
+    updates = {}
+    
+    with voxooxml.DeckPackage(pptx_path) as pkg:
+        for slide in slides:
+            slide_num = slide["slide_number"]
+            try:
+                if slide["slide_id"] is not None:
+                    entry = pkg.slide_index.by_slide_id(slide["slide_id"])
+                else:
+                    entry = pkg.slide_index.at(slide_num)
+                if entry is None or not entry["notes_part"]:
+                    raise ValueError("slide or notes page no longer in deck")
                 
-                # Perform replacement (preview only)
-                new_text = pattern.sub(replace_term, notes_text)
+                notes_xml = pkg.read_part(entry["notes_part"])
+                if verify:
+                    current = sanitize_text(voxooxml.get_notes_text(ET.fromstring(notes_xml)))
+                    if _text_hash(current) != slide["original_hash"]:
+                        raise ValueError("notes changed since preview")
                 
-                results.append({
-                    "slide_number": i,
-                    "slide_title": title,
-                    "match_count": len(matches),
-                    "original_notes": notes_text,
-                    "preview_notes": new_text
-                })
+                edits = [(start, end, new) for (start, end), new in zip(slide["spans"], slide["replacements"])]
+                updates[entry["notes_part"]], reason = _edit_notes_xml(
+                    notes_xml, edits, slide["original_notes"], slide["preview_notes"]
+                )
+                result["slides_modified"].append(slide_num)
+                result["total_replacements"] += slide["match_count"]
+                _log(f"  Slide {slide_num}: {slide['match_count']} replacement(s)"
+                     + (f" (whole notes rewritten: {reason})" if reason else ""))
                 
-                total_replacements += len(matches)
-                _log(f"  Slide {i}: {len(matches)} replacement(s)")
+            except Exception as e:
+                result["errors"].append(f"Slide {slide_num}: {e}")
+                _log(f"  Slide {slide_num}: Skipped - {e}")
+    
+    if updates:
+        voxooxml.write_package(pptx_path, pptx_path, updates)
+
+
+def _apply_plan_parts(pptx_path: str, items: List[Dict], verify: bool, result: Dict,
+                      _log: Callable) -> List[Dict]:
+    """
+    apply_replace_plan() for scoped plans: splice each text body's
+    replacements into its part (run by run), writing every part once.
+    
+    Returns:
+        The plan entries that were written
+    """
+    result.setdefault("parts_modified", [])
+    by_part = {}
+    for item in items:
+        by_part.setdefault(item["part"], []).append(item)
+    
+    applied = []
+    updates = {}
+    
+    with voxooxml.DeckPackage(pptx_path) as pkg:
+        for part, part_items in by_part.items():
+            xml = pkg.read_part(part) if pkg.has_part(part) else None
+            
+            for item in part_items:
+                label = _scope_label(item)
+                try:
+                    if xml is None:
+                        raise ValueError("part no longer in deck")
+                    edits = [(start, end, new) for (start, end), new in zip(item["spans"], item["replacements"])]
+                    
+                    if item["kind"] == "notes":
+                        if verify:
+                            current = sanitize_text(voxooxml.get_notes_text(ET.fromstring(xml)))
+                            if _text_hash(current) != item["original_hash"]:
+                                raise ValueError("notes changed since preview")
+                        xml, reason = _edit_notes_xml(xml, edits, item["original_notes"], item["preview_notes"])
+                    else:
+                        # Checks the text body still holds the planned text
+                        xml = voxooxml.replace_text_spans(xml, item["body_index"], edits, item["original_notes"])
+                        reason = None
+                    
+                    updates[part] = xml
+                    applied.append(item)
+                    result["total_replacements"] += item["match_count"]
+                    if item["slide_number"] is not None and item["slide_number"] not in result["slides_modified"]:
+                        result["slides_modified"].append(item["slide_number"])
+                    _log(f"  {label}: {item['match_count']} replacement(s)"
+                         + (f" (whole notes rewritten: {reason})" if reason else ""))
+                    
+                except Exception as e:
+                    result["errors"].append(f"{label}: {e}")
+                    _log(f"  {label}: Skipped - {e}")
+    
+    result["parts_modified"].extend(updates)
+    if updates:
+        voxooxml.write_package(pptx_path, pptx_path, updates)
+    return applied
+
+
+def _batch_replace_ooxml(pptx_path: str, lexicon: Lexicon, result: Dict, _log: Callable):
+    """batch_replace() for .pptx/.pptm: notes from the deck cache, one package write."""
+    notes = list(_iter_ooxml_notes(pptx_path))
+    _log(f"Batch replacing {len(lexicon)} term(s) across {len(notes)} slides...")
+    
+    updates = {}
+    
+    with voxooxml.DeckPackage(pptx_path) as pkg:
+        for slide, _, notes_text in notes:
+            matches = lexicon.matches(notes_text)
+            if not matches:
+                continue
+            
+            slide_num = slide["slide_number"]
+            edits = [(start, end, replace_term) for start, end, _, replace_term in matches]
+            try:
+                entry = pkg.slide_index.by_slide_id(slide["slide_id"])
+                notes_xml = pkg.read_part(entry["notes_part"])
+                new_text = _apply_edits(notes_text, edits)
+                updates[entry["notes_part"]], reason = _edit_notes_xml(notes_xml, edits, notes_text, new_text)
+            except Exception as e:
+                result["errors"].append(f"Slide {slide_num}: {e}")
+                _log(f"  Slide {slide_num}: Error - {e}")
+                continue
+            
+            for _, _, search_term, _ in matches:
+                result["replacements_by_term"][search_term] += 1
+                result["total_replacements"] += 1
+            result["slides_modified"].append(slide_num)
+            _log(f"  Slide {slide_num}: Modified" + (f" (whole notes rewritten: {reason})" if reason else ""))
+    
+    if updates:
+        voxooxml.write_package(pptx_path, pptx_path, updates)
+
+
+def _apply_plan_com(pptx_path: str, slides: List[Dict], result: Dict, _log: Callable):
+    """apply_replace_plan() through PowerPoint COM (legacy decks); always verifies."""
+    if not HAS_COM:
+        raise RuntimeError("Windows COM API not available")
+    
+    app = None
+    pres = None
+    
+    try:
+        gencache.EnsureDispatch("PowerPoint.Application")
+        app = Dispatch("PowerPoint.Application")
+        app.Visible = True
+        
+        # Open for editing (not read-only) with retry
+        pres = open_presentation_with_retry(app, get_short_path(pptx_path), read_only=False)
         
-        _log(f"Preview: {total_replacements} replacement(s) across {len(results)} slide(s)")
+        for slide in slides:
+            slide_num = slide["slide_number"]
+            
+            if _text_hash(sanitize_text(_get_slide_notes(pres, slide_num))) != slide["original_hash"]:
+                result["errors"].append(f"Slide {slide_num}: notes changed since preview")
+                _log(f"  Slide {slide_num}: Skipped - notes changed since preview")
+            elif _set_slide_notes(pres, slide_num, slide["preview_notes"]):
+                result["slides_modified"].append(slide_num)
+                result["total_replacements"] += slide["match_count"]
+                _log(f"  Slide {slide_num}: {slide['match_count']} replacement(s)")
+            else:
+                result["errors"].append(f"Slide {slide_num}: Failed to write notes")
+                _log(f"  Slide {slide_num}: Error writing notes")
         
-        return results
+        pres.Save()
         
     except Exception as e:
-        raise RuntimeError(f"Preview failed: {e}")
+        raise RuntimeError(f"Replace failed: {e}")
     
     finally:
         # Always clean up COM objects
@@ -414,6 +1424,7 @@ def preview_replace(pptx_path: str, search_term: str, replace_term: str,
 def replace_in_notes(pptx_path: str, search_term: str, replace_term: str,
                      case_sensitive: bool = False, use_regex: bool = False,
                      slides_to_apply: List[int] = None,
+                     scope: str = "notes",
                      log_callback: Callable = None) -> Dict:
     """
     Perform find/replace across speaker notes.
@@ -425,6 +1436,8 @@ def replace_in_notes(pptx_path: str, search_term: str, replace_term: str,
         case_sensitive: Whether to match case (default: False)
         use_regex: Whether to treat search_term as regex (default: False)
         slides_to_apply: Optional list of slide numbers to apply (default: all)
+        scope: "notes" (default), "slides", "masters" or "all"
+            (see find_in_notes())
         log_callback: Optional function for progress logging
     
     Returns:
@@ -441,29 +1454,21 @@ def replace_in_notes(pptx_path: str, search_term: str, replace_term: str,
         else:
             log(msg)
     
+    if _scoped(pptx_path, scope) or voxooxml.is_ooxml_package(pptx_path):
+        # Same scan as Preview, then write the planned text
+        plan = plan_replace(pptx_path, search_term, replace_term, case_sensitive, use_regex, scope, log_callback)
+        return apply_replace_plan(plan, slides_to_apply, log_callback)
+    
     if not HAS_COM:
         raise RuntimeError("Windows COM API not available")
     
-    if not search_term:
-        raise ValueError("Search term cannot be empty")
+    matcher = _Matcher(_build_pattern(search_term, case_sensitive, use_regex), use_regex, replace_term)
     
     pptx_path = get_short_path(str(Path(pptx_path).resolve()))
     
     if not os.path.isfile(pptx_path):
         raise FileNotFoundError(f"PowerPoint file not found: {pptx_path}")
     
-    # Build regex pattern
-    if use_regex:
-        try:
-            flags = 0 if case_sensitive else re.IGNORECASE
-            pattern = re.compile(search_term, flags)
-        except re.error as e:
-            raise ValueError(f"Invalid regex pattern: {e}")
-    else:
-        escaped = re.escape(search_term)
-        flags = 0 if case_sensitive else re.IGNORECASE
-        pattern = re.compile(escaped, flags)
-    
     result = {
         "slides_modified": [],
         "total_replacements": 0,
@@ -495,11 +1500,11 @@ def replace_in_notes(pptx_path: str, search_term: str, replace_term: str,
                 continue
             
             # Check for matches
-            matches = list(pattern.finditer(notes_text))
+            matches = matcher.scan(notes_text, f"Slide {i}")
             
             if matches:
                 # Perform replacement
-                new_text = pattern.sub(replace_term, notes_text)
+                new_text = _apply_edits(notes_text, matches)
                 
                 # Write back
                 if _set_slide_notes(pres, i, new_text):
@@ -538,16 +1543,27 @@ def replace_in_notes(pptx_path: str, search_term: str, replace_term: str,
 # BATCH REPLACE
 # =============================================================================
 
-def batch_replace(pptx_path: str, replacements: List[Tuple[str, str]],
-                  case_sensitive: bool = False,
+def batch_replace(pptx_path: str, replacements: Union[List[Tuple[str, str]], Lexicon],
+                  case_sensitive: bool = False, scope: str = "notes",
                   log_callback: Callable = None) -> Dict:
     """
     Perform multiple find/replace operations in a single pass.
     
+    All terms are compiled into one Lexicon and each slide's notes are
+    scanned once: the longest term matching at each position wins, and
+    text produced by one replacement is never matched by another term.
+    
+    .pptx/.pptm decks are edited in the notes XML, rewriting only the runs
+    a match touches (formatting of the rest of the notes is kept); legacy
+    formats go through PowerPoint (COM).
+    
     Args:
         pptx_path: Path to PowerPoint file
-        replacements: List of (search, replace) tuples
+        replacements: List of (search, replace) tuples, or a Lexicon
+            (e.g. from load_lexicon()); a Lexicon keeps its own case setting
         case_sensitive: Whether to match case (default: False)
+        scope: "notes" (default), "slides", "masters" or "all"
+            (see find_in_notes())
         log_callback: Optional function for progress logging
     
     Returns:
@@ -573,34 +1589,42 @@ def batch_replace(pptx_path: str, replacements: List[Tuple[str, str]],
         else:
             log(msg)
     
-    if not HAS_COM:
-        raise RuntimeError("Windows COM API not available")
-    
     if not replacements:
         raise ValueError("Replacements list cannot be empty")
     
-    pptx_path = get_short_path(str(Path(pptx_path).resolve()))
-    
-    if not os.path.isfile(pptx_path):
-        raise FileNotFoundError(f"PowerPoint file not found: {pptx_path}")
-    
-    # Build patterns for all replacements
-    patterns = []
-    for search_term, replace_term in replacements:
-        if not search_term:
-            continue
-        escaped = re.escape(search_term)
-        flags = 0 if case_sensitive else re.IGNORECASE
-        pattern = re.compile(escaped, flags)
-        patterns.append((pattern, search_term, replace_term))
+    lexicon = replacements if isinstance(replacements, Lexicon) else Lexicon(replacements, case_sensitive)
     
     result = {
         "slides_modified": [],
-        "replacements_by_term": {search: 0 for search, _ in replacements},
+        "replacements_by_term": {search: 0 for search in lexicon.terms},
         "total_replacements": 0,
         "errors": []
     }
     
+    if _scoped(pptx_path, scope):
+        try:
+            _batch_replace_parts(pptx_path, lexicon, scope, result, _log)
+        except Exception as e:
+            raise RuntimeError(f"Batch replace failed: {e}")
+        _log(f"Completed: {result['total_replacements']} total replacement(s)")
+        return result
+    
+    if voxooxml.is_ooxml_package(pptx_path):
+        try:
+            _batch_replace_ooxml(pptx_path, lexicon, result, _log)
+        except Exception as e:
+            raise RuntimeError(f"Batch replace failed: {e}")
+        _log(f"Completed: {result['total_replacements']} total replacement(s)")
+        return result
+    
+    if not HAS_COM:
+        raise RuntimeError("Windows COM API not available")
+    
+    pptx_path = get_short_path(str(Path(pptx_path).resolve()))
+    
+    if not os.path.isfile(pptx_path):
+        raise FileNotFoundError(f"PowerPoint file not found: {pptx_path}")
+    
     app = None
     pres = None
     
@@ -612,7 +1636,7 @@ def batch_replace(pptx_path: str, replacements: List[Tuple[str, str]],
         pres = open_presentation_with_retry(app, pptx_path, read_only=False)
         slide_count = pres.Slides.Count
         
-        _log(f"Batch replacing {len(patterns)} term(s) across {slide_count} slides...")
+        _log(f"Batch replacing {len(lexicon)} term(s) across {slide_count} slides...")
         
         for i in range(1, slide_count + 1):
             notes_text = sanitize_text(_get_slide_notes(pres, i))
@@ -620,20 +1644,14 @@ def batch_replace(pptx_path: str, replacements: List[Tuple[str, str]],
             if not notes_text:
                 continue
             
-            modified = False
-            current_text = notes_text
-            
-            # Apply each replacement
-            for pattern, search_term, replace_term in patterns:
-                matches = list(pattern.finditer(current_text))
-                if matches:
-                    current_text = pattern.sub(replace_term, current_text)
-                    result["replacements_by_term"][search_term] += len(matches)
-                    result["total_replacements"] += len(matches)
-                    modified = True
+            # One pass over the notes for all terms
+            current_text, counts = lexicon.apply(notes_text)
+            for search_term, count in counts.items():
+                result["replacements_by_term"][search_term] += count
+                result["total_replacements"] += count
             
             # Write back if any changes
-            if modified:
+            if counts:
                 if _set_slide_notes(pres, i, current_text):
                     result["slides_modified"].append(i)
                     _log(f"  Slide {i}: Modified")
@@ -663,10 +1681,66 @@ def batch_replace(pptx_path: str, replacements: List[Tuple[str, str]],
                 pass
 
 
+def _batch_replace_parts(pptx_path: str, lexicon: Lexicon, scope: str, result: Dict, _log: Callable):
+    """batch_replace() for scopes beyond the notes: one scan, then one write per part."""
+    items = []
+    for item in _iter_scope_text(pptx_path, scope):
+        matches = lexicon.matches(item["text"])
+        if not matches:
+            continue
+        edits = [(start, end, replace_term) for start, end, _, replace_term in matches]
+        item.update({
+            "match_count": len(matches),
+            "spans": [(start, end) for start, end, _ in edits],
+            "replacements": [replace_term for _, _, replace_term in edits],
+            "terms": [search_term for _, _, search_term, _ in matches],
+            "original_hash": _text_hash(item["text"]),
+            "original_notes": item["text"],
+            "preview_notes": _apply_edits(item["text"], edits),
+        })
+        items.append(item)
+    
+    _log(f"Batch replacing {len(lexicon)} term(s) in {len(items)} matching text box(es)...")
+    
+    for item in _apply_plan_parts(pptx_path, items, False, result, _log):
+        for search_term in item["terms"]:
+            result["replacements_by_term"][search_term] += 1
+
+
 # =============================================================================
 # STATS
 # =============================================================================
 
+def _summarize_notes(notes_texts: List[str]) -> Dict:
+    """Stats dict for get_notes_stats() from each slide's notes text."""
+    stats = {
+        "total_slides": len(notes_texts),
+        "slides_with_notes": 0,
+        "slides_without_notes": 0,
+        "total_characters": 0,
+        "total_words": 0,
+        "avg_words_per_slide": 0
+    }
+    
+    for notes_text in notes_texts:
+        if notes_text and notes_text.strip():
+            stats["slides_with_notes"] += 1
+            stats["total_characters"] += len(notes_text)
+            # Simple word count (split on whitespace)
+            words = len(notes_text.split())
+            stats["total_words"] += words
+        else:
+            stats["slides_without_notes"] += 1
+    
+    # Calculate average
+    if stats["slides_with_notes"] > 0:
+        stats["avg_words_per_slide"] = round(
+            stats["total_words"] / stats["slides_with_notes"]
+        )
+    
+    return stats
+
+
 def get_notes_stats(pptx_path: str, log_callback: Callable = None) -> Dict:
     """
     Get statistics about speaker notes in a deck.
@@ -692,6 +1766,16 @@ def get_notes_stats(pptx_path: str, log_callback: Callable = None) -> Dict:
         else:
             log(msg)
     
+    if voxooxml.is_ooxml_package(pptx_path):
+        try:
+            deck = voxdeck.get_deck(pptx_path)
+            _log(f"Analyzing {deck.slide_count} slides...")
+            stats = _summarize_notes([sanitize_text(n) for n in deck.notes])
+        except Exception as e:
+            raise RuntimeError(f"Stats failed: {e}")
+        _log(f"Stats: {stats['slides_with_notes']} slides with notes, {stats['total_words']} words total")
+        return stats
+    
     if not HAS_COM:
         raise RuntimeError("Windows COM API not available")
     
@@ -700,15 +1784,6 @@ def get_notes_stats(pptx_path: str, log_callback: Callable = None) -> Dict:
     if not os.path.isfile(pptx_path):
         raise FileNotFoundError(f"PowerPoint file not found: {pptx_path}")
     
-    stats = {
-        "total_slides": 0,
-        "slides_with_notes": 0,
-        "slides_without_notes": 0,
-        "total_characters": 0,
-        "total_words": 0,
-        "avg_words_per_slide": 0
-    }
-    
     app = None
     pres = None
     
@@ -720,27 +1795,10 @@ def get_notes_stats(pptx_path: str, log_callback: Callable = None) -> Dict:
         pres = open_presentation_with_retry(app, pptx_path, read_only=True)
         slide_count = pres.Slides.Count
         
-        stats["total_slides"] = slide_count
-        
         _log(f"Analyzing {slide_count} slides...")
         
-        for i in range(1, slide_count + 1):
-            notes_text = sanitize_text(_get_slide_notes(pres, i))
-            
-            if notes_text and notes_text.strip():
-                stats["slides_with_notes"] += 1
-                stats["total_characters"] += len(notes_text)
-                # Simple word count (split on whitespace)
-                words = len(notes_text.split())
-                stats["total_words"] += words
-            else:
-                stats["slides_without_notes"] += 1
-        
-        # Calculate average
-        if stats["slides_with_notes"] > 0:
-            stats["avg_words_per_slide"] = round(
-                stats["total_words"] / stats["slides_with_notes"]
-            )
+        notes_texts = [sanitize_text(_get_slide_notes(pres, i)) for i in range(1, slide_count + 1)]
+        stats = _summarize_notes(notes_texts)
         
         _log(f"Stats: {stats['slides_with_notes']} slides with notes, {stats['total_words']} words total")
         
@@ -772,6 +1830,8 @@ def _usage():
     print()
     print("Commands:")
     print("  find <deck.pptx> <search_term>              Find matches")
+    print("  library <index.sqlite3> <search_term> [folder...]")
+    print("                                              Find decks mentioning a term")
     print("  preview <deck.pptx> <search> <replace>      Preview replacements")
     print("  replace <deck.pptx> <search> <replace>      Apply replacements")
     print("  stats <deck.pptx>                           Show notes statistics")
@@ -779,6 +1839,7 @@ def _usage():
     print("Options:")
     print("  -c, --case-sensitive    Match case exactly")
     print("  -r, --regex             Treat search as regex pattern")
+    print("  --scope=SCOPE           notes (default), slides, masters or all")
 
 
 if __name__ == "__main__":
@@ -793,6 +1854,7 @@ if __name__ == "__main__":
     # Parse options
     case_sensitive = '-c' in sys.argv or '--case-sensitive' in sys.argv
     use_regex = '-r' in sys.argv or '--regex' in sys.argv
+    scope = next((a.split('=', 1)[1] for a in sys.argv if a.startswith('--scope=')), "notes")
     
     # Remove options from argv for positional args
     args = [a for a in sys.argv[2:] if not a.startswith('-')]
@@ -803,40 +1865,52 @@ if __name__ == "__main__":
                 print("Usage: python voxreplace.py find <deck.pptx> <search_term>")
                 sys.exit(64)
             
-            results = find_in_notes(args[0], args[1], case_sensitive, use_regex)
+            results = find_in_notes(args[0], args[1], case_sensitive, use_regex, scope)
             
             if not results:
                 print("\nNo matches found.")
             else:
-                print(f"\nFound matches in {len(results)} slide(s):")
+                print(f"\nFound matches in {len(results)} {'slide(s)' if scope == 'notes' else 'text box(es)'}:")
                 for r in results:
-                    print(f"\n  Slide {r['slide_number']}: {r['slide_title'] or '(no title)'}")
+                    where = f"Slide {r['slide_number']}" if scope == "notes" else _scope_label(r)
+                    print(f"\n  {where}: {r['slide_title'] or '(no title)'}")
                     print(f"    {r['match_count']} match(es)")
                     for m in r['matches'][:3]:  # Show first 3
                         print(f"      \"{m['context']}\"")
                     if len(r['matches']) > 3:
                         print(f"      ... and {len(r['matches']) - 3} more")
                         
+        elif command == "library":
+            if len(args) < 2:
+                print("Usage: python voxreplace.py library <index.sqlite3> <search_term> [folder...]")
+                sys.exit(64)
+            
+            results = find_in_library(args[0], args[1], folders=args[2:])
+            
+            for r in results:
+                print(f"  {r['deck']} - Slide {r['slide_number']}: {r['snippet']}")
+                        
         elif command == "preview":
             if len(args) < 3:
                 print("Usage: python voxreplace.py preview <deck.pptx> <search> <replace>")
                 sys.exit(64)
             
-            results = preview_replace(args[0], args[1], args[2], case_sensitive, use_regex)
+            results = preview_replace(args[0], args[1], args[2], case_sensitive, use_regex, scope)
             
             if not results:
                 print("\nNo matches found. Nothing to replace.")
             else:
-                print(f"\nWould modify {len(results)} slide(s):")
+                print(f"\nWould modify {len(results)} {'slide(s)' if scope == 'notes' else 'text box(es)'}:")
                 for r in results:
-                    print(f"  Slide {r['slide_number']}: {r['match_count']} replacement(s)")
+                    where = f"Slide {r['slide_number']}" if scope == "notes" else _scope_label(r)
+                    print(f"  {where}: {r['match_count']} replacement(s)")
                     
         elif command == "replace":
             if len(args) < 3:
                 print("Usage: python voxreplace.py replace <deck.pptx> <search> <replace>")
                 sys.exit(64)
             
-            result = replace_in_notes(args[0], args[1], args[2], case_sensitive, use_regex)
+            result = replace_in_notes(args[0], args[1], args[2], case_sensitive, use_regex, scope=scope)
             
             print(f"\nReplaced {result['total_replacements']} occurrence(s)")
             print(f"Modified slides: {result['slides_modified']}")
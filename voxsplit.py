@@ -16,6 +16,9 @@ import re
 import shutil
 from pathlib import Path
 
+import voxdeck
+import voxooxml
+
 try:
     from win32com.client import Dispatch
     import pywintypes
@@ -125,7 +128,11 @@ def is_unnamed_section(name: str) -> bool:
 
 def get_powerpoint_sections(pptx_path: str) -> list:
     """
-    Read PowerPoint sections via COM API.
+    Read PowerPoint sections.
+    
+    .pptx packages are read directly from presentation.xml (no PowerPoint
+    needed) and cached per deck until the file changes. Anything else
+    (e.g. legacy .ppt) falls back to the COM API.
     
     Args:
         pptx_path: Path to .pptx file
@@ -137,6 +144,15 @@ def get_powerpoint_sections(pptx_path: str) -> list:
     Raises:
         RuntimeError: If COM not available or file can't be opened
     """
+    if not os.path.isfile(pptx_path):
+        raise FileNotFoundError(f"PowerPoint file not found: {pptx_path}")
+    
+    if voxooxml.is_ooxml_package(pptx_path):
+        try:
+            return voxdeck.get_deck(pptx_path).sections
+        except Exception as e:
+            raise RuntimeError(f"Failed to read sections: {e}")
+    
     if not HAS_COM:
         raise RuntimeError("Windows COM API not available (pywin32 not installed)")
     
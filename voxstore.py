@@ -0,0 +1,194 @@
+"""
+voxstore.py
+Persistent SQLite index of deck contents for VoxPrep.
+
+Remembers what VoxPrep has already extracted from a deck (titles, notes,
+sections, media map, font usage, ...) across restarts. Each deck gets one
+row holding its file signature, shared-part stamps and deck-level views,
+plus one row per slide holding the slide's part names, their change stamps
+(zip CRC32 and size) and the per-slide data as JSON.
+
+The store is optional: voxdeck only uses it once enable_store() has been
+called (the GUI points it at deckindex.sqlite3 under the app's
+LOCALAPPDATA folder).
+
+Example:
+    store = DeckStore("C:/Users/me/AppData/Local/VoxPrep/deckindex.sqlite3")
+    record = store.load("Training.pptx")
+    if record and tuple(record["signature"]) == voxdeck.deck_signature("Training.pptx"):
+        ...  # deck unchanged since last time - no need to open it
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Optional
+
+LOG_PREFIX = "[voxstore]"
+
+SCHEMA_VERSION = 2
+
+# Slide index fields stored as plain columns (everything else lives in "data")
+SLIDE_COLUMNS = (
+    "slide_number", "slide_id", "r_id",
+    "slide_part", "slide_rels_part", "notes_part", "notes_rels_part",
+    "slide_stamp", "slide_rels_stamp", "notes_stamp", "notes_rels_stamp",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS decks (
+    deck_id     INTEGER PRIMARY KEY,
+    path        TEXT NOT NULL UNIQUE,
+    mtime_ns    INTEGER NOT NULL,
+    size        INTEGER NOT NULL,
+    quick_hash  TEXT NOT NULL,
+    stamps      TEXT NOT NULL DEFAULT '{}',
+    views       TEXT NOT NULL DEFAULT '{}',
+    updated     REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS slides (
+    deck_id         INTEGER NOT NULL REFERENCES decks(deck_id) ON DELETE CASCADE,
+    slide_number    INTEGER NOT NULL,
+    slide_id        INTEGER,
+    r_id            TEXT,
+    slide_part      TEXT,
+    slide_rels_part TEXT,
+    notes_part      TEXT,
+    notes_rels_part TEXT,
+    slide_stamp       TEXT,
+    slide_rels_stamp  TEXT,
+    notes_stamp       TEXT,
+    notes_rels_stamp  TEXT,
+    data            TEXT NOT NULL DEFAULT '{}',
+    PRIMARY KEY (deck_id, slide_number)
+);
+"""
+
+
+def log(msg: str):
+    """Simple logging helper."""
+    print(f"{LOG_PREFIX} {msg}", flush=True)
+
+
+def _deck_key(pptx_path: str) -> str:
+    return os.path.normcase(str(Path(pptx_path).resolve()))
+
+
+class DeckStore:
+    """
+    SQLite-backed store of per-deck, per-slide extraction results.
+
+    One connection is shared across threads behind a lock; every save is a
+    single transaction, so a crash never leaves a half-written deck.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._migrate()
+
+    def _migrate(self):
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            # Derived data only - safe to throw away and rebuild
+            self._conn.executescript("DROP TABLE IF EXISTS slides; DROP TABLE IF EXISTS decks;")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def load(self, pptx_path: str) -> Optional[Dict]:
+        """
+        Stored record for a deck, or None if it has never been indexed.
+
+        Returns:
+            {
+                "signature": (mtime_ns, size, quick_hash),
+                "stamps": {"presentation": "...", "design": "..."},
+                "views": {"sections": [...], ...},
+                "slides": [{"slide_number": 1, "slide_id": 256, ..., "slide_stamp": "1c291ca3:2048",
+                            "data": {"title": "...", ...}}, ...]
+            }
+        """
+        key = _deck_key(pptx_path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT deck_id, mtime_ns, size, quick_hash, stamps, views FROM decks WHERE path = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            deck_id, mtime_ns, size, quick_hash, stamps, views = row
+            cols = ", ".join(SLIDE_COLUMNS)
+            slide_rows = self._conn.execute(
+                f"SELECT {cols}, data FROM slides WHERE deck_id = ? ORDER BY slide_number",
+                (deck_id,)
+            ).fetchall()
+
+        slides = []
+        for slide_row in slide_rows:
+            slide = dict(zip(SLIDE_COLUMNS, slide_row[:-1]))
+            slide["data"] = json.loads(slide_row[-1])
+            slides.append(slide)
+
+        return {
+            "signature": (mtime_ns, size, quick_hash),
+            "stamps": json.loads(stamps),
+            "views": json.loads(views),
+            "slides": slides,
+        }
+
+    def save(self, pptx_path: str, signature, stamps: Dict, views: Dict, slides: List[Dict]):
+        """Replace the stored record for a deck with the given stamps, views and slides."""
+        key = _deck_key(pptx_path)
+        mtime_ns, size, quick_hash = signature
+
+        placeholders = ", ".join("?" for _ in range(len(SLIDE_COLUMNS) + 2))
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO decks (path, mtime_ns, size, quick_hash, stamps, views, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET mtime_ns = excluded.mtime_ns, size = excluded.size, "
+                "quick_hash = excluded.quick_hash, stamps = excluded.stamps, views = excluded.views, "
+                "updated = excluded.updated",
+                (key, mtime_ns, size, quick_hash, json.dumps(stamps), json.dumps(views), time.time())
+            )
+            deck_id = self._conn.execute("SELECT deck_id FROM decks WHERE path = ?", (key,)).fetchone()[0]
+            self._conn.execute("DELETE FROM slides WHERE deck_id = ?", (deck_id,))
+            self._conn.executemany(
+                f"INSERT INTO slides (deck_id, {', '.join(SLIDE_COLUMNS)}, data) VALUES ({placeholders})",
+                [
+                    (deck_id,) + tuple(slide.get(col) for col in SLIDE_COLUMNS)
+                    + (json.dumps(slide.get("data", {})),)
+                    for slide in slides
+                ]
+            )
+
+    def forget(self, pptx_path: str = None):
+        """Remove one deck (or every deck if pptx_path is None)."""
+        with self._lock, self._conn:
+            if pptx_path is None:
+                self._conn.execute("DELETE FROM slides")
+                self._conn.execute("DELETE FROM decks")
+            else:
+                self._conn.execute("DELETE FROM decks WHERE path = ?", (_deck_key(pptx_path),))
+
+    def deck_paths(self) -> List[str]:
+        """Paths of every indexed deck."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT path FROM decks ORDER BY path")]